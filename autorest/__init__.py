@@ -4,27 +4,47 @@
 # license information.
 # --------------------------------------------------------------------------
 import logging
+import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict
-
-import yaml
+from typing import Any, Dict, List, TYPE_CHECKING
 
 from .jsonrpc import AutorestAPI
 from ._version import VERSION
 
+if TYPE_CHECKING:
+    # pylint: disable=unused-import
+    from multiprocessing.context import BaseContext
+
 
 __version__ = VERSION
 _LOGGER = logging.getLogger(__name__)
 
 
+def get_mp_context() -> "BaseContext":
+    """The multiprocessing context of the process pools of the plugins.
+
+    Never fork: plugins run on a thread of the server, and forking a process with other threads running is not safe.
+    """
+    import multiprocessing  # pylint: disable=import-outside-toplevel
+
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
 class Plugin(ABC):
     """A base class for autorest plugin.
 
     :param autorestapi: An autorest API instance
     """
 
+    # The configuration keys this plugin reads, fetched from autorest at once when the plugin is created
+    CONFIGURATION_KEYS: List[str] = []
+
     def __init__(self, autorestapi: AutorestAPI) -> None:
         self._autorestapi = autorestapi
+        if self.CONFIGURATION_KEYS:
+            self._autorestapi.get_values(self.CONFIGURATION_KEYS)
 
     @abstractmethod
     def process(self) -> bool:
@@ -36,6 +56,22 @@ class Plugin(ABC):
         """
         raise NotImplementedError()
 
+    def _get_jobs(self) -> int:
+        """The number of processes of the plugin, from --python.jobs. Without value, one per CPU.
+        """
+        jobs = self._autorestapi.get_value("jobs")
+        if jobs is None:
+            return 1
+        if jobs == {}:
+            return os.cpu_count() or 1
+        try:
+            jobs = int(jobs)
+        except (TypeError, ValueError):
+            jobs = 0
+        if jobs < 1:
+            raise ValueError("--python.jobs must be a positive number of processes, for example --python.jobs=4")
+        return jobs
+
 
 class YamlUpdatePlugin(Plugin):
     """A plugin that update the YAML as input.
@@ -48,14 +84,11 @@ class YamlUpdatePlugin(Plugin):
         if "code-model-v4-no-tags.yaml" not in inputs:
             raise ValueError("code-model-v4-no-tags.yaml must be a possible input")
 
-        file_content = self._autorestapi.read_file("code-model-v4-no-tags.yaml")
-        yaml_data = yaml.safe_load(file_content)
+        yaml_data = self._autorestapi.read_yaml("code-model-v4-no-tags.yaml")
 
         self.update_yaml(yaml_data)
 
-        yaml_string = yaml.safe_dump(yaml_data)
-
-        self._autorestapi.write_file("code-model-v4-no-tags.yaml", yaml_string)
+        self._autorestapi.write_yaml("code-model-v4-no-tags.yaml", yaml_data)
         return True
 
     @abstractmethod
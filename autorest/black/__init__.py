@@ -3,36 +3,98 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import concurrent.futures
 import logging
 from pathlib import Path
+from typing import Iterable, List, Tuple
 import black
 
-from .. import Plugin
+from .. import Plugin, get_mp_context
+from ..cache import hash_content, read_cache, write_cache
+from ..manifest import OutputManifest
 
 _LOGGER = logging.getLogger(__name__)
 
 _BLACK_MODE = black.Mode()
 _BLACK_MODE.line_length = 120
 
-class BlackScriptPlugin(Plugin):
+# What the output folder manifest records as formatter of the files
+_FORMATTER = f"black {black.__version__}, line length {_BLACK_MODE.line_length}"
+
+# Formatted contents, by hash of the content and of the black version and mode
+_CACHE_NAME = "black"
+_CACHE_KEY_PREFIX = f"black {black.__version__}, {_BLACK_MODE!r}\0"
+
+
+def _cache_key(file_content: str) -> str:
+    return hash_content(_CACHE_KEY_PREFIX + file_content)
+
+
+def _format_python(file_content: str) -> str:
+    try:
+        return black.format_file_contents(file_content, fast=True, mode=_BLACK_MODE)
+    except black.NothingChanged:
+        return file_content
+
 
-    def __init__(self, autorestapi):
-        super(BlackScriptPlugin, self).__init__(autorestapi)
-        self.output_folder: Path = Path(self._autorestapi.get_value("output-folder")).resolve()
+class BlackScriptPlugin(Plugin):
+    CONFIGURATION_KEYS = ["jobs"]
 
     def process(self) -> bool:
-        # apply format_file on every file in the output folder
-        list(map(self.format_file, [f for f in self.output_folder.glob('**/*') if f.is_file()]))
+        # format the Python files the code generator wrote, the other files are output as they are
+        files = [Path(f) for f in self._autorestapi.list_inputs() if Path(f).suffix == ".py"]
+        self.format_files(
+            (file, file_content)
+            for file, file_content in zip(files, self._autorestapi.read_files(files))
+            if file_content is not None
+        )
         return True
 
-    def format_file(self, full_path) -> None:
-        file = full_path.relative_to(self.output_folder)
-        file_content = self._autorestapi.read_file(file)
-        if not file.suffix == ".py":
+    def format_files(self, files: Iterable[Tuple[Path, str]]) -> None:
+        """Format the Python files, except the ones the output folder manifest says were formatted already.
+
+        Formatted contents are cached, and files are formatted in a process pool with --python.jobs.
+
+        :param files: Pairs of file name, relative to the output folder, and content
+        """
+        manifest = OutputManifest.read(self._autorestapi)
+        to_format: List[Tuple[Path, str]] = []
+        for file, file_content in files:
+            if file.suffix != ".py":
+                continue
+            if manifest and manifest.is_formatted(file, file_content, _FORMATTER):
+                _LOGGER.debug("Not formatting unchanged file %s", file)
+                continue
+            to_format.append((file, file_content))
+
+        formatted_contents = self._format_contents([file_content for _, file_content in to_format])
+        for (file, _), file_content in zip(to_format, formatted_contents):
             self._autorestapi.write_file(file, file_content)
-            return
-        try:
-            file_content = black.format_file_contents(file_content, fast=True, mode=_BLACK_MODE)
-        except black.NothingChanged:
-            pass
-        self._autorestapi.write_file(file, file_content)
+            if manifest:
+                manifest.add_formatted_file(file, file_content, _FORMATTER)
+        if manifest:
+            manifest.write(self._autorestapi)
+
+    def _format_contents(self, file_contents: List[str]) -> List[str]:
+        formatted_contents = [read_cache(_CACHE_NAME, _cache_key(file_content)) for file_content in file_contents]
+        # the contents not in cache, each formatted once
+        not_cached: List[str] = list(dict.fromkeys(
+            file_content
+            for file_content, formatted_content in zip(file_contents, formatted_contents)
+            if formatted_content is None
+        ))
+        _LOGGER.debug("Formatting %s files, %s not in cache", len(file_contents), len(not_cached))
+
+        jobs = min(self._get_jobs(), len(not_cached))
+        if jobs > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=get_mp_context()) as executor:
+                formatted_by_content = dict(zip(not_cached, executor.map(_format_python, not_cached)))
+        else:
+            formatted_by_content = {file_content: _format_python(file_content) for file_content in not_cached}
+
+        for file_content, formatted_content in formatted_by_content.items():
+            write_cache(_CACHE_NAME, _cache_key(file_content), formatted_content)
+        return [
+            formatted_by_content[file_content] if formatted_content is None else formatted_content
+            for file_content, formatted_content in zip(file_contents, formatted_contents)
+        ]
@@ -0,0 +1,256 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""On-disk caches of the generator, shared by all its runs.
+
+Caches live in $AUTOREST_PYTHON_CACHE_DIR, or in "autorest-python" of the user cache folder,
+in a sub folder per generator version so a new version never reads entries of an older one.
+Setting AUTOREST_PYTHON_CACHE_DIR to an empty string disables them.
+
+Once per process, before its first write, the folders of other versions are deleted, and the least recently
+used entries too, until the caches fit in $AUTOREST_PYTHON_CACHE_MAX_SIZE megabytes (1024 by default).
+
+    python -m autorest.cache --clear
+"""
+import argparse
+import contextlib
+import functools
+import hashlib
+import importlib
+import logging
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+from ._version import VERSION
+
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_DIR_ENV_VARIABLE = "AUTOREST_PYTHON_CACHE_DIR"
+CACHE_MAX_SIZE_ENV_VARIABLE = "AUTOREST_PYTHON_CACHE_MAX_SIZE"
+_DEFAULT_CACHE_MAX_SIZE_MB = 1024
+
+# Whether this process already pruned the caches
+_PRUNED = False
+_PRUNE_LOCK = threading.Lock()
+
+
+def _default_cache_root() -> Path:
+    if os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "autorest-python"
+    if os.environ.get("XDG_CACHE_HOME"):
+        return Path(os.environ["XDG_CACHE_HOME"]) / "autorest-python"
+    return Path.home() / ".cache" / "autorest-python"
+
+
+def get_cache_root() -> Optional[Path]:
+    """Get the folder of all the caches, of all the generator versions.
+
+    :returns: The folder, or None if caches are disabled
+    :rtype: Optional[Path]
+    """
+    cache_root = os.environ.get(CACHE_DIR_ENV_VARIABLE)
+    if cache_root == "":
+        return None
+    return Path(cache_root) if cache_root else _default_cache_root()
+
+
+def get_cache_folder(name: str) -> Optional[Path]:
+    """Get the folder of a cache, creating it if needed.
+
+    :param str name: The name of the cache
+    :returns: The folder, or None if caches are disabled or the folder can't be created
+    :rtype: Optional[Path]
+    """
+    cache_root = get_cache_root()
+    if cache_root is None:
+        return None
+    folder = cache_root / VERSION / name
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        _LOGGER.debug("Unable to create cache folder %s", folder, exc_info=True)
+        return None
+    return folder
+
+
+def hash_content(content: Union[str, bytes]) -> str:
+    """SHA-256 of a content, as used for cache keys.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_object(value: Any) -> str:
+    """SHA-256 of the pickle of an object, as used for cache keys of parsed trees.
+
+    The pickle of dicts, lists and scalars is the same from one run to the other, sets of strings are not.
+    """
+    return hash_content(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+@functools.lru_cache(maxsize=None)
+def get_sources_hash(package_name: str) -> str:
+    """Hash of the Python sources of a package and its sub packages, for cache keys of what their code builds.
+
+    The generator version is part of the cache folder already, this covers changes between two releases.
+
+    :param str package_name: The package, i.e. "autorest.codegen"
+    :rtype: str
+    """
+    package_folder = Path(importlib.import_module(package_name).__file__).parent  # type: ignore
+    digest = hashlib.sha256()
+    for path in sorted(package_folder.rglob("*.py")):
+        digest.update(path.relative_to(package_folder).as_posix().encode("utf-8") + b"\0")
+        digest.update(path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def read_cache(name: str, key: str) -> Optional[Any]:
+    """Read an entry of a cache.
+
+    :param str name: The name of the cache
+    :param str key: The key of the entry
+    :returns: The cached object, or None if there is no readable entry
+    """
+    folder = get_cache_folder(name)
+    if not folder:
+        return None
+    path = folder / f"{key}.pickle"
+    try:
+        with open(path, "rb") as cache_file:
+            value = pickle.load(cache_file)
+        # Entries are evicted least recently used first
+        os.utime(path)
+        return value
+    except FileNotFoundError:
+        return None
+    except Exception:  # pylint: disable=broad-except
+        # Corrupted, or written by another Python version. Will be overwritten.
+        _LOGGER.debug("Unable to read cache entry %s/%s", name, key, exc_info=True)
+        return None
+
+
+def write_cache(name: str, key: str, value: Any) -> None:
+    """Write an entry of a cache. Failing to write is not an error, the cache is just not used.
+
+    :param str name: The name of the cache
+    :param str key: The key of the entry
+    :param value: A picklable object
+    """
+    folder = get_cache_folder(name)
+    if not folder:
+        return
+    _prune_once()
+    try:
+        # Write then rename, so concurrent runs never read a partial entry
+        file_descriptor, temp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    except OSError:
+        _LOGGER.debug("Unable to write cache entry %s/%s", name, key, exc_info=True)
+        return
+    try:
+        with os.fdopen(file_descriptor, "wb") as cache_file:
+            pickle.dump(value, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, folder / f"{key}.pickle")
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.debug("Unable to write cache entry %s/%s", name, key, exc_info=True)
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+
+
+def _get_max_size() -> int:
+    try:
+        return int(os.environ.get(CACHE_MAX_SIZE_ENV_VARIABLE) or _DEFAULT_CACHE_MAX_SIZE_MB) * 1024 * 1024
+    except ValueError:
+        _LOGGER.warning("Ignoring %s, not a number of megabytes", CACHE_MAX_SIZE_ENV_VARIABLE)
+        return _DEFAULT_CACHE_MAX_SIZE_MB * 1024 * 1024
+
+
+def _version_folders(cache_root: Path) -> List[Path]:
+    # Only what looks like a version folder: the cache root may be shared with other files
+    return [path for path in cache_root.iterdir() if path.is_dir() and re.match(r"\d+\.\d+\.\d+", path.name)]
+
+
+def prune_caches() -> None:
+    """Delete the caches of other generator versions, then the least recently used entries
+    until the caches fit in their maximum size.
+    """
+    cache_root = get_cache_root()
+    if cache_root is None or not cache_root.is_dir():
+        return
+    for version_folder in _version_folders(cache_root):
+        if version_folder.name != VERSION:
+            _LOGGER.debug("Deleting the caches of generator version %s", version_folder.name)
+            shutil.rmtree(version_folder, ignore_errors=True)
+
+    entries: List[Tuple[float, int, Path]] = []
+    for path in (cache_root / VERSION).rglob("*"):
+        with contextlib.suppress(OSError):
+            if path.is_file():
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+    size = sum(entry_size for _, entry_size, _ in entries)
+    max_size = _get_max_size()
+    if size <= max_size:
+        return
+    entries.sort()
+    evicted = 0
+    for _, entry_size, path in entries:
+        if size <= max_size:
+            break
+        with contextlib.suppress(OSError):
+            path.unlink()
+            size -= entry_size
+            evicted += 1
+    _LOGGER.debug("Evicted %s cache entries", evicted)
+
+
+def _prune_once() -> None:
+    global _PRUNED  # pylint: disable=global-statement
+    with _PRUNE_LOCK:
+        if _PRUNED:
+            return
+        _PRUNED = True
+    try:
+        prune_caches()
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.debug("Unable to prune the caches", exc_info=True)
+
+
+def clear_caches() -> None:
+    """Delete the caches of every generator version.
+    """
+    cache_root = get_cache_root()
+    if cache_root is None or not cache_root.is_dir():
+        return
+    for version_folder in _version_folders(cache_root):
+        shutil.rmtree(version_folder, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show, or clear, the on-disk caches of the Python generator.")
+    parser.add_argument("--clear", action="store_true", help="Delete the caches of every generator version")
+    args = parser.parse_args()
+
+    cache_root = get_cache_root()
+    if cache_root is None:
+        print(f"Caches are disabled, ${CACHE_DIR_ENV_VARIABLE} is empty")
+    elif args.clear:
+        clear_caches()
+        print(f"Deleted {cache_root}")
+    else:
+        size = sum(path.stat().st_size for path in (cache_root / VERSION).rglob("*") if path.is_file())
+        print(f"{cache_root / VERSION}: {size / (1024 * 1024):.1f} MB, at most {_get_max_size() // (1024 * 1024)} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,20 @@
 # --------------------------------------------------------------------------
 import logging
 import sys
-from typing import Dict, Any, Set, Union, List
-import yaml
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
 
 from .. import Plugin
+from ..cache import get_sources_hash, hash_object, read_cache, write_cache
+from ..manifest import OutputManifest
 from .models.code_model import CodeModel
 from .models import build_schema
+from .models.imports import interned_import_entries
 from .models.operation_group import OperationGroup
 from .models.parameter import Parameter
 from .models.parameter_list import ParameterList
 from .serializers import JinjaSerializer
+from .yaml_index import YamlIndex
 
 
 def _get_credential_default_policy_type_has_async_version(credential_default_policy_type: str) -> bool:
@@ -25,41 +29,40 @@ def _get_credential_default_policy_type_has_async_version(credential_default_pol
     return mapping[credential_default_policy_type]
 
 _LOGGER = logging.getLogger(__name__)
+
+_CODE_MODEL_CACHE_NAME = "code-model"
+
 class CodeGenerator(Plugin):
-    @staticmethod
-    def remove_cloud_errors(yaml_data: Dict[str, Any]) -> None:
-        for group in yaml_data["operationGroups"]:
-            for operation in group["operations"]:
-                if not operation.get("exceptions"):
-                    continue
-                i = 0
-                while i < len(operation["exceptions"]):
-                    exception = operation["exceptions"][i]
-                    if exception.get("schema") and exception["schema"]["language"]["default"]["name"] == "CloudError":
-                        del operation["exceptions"][i]
-                        i -= 1
-                    i += 1
-        if yaml_data.get("schemas") and yaml_data["schemas"].get("objects"):
-            for i in range(len(yaml_data["schemas"]["objects"])):
-                obj_schema = yaml_data["schemas"]["objects"][i]
-                if obj_schema["language"]["default"]["name"] == "CloudError":
-                    del yaml_data["schemas"]["objects"][i]
-                    break
-
-    @staticmethod
-    def _build_exceptions_set(yaml_data: List[Dict[str, Any]]) -> Set[int]:
-        exceptions_set = set()
-        for group in yaml_data:
-            for operation in group["operations"]:
-                if not operation.get("exceptions"):
-                    continue
-                for exception in operation["exceptions"]:
-                    if not exception.get("schema"):
-                        continue
-                    exceptions_set.add(id(exception["schema"]))
-        return exceptions_set
+    CONFIGURATION_KEYS = [
+        "namespace",
+        "azure-arm",
+        "add-credentials",
+        "add-credential",
+        "credential-scopes",
+        "credential-key-header-name",
+        "credential-default-policy-type",
+        "header-text",
+        "head-as-boolean",
+        "keep-version-file",
+        "no-async",
+        "no-namespace-folders",
+        "basic-setup-py",
+        "package-name",
+        "package-version",
+        "client-side-validation",
+        "trace",
+        "multiapi",
+        "jobs",
+        "output-folder",
+        "clear-output-folder",
+        "black",
+    ]
 
     def _create_code_model(self, yaml_data: Dict[str, Any], options: Dict[str, Union[str, bool]]) -> CodeModel:
+        # Walk the YAML once for what we need before creating models.
+        # In ARM mode, CloudError is removed: errors are deserialized with ARMErrorFormat.
+        yaml_index = YamlIndex.from_yaml(yaml_data, remove_cloud_errors=bool(options["azure_arm"]))
+
         # Create a code model
         code_model = CodeModel(options)
         code_model.module_name = yaml_data["info"]["python_title"]
@@ -91,7 +94,8 @@ class CodeGenerator(Plugin):
         # Create operations
         if yaml_data.get("operationGroups"):
             code_model.operation_groups = [
-                OperationGroup.from_yaml(code_model, op_group) for op_group in yaml_data["operationGroups"]
+                OperationGroup.from_yaml(code_model, op_group, yaml_index.operation_classes)
+                for op_group in yaml_data["operationGroups"]
             ]
 
         # Get my namespace
@@ -102,11 +106,8 @@ class CodeGenerator(Plugin):
         code_model.namespace = namespace
 
         if yaml_data.get("schemas"):
-            exceptions_set = CodeGenerator._build_exceptions_set(yaml_data=yaml_data["operationGroups"])
-
-            for type_list in yaml_data["schemas"].values():
-                for schema in type_list:
-                    build_schema(yaml_data=schema, exceptions_set=exceptions_set, code_model=code_model)
+            for schema in yaml_index.schemas:
+                build_schema(yaml_data=schema, exceptions_set=yaml_index.exceptions_set, code_model=code_model)
             # sets the enums property in our code_model variable, which will later be passed to EnumSerializer
 
             code_model.add_inheritance_to_models()
@@ -122,6 +123,8 @@ class CodeGenerator(Plugin):
         if options["credential"]:
             code_model.add_credential_global_parameter()
 
+        code_model.freeze()
+        code_model.release_yaml()
         return code_model
 
     def _get_credential_scopes(self, credential):
@@ -259,6 +262,43 @@ class CodeGenerator(Plugin):
             options["head_as_boolean"] = True
         return options
 
+    def _get_code_model(self, yaml_data: Dict[str, Any], options: Dict[str, Union[str, bool]]) -> CodeModel:
+        """Get the code model from the cache of built code models, or create it.
+
+        The same YAML with the same options always gives the same code model, so entries are keyed
+        by both, and by the code building the models. The generator version is part of the cache folder.
+        """
+        namespace = self._autorestapi.get_value("namespace")
+        # the hash of the YAML text if we have it, hashing the tree is slower
+        yaml_hash = self._autorestapi.get_yaml_hash("code-model-v4-no-tags.yaml") or hash_object(yaml_data)
+        cache_key = hash_object((yaml_hash, get_sources_hash(__name__), sorted(options.items()), namespace))
+        code_model = read_cache(_CODE_MODEL_CACHE_NAME, cache_key)
+        if code_model is not None:
+            _LOGGER.debug("Code model found in cache")
+            # pickled models are not frozen, their cached properties were not pickled
+            code_model.freeze()
+            return code_model
+
+        code_model = self._create_code_model(yaml_data=yaml_data, options=options)
+        write_cache(_CODE_MODEL_CACHE_NAME, cache_key, code_model)
+        return code_model
+
+    def _get_manifest(self, options: Dict[str, Union[str, bool]]) -> Optional[OutputManifest]:
+        """The manifest of the files generated in the output folder, unless the folder is cleared before each run.
+
+        Files are generated again when the options change, and formatted again when black wasn't used.
+        """
+        output_folder = self._autorestapi.get_value("output-folder")
+        if not output_folder or self._autorestapi.get_boolean_value("clear-output-folder", False):
+            return None
+        options_hash = hash_object((
+            sorted(options.items()),
+            self._autorestapi.get_value("namespace"),
+            self._autorestapi.get_boolean_value("black", False),
+        ))
+        previous = OutputManifest.read(self._autorestapi)
+        return OutputManifest(options_hash, output_folder=Path(output_folder), previous=previous)
+
     def process(self) -> bool:
         # List the input file, should be only one
         inputs = self._autorestapi.list_inputs()
@@ -266,20 +306,20 @@ class CodeGenerator(Plugin):
         if "code-model-v4-no-tags.yaml" not in inputs:
             raise ValueError("code-model-v4-no-tags.yaml must be a possible input")
 
-        file_content = self._autorestapi.read_file("code-model-v4-no-tags.yaml")
-
         # Parse the received YAML
-        yaml_data = yaml.safe_load(file_content)
+        yaml_data = self._autorestapi.read_yaml("code-model-v4-no-tags.yaml")
 
         options = self._build_code_model_options()
 
-        if options["azure_arm"]:
-            self.remove_cloud_errors(yaml_data)
-
-        code_model = self._create_code_model(yaml_data=yaml_data, options=options)
+        with interned_import_entries():
+            code_model = self._get_code_model(yaml_data=yaml_data, options=options)
+            # The code model has all it needs, don't keep the YAML alive while serializing
+            del yaml_data
 
-        serializer = JinjaSerializer(self._autorestapi)
-        serializer.serialize(code_model)
+            serializer = JinjaSerializer(
+                self._autorestapi, jobs=self._get_jobs(), manifest=self._get_manifest(options)
+            )
+            serializer.serialize(code_model)
 
         return True
 
@@ -10,7 +10,7 @@ from .credential_schema import AzureKeyCredentialSchema, TokenCredentialSchema
 from .object_schema import ObjectSchema
 from .dictionary_schema import DictionarySchema
 from .list_schema import ListSchema
-from .primitive_schemas import get_primitive_schema, AnySchema, PrimitiveSchema
+from .primitive_schemas import AnySchema, PrimitiveSchema
 from .enum_schema import EnumSchema
 from .base_schema import BaseSchema
 from .constant_schema import ConstantSchema
@@ -23,6 +23,7 @@ from .property import Property
 from .operation_group import OperationGroup
 from .schema_response import SchemaResponse
 from .parameter_list import ParameterList
+from .schema_registry import SchemaRegistry
 
 
 __all__ = [
@@ -46,6 +47,7 @@ __all__ = [
     "ParameterList",
     "OperationGroup",
     "Property",
+    "SchemaRegistry",
     "SchemaResponse",
     "TokenCredentialSchema",
 ]
@@ -66,42 +68,40 @@ def build_schema(yaml_data: Dict[str, Any], **kwargs) -> BaseSchema:
         raise ValueError("CodeModel not passed through kwargs")
     yaml_id = id(yaml_data)
     namespace = code_model.namespace
-    try:
-        return code_model.lookup_schema(yaml_id)
-    except KeyError:
-        # Not created yet, let's create it and add it to the index
-        pass
+    if yaml_id in code_model.schema_registry:
+        return code_model.schema_registry.lookup(yaml_id)
+    # Not created yet, let's create it and add it to the index
     schema: BaseSchema
     schema_type = yaml_data["type"]
     if schema_type == "constant":
         schema = ConstantSchema.from_yaml(namespace=namespace, yaml_data=yaml_data)
-        code_model.primitives[yaml_id] = schema
+        code_model.schema_registry.add(yaml_id, schema)
 
     elif schema_type in ["choice", "sealed-choice"]:
         schema = EnumSchema.from_yaml(namespace=namespace, yaml_data=yaml_data, **kwargs)
-        code_model.enums[yaml_id] = schema
+        code_model.schema_registry.add(yaml_id, schema)
 
     elif schema_type == "array":
         schema = ListSchema.from_yaml(namespace=namespace, yaml_data=yaml_data, **kwargs)
-        code_model.primitives[yaml_id] = schema
+        code_model.schema_registry.add(yaml_id, schema)
 
     elif schema_type == "dictionary":
         schema = DictionarySchema.from_yaml(namespace=namespace, yaml_data=yaml_data, **kwargs)
-        code_model.primitives[yaml_id] = schema
+        code_model.schema_registry.add(yaml_id, schema)
 
     elif schema_type in ["object", "and", "group"]:
         if _generate_as_object_schema(yaml_data):
             # To avoid infinite loop, create the right instance in memory,
             # put it in the index, and then parse the object.
             schema = ObjectSchema(namespace, yaml_data, "_", "")
-            code_model.schemas[yaml_id] = schema
+            code_model.schema_registry.add(yaml_id, schema)
             schema.fill_instance_from_yaml(namespace=namespace, yaml_data=yaml_data, **kwargs)
         else:
             schema = AnySchema.from_yaml(namespace=namespace, yaml_data=yaml_data)
-            code_model.primitives[yaml_id] = schema
+            code_model.schema_registry.add(yaml_id, schema)
 
     else:
-        schema = get_primitive_schema(namespace=namespace, yaml_data=yaml_data)
-        code_model.primitives[yaml_id] = schema
+        schema = code_model.schema_registry.get_primitive_schema(namespace=namespace, yaml_data=yaml_data)
+        code_model.schema_registry.add(yaml_id, schema)
 
     return schema
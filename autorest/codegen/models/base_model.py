@@ -3,7 +3,97 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from typing import Any, Dict
+import copy
+import functools
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class Freezable:
+    """Mixin for models that don't change once the code model is built.
+
+    After "freeze", setting an attribute raises, and the properties decorated with
+    "cached_after_freeze" are computed once. Copies are not frozen.
+    """
+
+    def freeze(self) -> None:
+        object.__setattr__(self, "_frozen_properties", {})
+
+    @property
+    def frozen(self) -> bool:
+        return "_frozen_properties" in self.__dict__
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if "_frozen_properties" in self.__dict__:
+            raise AttributeError(f"Can't set {name}, {self!r} is frozen")
+        super().__setattr__(name, value)
+
+    def __getstate__(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        state = dict(self.__dict__)
+        state.pop("_frozen_properties", None)
+        # attributes of the base classes with __slots__
+        slots_state = {
+            name: getattr(self, name)
+            for cls in type(self).__mro__ for name in cls.__dict__.get("__slots__", ())
+            if hasattr(self, name)
+        }
+        return state, slots_state
+
+    def __setstate__(self, state: Tuple[Dict[str, Any], Dict[str, Any]]) -> None:
+        dict_state, slots_state = state
+        self.__dict__.update(dict_state)
+        for name, value in slots_state.items():
+            object.__setattr__(self, name, value)
+
+
+class cached_after_freeze(property):  # pylint: disable=invalid-name
+    """Like property, but the value is cached once the model is frozen.
+
+    The cached value is shared by all the callers, they must not update it.
+    """
+
+    def __init__(self, func: Callable[[Any], Any]) -> None:
+        super().__init__(func)
+        self.__doc__ = func.__doc__
+        # qualified, so an overridden property calling the one of its base class gets its own entry
+        self._name = func.__qualname__
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        frozen_properties = instance.__dict__.get("_frozen_properties")
+        if frozen_properties is None:
+            return self.fget(instance)  # type: ignore
+        try:
+            return frozen_properties[self._name]
+        except KeyError:
+            value = frozen_properties[self._name] = self.fget(instance)  # type: ignore
+            return value
+
+
+def cached_method_after_freeze(func: Callable[..., T]) -> Callable[..., T]:
+    """Like cached_after_freeze, for methods: the value is cached per arguments once the model is frozen.
+
+    Unlike cached_after_freeze, callers get a shallow copy of the cached value: they are free to update it,
+    as callers of "imports" do.
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def _method(self, *args: Any, **kwargs: Any) -> T:
+        frozen_properties = self.__dict__.get("_frozen_properties")
+        if frozen_properties is None:
+            return func(self, *args, **kwargs)
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            value = frozen_properties[key]
+        except KeyError:
+            value = frozen_properties[key] = func(self, *args, **kwargs)
+        return copy.copy(value)
+
+    return _method
 
 
 class BaseModel:
@@ -13,6 +103,8 @@ class BaseModel:
     :type yaml_data: dict[str, Any]
     """
 
+    __slots__ = ("yaml_data",)
+
     def __init__(
         self, yaml_data: Dict[str, Any],
     ) -> None:
@@ -17,11 +17,13 @@ class BaseSchema(BaseModel, ABC):
     :type yaml_data: dict[str, Any]
     """
 
+    __slots__ = ("namespace", "default_value", "xml_metadata", "api_versions")
+
     def __init__(self, namespace: str, yaml_data: Dict[str, Any]) -> None:
         super().__init__(yaml_data)
         self.namespace = namespace
         self.default_value = yaml_data.get("defaultValue", None)
-        self.xml_metadata = yaml_data.get("serialization", {}).get("xml", {})
+        self.xml_metadata = dict(yaml_data.get("serialization", {}).get("xml", {}))
         self.api_versions = set(value_dict["version"] for value_dict in yaml_data.get("apiVersions", []))
 
     @classmethod
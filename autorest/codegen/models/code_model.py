@@ -5,8 +5,9 @@
 # --------------------------------------------------------------------------
 from itertools import chain
 import logging
-from typing import cast, List, Dict, Optional, Any, Set, Union
+from typing import cast, List, Dict, Iterator, Optional, Any, Set, Tuple, Union
 
+from .base_model import BaseModel
 from .base_schema import BaseSchema
 from .credential_schema import AzureKeyCredentialSchema, TokenCredentialSchema
 from .enum_schema import EnumSchema
@@ -19,13 +20,22 @@ from .parameter import Parameter, ParameterLocation
 from .client import Client
 from .parameter_list import ParameterList
 from .schema_response import SchemaResponse
-from .property import Property
 from .primitive_schemas import IOSchema
+from .schema_registry import SchemaRegistry
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _model_attribute_values(obj: Any) -> List[Any]:
+    values = [value for name, value in getattr(obj, "__dict__", {}).items() if name != "yaml_data"]
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if name != "yaml_data" and hasattr(obj, name):
+                values.append(getattr(obj, name))
+    return values
+
+
 class CodeModel:  # pylint: disable=too-many-instance-attributes
     """Holds all of the information we have parsed out of the yaml file. The CodeModel is what gets
     serialized by the serializers.
@@ -36,6 +46,9 @@ class CodeModel:  # pylint: disable=too-many-instance-attributes
     :param str class_name: The class name for the client. Is in pascal case.
     :param str description: The description of the client
     :param str namespace: The namespace of our module
+    :param schema_registry: All the schemas we have created, indexed by yaml id.
+     The schemas, enums and primitives are views of it.
+    :type schema_registry: ~autorest.models.SchemaRegistry
     :param schemas: The list of schemas we are going to serialize in the models files. Maps their yaml
      id to our created ObjectSchema.
     :type schemas: dict[int, ~autorest.models.ObjectSchema]
@@ -59,15 +72,39 @@ class CodeModel:  # pylint: disable=too-many-instance-attributes
         self.description: str = ""
         self.namespace: str = ""
         self.namespace_path: str = ""
-        self.schemas: Dict[int, ObjectSchema] = {}
+        self.schema_registry = SchemaRegistry()
         self.sorted_schemas: List[ObjectSchema] = []
-        self.enums: Dict[int, EnumSchema] = {}
-        self.primitives: Dict[int, BaseSchema] = {}
         self.operation_groups: List[OperationGroup] = []
         self.global_parameters: ParameterList = ParameterList()
         self.custom_base_url: Optional[str] = None
         self.base_url: Optional[str] = None
         self.service_client: Client = Client()
+        # yaml id of properties to their name, built when linking parameters to their target property
+        self._property_names: Optional[Dict[int, str]] = None
+
+    @property
+    def schemas(self) -> Dict[int, ObjectSchema]:
+        return self.schema_registry.objects
+
+    @schemas.setter
+    def schemas(self, schemas: Dict[int, ObjectSchema]) -> None:
+        self.schema_registry.replace(self.schema_registry.objects, schemas)  # type: ignore
+
+    @property
+    def enums(self) -> Dict[int, EnumSchema]:
+        return self.schema_registry.enums
+
+    @enums.setter
+    def enums(self, enums: Dict[int, EnumSchema]) -> None:
+        self.schema_registry.replace(self.schema_registry.enums, enums)  # type: ignore
+
+    @property
+    def primitives(self) -> Dict[int, BaseSchema]:
+        return self.schema_registry.primitives
+
+    @primitives.setter
+    def primitives(self, primitives: Dict[int, BaseSchema]) -> None:
+        self.schema_registry.replace(self.schema_registry.primitives, primitives)
 
     def lookup_schema(self, schema_id: int) -> BaseSchema:
         """Looks to see if the schema has already been created.
@@ -77,33 +114,43 @@ class CodeModel:  # pylint: disable=too-many-instance-attributes
         :rtype: ~autorest.models.BaseSchema
         :raises: KeyError if schema is not found
         """
-        for attr in [self.schemas, self.enums, self.primitives]:
-            for elt_key, elt_value in attr.items():  # type: ignore
-                if schema_id == elt_key:
-                    return elt_value
-        raise KeyError("Didn't find it!!!!!")
+        try:
+            return self.schema_registry.lookup(schema_id)
+        except KeyError:
+            raise KeyError("Didn't find it!!!!!")
 
     @staticmethod
     def _sort_schemas_helper(current, seen_schema_names, seen_schema_yaml_ids):
+        """Get the schema and its ancestors not seen yet, ancestors first.
+
+        Walks the ancestors with a stack rather than recursing, so deep hierarchies can't hit the recursion limit.
+        """
         if current.id in seen_schema_yaml_ids:
             return []
         if current.name in seen_schema_names:
             raise ValueError(
                 f"We have already generated a schema with name {current.name}"
             )
-        ancestors = [current]
-        if current.base_models:
-            for base_model in current.base_models:
-                parent = cast(ObjectSchema, base_model)
-                if parent.id in seen_schema_yaml_ids:
-                    continue
-                seen_schema_names.add(current.name)
-                seen_schema_yaml_ids.add(current.id)
-                ancestors = CodeModel._sort_schemas_helper(parent, seen_schema_names, seen_schema_yaml_ids) + ancestors
-        seen_schema_names.add(current.name)
-        seen_schema_yaml_ids.add(current.id)
-        return ancestors
-
+        # schema, iterator on its parents, ancestors lists of the parents already walked
+        stack = [(current, iter(current.base_models or []), [])]
+        while True:
+            schema, parents, parents_ancestors = stack[-1]
+            seen_schema_names.add(schema.name)
+            seen_schema_yaml_ids.add(schema.id)
+            parent = next((p for p in parents if p.id not in seen_schema_yaml_ids), None)
+            if parent:
+                if parent.name in seen_schema_names:
+                    raise ValueError(
+                        f"We have already generated a schema with name {parent.name}"
+                    )
+                stack.append((parent, iter(parent.base_models or []), []))
+                continue
+            stack.pop()
+            # the ancestors of the last parents come first
+            ancestors = [a for parent_ancestors in reversed(parents_ancestors) for a in parent_ancestors] + [schema]
+            if not stack:
+                return ancestors
+            stack[-1][2].append(ancestors)
 
     def sort_schemas(self) -> None:
         """Sorts the final object schemas by inheritance and by alphabetical order.
@@ -117,6 +164,7 @@ class CodeModel:  # pylint: disable=too-many-instance-attributes
         for schema in sorted(self.schemas.values(), key=lambda x: x.name.lower()):
             sorted_schemas.extend(CodeModel._sort_schemas_helper(schema, seen_schema_names, seen_schema_yaml_ids))
         self.sorted_schemas = sorted_schemas
+        self._property_names = None
 
     def add_credential_global_parameter(self) -> None:
         """Adds a `credential` global parameter.
@@ -168,27 +216,30 @@ class CodeModel:  # pylint: disable=too-many-instance-attributes
         type of the LRO operation
         """
         for operation_group in self.operation_groups:
-            i = 0
-            while i < len(operation_group.operations):
-                operation = operation_group.operations[i]
+            operations: List[Operation] = []
+            for operation in operation_group.operations:
                 if isinstance(operation, LROOperation):
                     operation.set_lro_response_type()
-                    operation_group.operations.insert(i, CodeModel._lro_initial_function(operation))
-                    i += 1
-                i += 1
+                    operations.append(CodeModel._lro_initial_function(operation))
+                operations.append(operation)
+            operation_group.operations = operations
 
     def remove_next_operation(self) -> None:
         """Linking paging operations together.
         """
+        operations_by_id: Dict[int, Operation] = {}
+        for operation_group in reversed(self.operation_groups):
+            # the first operation group wins, like a scan of the groups in order would
+            operations_by_id.update(operation_group.operations_by_id)
+
         def _lookup_operation(yaml_id: int) -> Operation:
-            for operation_group in self.operation_groups:
-                for operation in operation_group.operations:
-                    if operation.id == yaml_id:
-                        return operation
-            raise KeyError("Didn't find it!!!!!")
+            try:
+                return operations_by_id[yaml_id]
+            except KeyError:
+                raise KeyError("Didn't find it!!!!!")
 
         for operation_group in self.operation_groups:
-            next_operations = []
+            next_operation_ids: Set[int] = set()
             for operation in operation_group.operations:
                 # when we add in "LRO" functions we don't include yaml_data, so yaml_data can be empty in these cases
                 next_link_yaml = None
@@ -197,60 +248,60 @@ class CodeModel:  # pylint: disable=too-many-instance-attributes
                 if isinstance(operation, PagingOperation) and next_link_yaml:
                     next_operation = _lookup_operation(id(next_link_yaml))
                     operation.next_operation = next_operation
-                    next_operations.append(next_operation)
+                    next_operation_ids.add(id(next_operation))
 
             operation_group.operations = [
-                operation for operation in operation_group.operations if operation not in next_operations
+                operation for operation in operation_group.operations if id(operation) not in next_operation_ids
             ]
 
-    @staticmethod
-    def _add_properties_from_inheritance_helper(schema, properties) -> List[Property]:
-        if not schema.base_models:
-            return properties
-        if schema.base_models:
-            for base_model in schema.base_models:
-                parent = cast(ObjectSchema, base_model)
-                # need to make sure that the properties we choose from our parent also don't contain
-                # any of our own properties
-                schema_property_names = set([p.name for p in properties] + [p.name for p in schema.properties])
-                chosen_parent_properties = [
-                    p for p in parent.properties
-                    if p.name not in schema_property_names
-                ]
-                properties = (
-                    CodeModel._add_properties_from_inheritance_helper(parent, chosen_parent_properties) +
-                    properties
-                )
-
-        return properties
-
-    def _add_properties_from_inheritance(self) -> None:
-        """Adds properties from base classes to schemas with parents.
-
-        :return: None
-        :rtype: None
+    def _schemas_in_inheritance_order(self) -> List[ObjectSchema]:
+        """Get the object schemas, each one after its base models.
         """
+        ordered_schemas: List[ObjectSchema] = []
+        visited: Set[int] = set()
         for schema in self.schemas.values():
-            schema.properties = CodeModel._add_properties_from_inheritance_helper(schema, schema.properties)
-
-    @staticmethod
-    def _add_exceptions_from_inheritance_helper(schema) -> bool:
-        if schema.is_exception:
-            return True
-        parent_is_exception: List[bool] = []
-        for base_model in schema.base_models:
-            parent = cast(ObjectSchema, base_model)
-            parent_is_exception.append(CodeModel._add_exceptions_from_inheritance_helper(parent))
-        return any(parent_is_exception)
-
-    def _add_exceptions_from_inheritance(self) -> None:
-        """Sets a class as an exception if it's parent is an exception.
+            if schema.id in visited:
+                continue
+            visited.add(schema.id)
+            # base models are schemas, not yaml ids, once the code model is built
+            stack: List[Tuple[ObjectSchema, Iterator[ObjectSchema]]] = [
+                (schema, iter(cast(List[ObjectSchema], schema.base_models or [])))
+            ]
+            while stack:
+                current, parents = stack[-1]
+                parent = next((p for p in parents if p.id not in visited), None)
+                if parent:
+                    visited.add(parent.id)
+                    stack.append((parent, iter(cast(List[ObjectSchema], parent.base_models or []))))
+                else:
+                    stack.pop()
+                    ordered_schemas.append(current)
+        return ordered_schemas
+
+    def _add_properties_and_exceptions_from_inheritance(self) -> None:
+        """Adds properties from base classes to schemas with parents, and sets a class as an exception
+        if its parent is an exception.
+
+        Parents are handled before their children, so their properties already contain the ones of their
+        own parents.
 
         :return: None
         :rtype: None
         """
-        for schema in self.schemas.values():
-            schema.is_exception = CodeModel._add_exceptions_from_inheritance_helper(schema)
+        for schema in self._schemas_in_inheritance_order():
+            if not schema.base_models:
+                continue
+            properties = schema.properties
+            property_names = {p.name for p in properties}
+            for base_model in schema.base_models:
+                parent = cast(ObjectSchema, base_model)
+                # need to make sure that the properties we choose from our parent also don't contain
+                # any of our own properties
+                chosen_parent_properties = [p for p in parent.properties if p.name not in property_names]
+                property_names.update(p.name for p in chosen_parent_properties)
+                properties = chosen_parent_properties + properties
+                schema.is_exception = schema.is_exception or parent.is_exception
+            schema.properties = properties
 
     def add_inheritance_to_models(self) -> None:
         """Adds base classes and properties from base classes to schemas with parents.
@@ -260,18 +311,25 @@ class CodeModel:  # pylint: disable=too-many-instance-attributes
         """
         for schema in self.schemas.values():
             if schema.base_models:
-                # right now, the base model property just holds the name of the parent class
-                schema.base_models = [b for b in self.schemas.values() if b.id in schema.base_models]
-        self._add_properties_from_inheritance()
-        self._add_exceptions_from_inheritance()
+                # right now, the base model property just holds the yaml id of the parent class.
+                # Keep the parents in the order they were created
+                base_model_ids = sorted(
+                    {b for b in schema.base_models if b in self.schemas},  # type: ignore
+                    key=self.schema_registry.registration_order
+                )
+                schema.base_models = [self.schemas[b] for b in base_model_ids]  # type: ignore
+        self._add_properties_and_exceptions_from_inheritance()
 
     def _populate_target_property(self, parameter: Parameter) -> None:
-        for obj in self.sorted_schemas:
-            for prop in obj.properties:
-                if prop.id == parameter.target_property_name:
-                    parameter.target_property_name = prop.name
-                    return
-        raise KeyError("Didn't find the target property")
+        if self._property_names is None:
+            self._property_names = {}
+            for obj in self.sorted_schemas:
+                for prop in obj.properties:
+                    self._property_names.setdefault(prop.id, prop.name)
+        try:
+            parameter.target_property_name = self._property_names[parameter.target_property_name]  # type: ignore
+        except KeyError:
+            raise KeyError("Didn't find the target property")
 
     def _populate_schema(self, obj: Any) -> None:
         schema_obj = obj.schema
@@ -332,6 +390,50 @@ class CodeModel:  # pylint: disable=too-many-instance-attributes
                     chosen_parameter.multiple_media_types_type_annot = f"Union[{type_annot}]"
                     chosen_parameter.multiple_media_types_docstring_type = docstring_type
 
+    def freeze(self) -> None:
+        """Freeze the operations, parameter lists and object schemas once the code model is built,
+        so the properties the templates call many times are computed once.
+
+        :return: None
+        :rtype: None
+        """
+        self.global_parameters.freeze()
+        for operation_group in self.operation_groups:
+            for operation in operation_group.operations:
+                operation.freeze()
+        for schema in self.schemas.values():
+            schema.freeze()
+
+    def release_yaml(self) -> None:
+        """Drop the references of the models to the YAML they were created from, so the YAML tree can be
+        garbage collected once the code model is built. Models only keep what they need from it.
+
+        :return: None
+        :rtype: None
+        """
+        seen: Set[int] = set()
+        to_visit: List[Any] = [self]
+        while to_visit:
+            obj = to_visit.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            if isinstance(obj, BaseModel):
+                # bypass freezing, releasing the YAML doesn't change what the model generates
+                object.__setattr__(obj, "yaml_data", {})
+            for value in _model_attribute_values(obj):
+                if isinstance(value, (list, tuple, set)):
+                    to_visit.extend(value)
+                elif isinstance(value, dict):
+                    to_visit.extend(value.values())
+                elif type(value).__module__.startswith(__package__):
+                    # our models, and their helpers like parameter lists
+                    to_visit.append(value)
+        # the operations and schemas are indexed by ids of the yaml, that new objects may get
+        for operation_group in self.operation_groups:
+            operation_group.operations_by_id.clear()
+        self.schema_registry.release_yaml_ids()
+
     @property
     def has_lro_operations(self) -> bool:
         return any([
@@ -22,6 +22,8 @@ class ConstantSchema(BaseSchema):
     :type schema: ~autorest.models.PrimitiveSchema
     """
 
+    __slots__ = ("value", "schema")
+
     def __init__(
         self, namespace: str, yaml_data: Dict[str, Any], schema: PrimitiveSchema, value: Optional[str],
     ) -> None:
@@ -7,6 +7,8 @@ from .base_schema import BaseSchema
 from .imports import FileImport, ImportType, TypingSection
 
 class CredentialSchema(BaseSchema):
+    __slots__ = ()
+
     def __init__(self) -> None:  # pylint: disable=super-init-not-called
         self.default_value = None
 
@@ -26,6 +28,7 @@ class CredentialSchema(BaseSchema):
 
 
 class AzureKeyCredentialSchema(CredentialSchema):
+    __slots__ = ()
 
     @property
     def serialization_type(self) -> str:
@@ -47,6 +50,8 @@ class AzureKeyCredentialSchema(CredentialSchema):
 
 
 class TokenCredentialSchema(CredentialSchema):
+    __slots__ = ("async_mode", "async_type", "sync_type")
+
     def __init__(self, async_mode) -> None:
         super(TokenCredentialSchema, self).__init__()
         self.async_mode = async_mode
@@ -17,6 +17,8 @@ class DictionarySchema(BaseSchema):
     :type element_type: ~autorest.models.BaseSchema
     """
 
+    __slots__ = ("element_type",)
+
     def __init__(
         self,
         namespace: str,
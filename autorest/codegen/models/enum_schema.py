@@ -17,6 +17,8 @@ class EnumValue:
     :param str description: Optional. The description for this enum value
     """
 
+    __slots__ = ("name", "value", "description")
+
     def __init__(self, name: str, value: str, description: Optional[str] = None) -> None:
         self.name = name
         self.value = value
@@ -51,6 +53,8 @@ class EnumSchema(BaseSchema):
     :type values: list[~autorest.models.EnumValue]
     """
 
+    __slots__ = ("description", "name", "values", "enum_file_name", "enum_type")
+
     def __init__(
         self,
         namespace: str,
@@ -3,8 +3,10 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import contextlib
+from contextvars import ContextVar
 from enum import Enum
-from typing import Dict, Optional, Set, Tuple, Union
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
 
 
 class ImportType(str, Enum):
@@ -19,38 +21,81 @@ class TypingSection(str, Enum):
     TYPING = "typing"  # never a typing import
 
 
+ImportName = Optional[Union[str, Tuple[str, str]]]
+ImportEntry = Tuple[TypingSection, ImportType, str, ImportName]
+
+# Entries are interned while a code model is generated: the same import of thousands of models and operations
+# is stored once. The table is dropped with the code model, it isn't kept for the life of the process.
+_INTERNED_ENTRIES: ContextVar[Optional[Dict[ImportEntry, ImportEntry]]] = ContextVar(
+    "_INTERNED_ENTRIES", default=None
+)
+
+
+def _intern_entry(entry: ImportEntry) -> ImportEntry:
+    interned_entries = _INTERNED_ENTRIES.get()
+    if interned_entries is None:
+        return entry
+    return interned_entries.setdefault(entry, entry)
+
+
+@contextlib.contextmanager
+def interned_import_entries() -> Iterator[None]:
+    """Intern the entries of the imports created in this context, i.e. while generating a code model.
+    """
+    token = _INTERNED_ENTRIES.set({})
+    try:
+        yield
+    finally:
+        _INTERNED_ENTRIES.reset(token)
+
+
 class FileImport:
+    """The imports of a file, as (typing section, import type, package name, name to import) entries.
+
+    Entries are kept in the order they were first added, which is the order of the nested representation.
+    Copies share their entries until one of them is updated.
+    """
+
     def __init__(
         self,
         imports: Dict[
             TypingSection,
-            Dict[ImportType, Dict[str, Set[Optional[Union[str, Tuple[str, str]]]]]]
+            Dict[ImportType, Dict[str, Set[ImportName]]]
         ] = None
     ) -> None:
-        # Basic implementation
+        # Nested representation, as given and as returned by "imports"
         # First level dict: TypingSection
         # Second level dict: ImportType
         # Third level dict: the package name.
         # Fourth level set: None if this import is a "import", the name to import if it's a "from"
-        self._imports: Dict[
-            TypingSection,
-            Dict[ImportType, Dict[str, Set[Optional[Union[str, Tuple[str, str]]]]]]
-        ] = imports or dict()
+        # Entries are a dict used as an ordered set.
+        self._entries: Dict[ImportEntry, None] = dict.fromkeys(
+            _intern_entry((typing_section, import_type, package_name, name_import))
+            for typing_section, import_type_dict in (imports or {}).items()
+            for import_type, package_list in import_type_dict.items()
+            for package_name, module_list in package_list.items()
+            for name_import in module_list
+        )
+        self._owns_entries = True
+        self._imports: Optional[Dict[TypingSection, Dict[ImportType, Dict[str, Set[ImportName]]]]] = None
+
+    def _entries_to_update(self) -> Dict[ImportEntry, None]:
+        if not self._owns_entries:
+            self._entries = dict(self._entries)
+            self._owns_entries = True
+        self._imports = None
+        return self._entries
 
     def _add_import(
         self,
         from_section: str,
         import_type: ImportType,
-        name_import: Optional[Union[str, Tuple[str, str]]] = None,
+        name_import: ImportName = None,
         typing_section: TypingSection = TypingSection.REGULAR
     ) -> None:
-        self._imports.setdefault(
-                typing_section, dict()
-            ).setdefault(
-                import_type, dict()
-            ).setdefault(
-                from_section, set()
-            ).add(name_import)
+        entry = (typing_section, import_type, from_section, name_import)
+        if entry not in self._entries:
+            self._entries_to_update()[_intern_entry(entry)] = None
 
     def add_from_import(
         self,
@@ -78,14 +123,49 @@ class FileImport:
     @property
     def imports(self) -> Dict[
             TypingSection,
-            Dict[ImportType, Dict[str, Set[Optional[Union[str, Tuple[str, str]]]]]]
+            Dict[ImportType, Dict[str, Set[ImportName]]]
         ]:
+        if self._imports is None:
+            imports: Dict[TypingSection, Dict[ImportType, Dict[str, Set[ImportName]]]] = {}
+            for typing_section, import_type, package_name, name_import in self._entries:
+                imports.setdefault(
+                    typing_section, dict()
+                ).setdefault(
+                    import_type, dict()
+                ).setdefault(
+                    package_name, set()
+                ).add(name_import)
+            self._imports = imports
         return self._imports
 
     def merge(self, file_import: "FileImport") -> None:
         """Merge the given file import format."""
-        for typing_section, import_type_dict in file_import.imports.items():
-            for import_type, package_list in import_type_dict.items():
-                for package_name, module_list in package_list.items():
-                    for module_name in module_list:
-                        self._add_import(package_name, import_type, module_name, typing_section)
+        entries = file_import._entries  # pylint: disable=protected-access
+        if not self._entries:
+            # share them until one is updated
+            self._entries = entries
+            self._owns_entries = file_import._owns_entries = False  # pylint: disable=protected-access
+            self._imports = None
+        elif not entries.keys() <= self._entries.keys():
+            self._entries_to_update().update(entries)
+
+    def switch_typing_section(self, from_section: TypingSection, to_section: TypingSection) -> "FileImport":
+        """Get a copy of these imports, where the imports of from_section are also in to_section.
+        """
+        file_import = FileImport()
+        file_import._entries = dict(self._entries)  # pylint: disable=protected-access
+        file_import._entries.update(  # pylint: disable=protected-access
+            (_intern_entry((to_section,) + entry[1:]), None) for entry in self._entries if entry[0] == from_section
+        )
+        return file_import
+
+    def __copy__(self) -> "FileImport":
+        file_import = FileImport()
+        file_import._entries = self._entries  # pylint: disable=protected-access
+        file_import._owns_entries = self._owns_entries = False  # pylint: disable=protected-access
+        return file_import
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FileImport):
+            return NotImplemented
+        return self._entries == other._entries  # pylint: disable=protected-access
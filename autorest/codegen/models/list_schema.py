@@ -9,6 +9,8 @@ from .imports import FileImport, ImportType, TypingSection
 
 
 class ListSchema(BaseSchema):
+    __slots__ = ("element_type", "max_items", "min_items", "unique_items")
+
     def __init__(
         self,
         namespace: str,
@@ -3,9 +3,11 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import copy
 import logging
 from typing import Dict, List, Any, Optional, Set, cast
 from .imports import FileImport
+from .base_model import cached_after_freeze, cached_method_after_freeze
 from .operation import Operation
 from .parameter import Parameter
 from .schema_response import SchemaResponse
@@ -15,6 +17,12 @@ from .base_schema import BaseSchema
 
 _LOGGER = logging.getLogger(__name__)
 
+_LRO_EXTENSION_NAMES = {
+    extension_base + suffix
+    for extension_base in ["poller", "default-polling-method", "default-no-polling-method", "base-polling-method"]
+    for suffix in ["-sync", "-async"]
+}
+
 
 class LROOperation(Operation):
     def __init__(
@@ -53,7 +61,12 @@ class LROOperation(Operation):
             want_tracing,
         )
         self.lro_response: Optional[SchemaResponse] = None
-        self.lro_options = yaml_data.get("extensions", {}).get("x-ms-long-running-operation-options", {})
+        extensions = yaml_data.get("extensions", {})
+        self.lro_options = dict(extensions.get("x-ms-long-running-operation-options", {}))
+        # the pollers and polling methods to use, added to the extensions by the namer
+        self._lro_extensions: Dict[str, Any] = {
+            name: copy.deepcopy(extension) for name, extension in extensions.items() if name in _LRO_EXTENSION_NAMES
+        }
 
     def set_lro_response_type(self) -> None:
         if not self.responses:
@@ -83,14 +96,14 @@ class LROOperation(Operation):
             response = responses_with_bodies[0]
         self.lro_response = response
 
-    @property
+    @cached_after_freeze
     def has_optional_return_type(self) -> bool:
         """An LROOperation will never have an optional return type, we will always return a poller"""
         return False
 
     def _get_lro_extension(self, extension_base, async_mode, *, azure_arm=None):
         extension_name = extension_base + ("-async" if async_mode else "-sync")
-        extension = self.yaml_data["extensions"][extension_name]
+        extension = self._lro_extensions[extension_name]
         arm_extension = None
         if azure_arm is not None:
             arm_extension = "azure-arm" if azure_arm else "data-plane"
@@ -120,6 +133,7 @@ class LROOperation(Operation):
     def get_base_polling_method(self, async_mode: bool) -> str:
         return self.get_base_polling_method_path(async_mode).split(".")[-1]
 
+    @cached_method_after_freeze
     def imports(self, code_model, async_mode: bool) -> FileImport:
         file_import = super().imports(code_model, async_mode)
         file_import.add_from_import("typing", "Union", ImportType.STDLIB, TypingSection.CONDITIONAL)
@@ -7,6 +7,7 @@
 from typing import Any, Dict, List, Set, Optional
 from .lro_operation import LROOperation
 from .paging_operation import PagingOperation
+from .base_model import cached_method_after_freeze
 from .imports import FileImport
 from .schema_request import SchemaRequest
 from .parameter import Parameter
@@ -50,6 +51,7 @@ class LROPagingOperation(PagingOperation, LROOperation):
             override_success_response_to_200=True
         )
 
+    @cached_method_after_freeze
     def imports(self, code_model, async_mode: bool) -> FileImport:
         lro_imports = LROOperation.imports(self, code_model, async_mode)
         paging_imports = PagingOperation.imports(self, code_model, async_mode)
@@ -4,13 +4,14 @@
 # license information.
 # --------------------------------------------------------------------------
 from typing import Any, Dict, List, Optional, Union
+from .base_model import Freezable, cached_after_freeze, cached_method_after_freeze
 from .base_schema import BaseSchema
 from .dictionary_schema import DictionarySchema
 from .property import Property
 from .imports import FileImport, ImportType
 
 
-class ObjectSchema(BaseSchema):  # pylint: disable=too-many-instance-attributes
+class ObjectSchema(Freezable, BaseSchema):  # pylint: disable=too-many-instance-attributes
     """Represents a class ready to be serialized in Python.
 
     :param str name: The name of the class.
@@ -160,10 +161,11 @@ class ObjectSchema(BaseSchema):  # pylint: disable=too-many-instance-attributes
         )
         self.discriminator_value = yaml_data.get("discriminatorValue", None)
 
-    @property
+    @cached_after_freeze
     def has_readonly_or_constant_property(self) -> bool:
         return any(x.readonly or x.constant for x in self.properties)
 
+    @cached_method_after_freeze
     def imports(self) -> FileImport:
         file_import = FileImport()
         if self.is_exception:
@@ -7,7 +7,7 @@ from itertools import chain
 import logging
 from typing import cast, Dict, List, Any, Optional, Union, Set, TypeVar
 
-from .base_model import BaseModel
+from .base_model import BaseModel, Freezable, cached_after_freeze, cached_method_after_freeze
 from .imports import FileImport, ImportType, TypingSection
 from .schema_response import SchemaResponse
 from .parameter import Parameter, ParameterStyle
@@ -64,7 +64,7 @@ def _remove_multiple_m4_header_parameters(parameters: List[Parameter]) -> List[P
 
     return remaining_params
 
-class Operation(BaseModel):  # pylint: disable=too-many-public-methods, too-many-instance-attributes
+class Operation(Freezable, BaseModel):  # pylint: disable=too-many-public-methods, too-many-instance-attributes
     """Represent an operation.
     """
 
@@ -102,11 +102,15 @@ class Operation(BaseModel):  # pylint: disable=too-many-public-methods, too-many
         self.want_description_docstring = want_description_docstring
         self.want_tracing = want_tracing
 
+    def freeze(self) -> None:
+        self.parameters.freeze()
+        super().freeze()
+
     @property
     def python_name(self) -> str:
         return self.name
 
-    @property
+    @cached_after_freeze
     def request_content_type(self) -> str:
         return next(iter(
             [
@@ -115,17 +119,17 @@ class Operation(BaseModel):  # pylint: disable=too-many-public-methods, too-many
             ]
         ))
 
-    @property
+    @cached_after_freeze
     def is_stream_request(self) -> bool:
         """Is the request is a stream, like an upload."""
         return any(request.is_stream_request for request in self.requests)
 
-    @property
+    @cached_after_freeze
     def is_stream_response(self) -> bool:
         """Is the response expected to be streamable, like a download."""
         return any(response.is_stream_response for response in self.responses)
 
-    @property
+    @cached_after_freeze
     def has_optional_return_type(self) -> bool:
         """Has optional return type if there are multiple successful response types where some have
         bodies and some are None
@@ -202,7 +206,7 @@ class Operation(BaseModel):  # pylint: disable=too-many-public-methods, too-many
         # FIXME Do the serialization context (XML)
         return ""
 
-    @property
+    @cached_after_freeze
     def has_response_body(self) -> bool:
         """Tell if at least one response has a body.
         """
@@ -214,17 +218,17 @@ class Operation(BaseModel):  # pylint: disable=too-many-public-methods, too-many
                 return response
         raise ValueError(f"Incorrect status code {status_code}, operation {self.name}")
 
-    @property
+    @cached_after_freeze
     def any_response_has_headers(self) -> bool:
         return any(response.has_headers for response in self.responses)
 
-    @property
+    @cached_after_freeze
     def success_status_code(self) -> List[Union[str, int]]:
         """The list of all successfull status code.
         """
         return [code for response in self.responses for code in response.status_codes if code != "default"]
 
-    @property
+    @cached_after_freeze
     def default_exception(self) -> Optional[str]:
         default_excp = [excp for excp in self.exceptions for code in excp.status_codes if code == "default"]
         if not default_excp:
@@ -236,18 +240,21 @@ class Operation(BaseModel):  # pylint: disable=too-many-public-methods, too-many
         return "\'object\'"
 
 
-    @property
+    @cached_after_freeze
     def status_code_exceptions(self) -> List[SchemaResponse]:
         return [excp for excp in self.exceptions if list(excp.status_codes) != ["default"]]
 
-    @property
+    @cached_after_freeze
     def status_code_exceptions_status_codes(self) -> List[Union[str, int]]:
         """Actually returns all of the status codes from exceptions (besides default)"""
         return list(chain.from_iterable([
             excp.status_codes for excp in self.status_code_exceptions
         ]))
 
-    def imports(self, code_model, async_mode: bool) -> FileImport:
+    @cached_method_after_freeze
+    def _sync_and_async_imports(self, code_model) -> FileImport:
+        """The imports of the operation that don't depend on async mode.
+        """
         file_import = FileImport()
 
         # Exceptions
@@ -276,6 +283,11 @@ class Operation(BaseModel):  # pylint: disable=too-many-public-methods, too-many
         file_import.add_from_import("typing", "Generic", ImportType.STDLIB, TypingSection.CONDITIONAL)
         file_import.add_from_import("azure.core.pipeline", "PipelineResponse", ImportType.AZURECORE)
         file_import.add_from_import("azure.core.pipeline.transport", "HttpRequest", ImportType.AZURECORE)
+        return file_import
+
+    @cached_method_after_freeze
+    def imports(self, code_model, async_mode: bool) -> FileImport:
+        file_import = self._sync_and_async_imports(code_model)
         if async_mode:
             file_import.add_from_import("azure.core.pipeline.transport", "AsyncHttpResponse", ImportType.AZURECORE)
         else:
@@ -4,7 +4,7 @@
 # license information.
 # --------------------------------------------------------------------------
 import logging
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any, Optional, Set, Type
 
 from .base_model import BaseModel
 from .operation import Operation
@@ -20,6 +20,10 @@ _LOGGER = logging.getLogger(__name__)
 class OperationGroup(BaseModel):
     """Represent an operation group.
 
+    :param operations_by_id: The operations the group was created with, by yaml id. Unlike operations,
+     it is not updated when operations are added or removed from the group, and it is emptied once the
+     yaml is released.
+    :type operations_by_id: dict[int, ~autorest.models.Operation]
     """
     def __init__(
         self,
@@ -36,6 +40,8 @@ class OperationGroup(BaseModel):
         self.class_name = class_name
         self.operations = operations
         self.api_versions = api_versions
+        self.operations_by_id = {operation.id: operation for operation in operations}
+        self._is_empty_operation_group: bool = not yaml_data["language"]["default"]["name"]
 
     def imports(self, async_mode: bool, has_schemas: bool) -> FileImport:
         file_import = FileImport()
@@ -74,26 +80,39 @@ class OperationGroup(BaseModel):
     def is_empty_operation_group(self) -> bool:
         """The operation group with no name is the direct client methods.
         """
-        return not self.yaml_data["language"]["default"]["name"]
+        return self._is_empty_operation_group
+
+    @staticmethod
+    def get_operation_class(operation_yaml: Dict[str, Any]) -> Type[Operation]:
+        lro_operation = operation_yaml.get("extensions", {}).get("x-ms-long-running-operation")
+        paging_operation = operation_yaml.get("extensions", {}).get("x-ms-pageable")
+        if lro_operation and paging_operation:
+            return LROPagingOperation
+        if lro_operation:
+            return LROOperation
+        if paging_operation:
+            return PagingOperation
+        return Operation
 
     @classmethod
-    def from_yaml(cls, code_model, yaml_data: Dict[str, Any]) -> "OperationGroup":
+    def from_yaml(
+        cls, code_model, yaml_data: Dict[str, Any], operation_classes: Optional[Dict[int, Type[Operation]]] = None
+    ) -> "OperationGroup":
+        """Create an operation group.
+
+        :param operation_classes: The class of the operations by yaml id, if already known
+        """
         name = yaml_data["language"]["python"]["name"]
         _LOGGER.debug("Parsing %s operation group", name)
 
         operations = []
         api_versions: Set[str] = set()
         for operation_yaml in yaml_data["operations"]:
-            lro_operation = operation_yaml.get("extensions", {}).get("x-ms-long-running-operation")
-            paging_operation = operation_yaml.get("extensions", {}).get("x-ms-pageable")
-            if lro_operation and paging_operation:
-                operation = LROPagingOperation.from_yaml(operation_yaml)
-            elif lro_operation:
-                operation = LROOperation.from_yaml(operation_yaml)
-            elif paging_operation:
-                operation = PagingOperation.from_yaml(operation_yaml)
-            else:
-                operation = Operation.from_yaml(operation_yaml)
+            operation_class = (
+                operation_classes[id(operation_yaml)] if operation_classes is not None
+                else cls.get_operation_class(operation_yaml)
+            )
+            operation = operation_class.from_yaml(operation_yaml)
             operations.append(operation)
             api_versions.update(operation.api_versions)
 
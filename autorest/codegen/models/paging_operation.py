@@ -6,6 +6,7 @@
 import logging
 from typing import cast, Dict, List, Any, Optional, Set, Union
 
+from .base_model import cached_after_freeze, cached_method_after_freeze
 from .operation import Operation
 from .parameter import Parameter
 from .schema_response import SchemaResponse
@@ -58,6 +59,11 @@ class PagingOperation(Operation):
         self._next_link_name: str = yaml_data["extensions"]["x-ms-pageable"].get("nextLinkName")
         self.operation_name: str = yaml_data["extensions"]["x-ms-pageable"].get("operationName")
         self.next_operation: Optional[Operation] = None
+        self._pager_extensions: Dict[str, str] = {
+            name: yaml_data["extensions"][name]
+            for name in ("pager-sync", "pager-async")
+            if name in yaml_data["extensions"]
+        }
         self.override_success_response_to_200 = override_success_response_to_200
 
     def _get_response(self) -> SchemaResponse:
@@ -81,7 +87,7 @@ class PagingOperation(Operation):
         )
 
     def _get_paging_extension(self, extension_name):
-        return self.yaml_data["extensions"][extension_name]
+        return self._pager_extensions[extension_name]
 
     @property
     def item_name(self) -> str:
@@ -105,7 +111,7 @@ class PagingOperation(Operation):
             return None
         return self._find_python_name(self._next_link_name, "nextLinkName")
 
-    @property
+    @cached_after_freeze
     def has_optional_return_type(self) -> bool:
         """A paging will never have an optional return type, we will always return a pager"""
         return False
@@ -117,7 +123,7 @@ class PagingOperation(Operation):
     def get_pager(self, async_mode: bool) -> str:
         return self.get_pager_path(async_mode).split(".")[-1]
 
-    @property
+    @cached_after_freeze
     def success_status_code(self) -> List[Union[str, int]]:
         """The list of all successfull status code.
         """
@@ -125,6 +131,7 @@ class PagingOperation(Operation):
             return [200]
         return super(PagingOperation, self).success_status_code
 
+    @cached_method_after_freeze
     def imports(self, code_model, async_mode: bool) -> FileImport:
         file_import = super(PagingOperation, self).imports(code_model, async_mode)
 
@@ -41,6 +41,13 @@ class ParameterStyle(Enum):
 
 
 class Parameter(BaseModel):  # pylint: disable=too-many-instance-attributes
+    __slots__ = (
+        "schema", "rest_api_name", "serialized_name", "description", "_implementation", "required", "location",
+        "skip_url_encoding", "constraints", "target_property_name", "style", "explode", "flattened", "grouped_by",
+        "original_parameter", "_client_default_value", "is_kwarg", "has_multiple_media_types",
+        "multiple_media_types_type_annot", "multiple_media_types_docstring_type",
+    )
+
     def __init__(
         self,
         yaml_data: Dict[str, Any],
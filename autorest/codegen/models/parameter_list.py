@@ -7,6 +7,7 @@ from collections.abc import MutableSequence
 import logging
 from typing import cast, List, Callable, Optional
 
+from .base_model import Freezable, cached_after_freeze
 from .parameter import Parameter, ParameterLocation
 from .object_schema import ObjectSchema
 
@@ -14,7 +15,7 @@ from .object_schema import ObjectSchema
 _LOGGER = logging.getLogger(__name__)
 
 
-class ParameterList(MutableSequence):
+class ParameterList(Freezable, MutableSequence):  # pylint: disable=too-many-ancestors
     def __init__(
         self, parameters: Optional[List[Parameter]] = None, implementation: str = "Method"
     ) -> None:
@@ -32,14 +33,21 @@ class ParameterList(MutableSequence):
         return len(self.parameters)
 
     def __setitem__(self, index, parameter):
+        self._raise_if_frozen()
         self.parameters[index] = parameter
 
     def __delitem__(self, index):
+        self._raise_if_frozen()
         del self.parameters[index]
 
     def insert(self, index: int, value: Parameter) -> None:
+        self._raise_if_frozen()
         self.parameters.insert(index, value)
 
+    def _raise_if_frozen(self) -> None:
+        if self.frozen:
+            raise ValueError("Can't update a parameter list once the code model is built")
+
     # Parameter helpers
 
     def has_any_location(self, location: ParameterLocation) -> bool:
@@ -51,18 +59,18 @@ class ParameterList(MutableSequence):
     def get_from_location(self, location: ParameterLocation) -> List[Parameter]:
         return self.get_from_predicate(lambda parameter: parameter.location == location)
 
-    @property
+    @cached_after_freeze
     def has_body(self) -> bool:
         return self.has_any_location(ParameterLocation.Body)
 
-    @property
+    @cached_after_freeze
     def body(self) -> List[Parameter]:
         if not self.has_body:
             raise ValueError(f"Can't get body parameter")
         # Should we check if there is two body? Modeler role right?
         return self.get_from_location(ParameterLocation.Body)
 
-    @property
+    @cached_after_freeze
     def path(self) -> List[Parameter]:
         return [
             parameter
@@ -71,19 +79,19 @@ class ParameterList(MutableSequence):
             and parameter.rest_api_name != "$host"
         ]
 
-    @property
+    @cached_after_freeze
     def query(self) -> List[Parameter]:
         return self.get_from_location(ParameterLocation.Query)
 
-    @property
+    @cached_after_freeze
     def headers(self) -> List[Parameter]:
         return self.get_from_location(ParameterLocation.Header)
 
-    @property
+    @cached_after_freeze
     def grouped(self) -> List[Parameter]:
         return self.get_from_predicate(lambda parameter: cast(bool, parameter.grouped_by))
 
-    @property
+    @cached_after_freeze
     def constant(self) -> List[Parameter]:
         """Return the constants of this parameter list.
 
@@ -95,7 +103,7 @@ class ParameterList(MutableSequence):
             lambda parameter: parameter.constant
         )
 
-    @property
+    @cached_after_freeze
     def method(self) -> List[Parameter]:
         """The list of parameter used in method signature.
         """
@@ -124,7 +132,7 @@ class ParameterList(MutableSequence):
     def async_method_signature(self) -> List[str]:
         return [parameter.async_method_signature for parameter in self.method]
 
-    @property
+    @cached_after_freeze
     def is_flattened(self) -> bool:
         return cast(bool, self.get_from_predicate(lambda parameter: parameter.flattened))
 
@@ -23,12 +23,18 @@ class RawString(object):
 
 
 class PrimitiveSchema(BaseSchema):
+    __slots__ = ("schema_type",)
+
     _TYPE_MAPPINGS = {
         "boolean": "bool",
     }
 
+    def __init__(self, namespace: str, yaml_data: Dict[str, Any]) -> None:
+        super(PrimitiveSchema, self).__init__(namespace=namespace, yaml_data=yaml_data)
+        self.schema_type: Optional[str] = yaml_data.get("type")
+
     def _to_python_type(self) -> str:
-        return self._TYPE_MAPPINGS.get(self.yaml_data["type"], "str")
+        return self._TYPE_MAPPINGS.get(cast(str, self.schema_type), "str")
 
     @property
     def serialization_type(self) -> str:
@@ -47,6 +53,7 @@ class PrimitiveSchema(BaseSchema):
         return self.docstring_type
 
 class IOSchema(PrimitiveSchema):
+    __slots__ = ("type",)
 
     def __init__(self, namespace, yaml_data) -> None:
         super(IOSchema, self).__init__(namespace=namespace, yaml_data=yaml_data)
@@ -75,6 +82,8 @@ class IOSchema(PrimitiveSchema):
 
 
 class AnySchema(PrimitiveSchema):
+    __slots__ = ()
+
     @property
     def serialization_type(self) -> str:
         return "object"
@@ -85,6 +94,8 @@ class AnySchema(PrimitiveSchema):
 
 
 class NumberSchema(PrimitiveSchema):
+    __slots__ = ("precision", "multiple", "maximum", "minimum", "exclusive_maximum", "exclusive_minimum")
+
     def __init__(self, namespace: str, yaml_data: Dict[str, Any]) -> None:
         super(NumberSchema, self).__init__(namespace=namespace, yaml_data=yaml_data)
         self.precision = cast(int, yaml_data["precision"])
@@ -124,7 +135,7 @@ class NumberSchema(PrimitiveSchema):
 
     @property
     def serialization_type(self) -> str:
-        if self.yaml_data["type"] == "integer":
+        if self.schema_type == "integer":
             if self.precision == 64:
                 return "long"
             return "int"
@@ -132,7 +143,7 @@ class NumberSchema(PrimitiveSchema):
 
     @property
     def docstring_type(self) -> str:
-        if self.yaml_data["type"] == "integer":
+        if self.schema_type == "integer":
             if self.precision == 64:
                 return "long"
             return "int"
@@ -147,6 +158,7 @@ class NumberSchema(PrimitiveSchema):
 
 
 class StringSchema(PrimitiveSchema):
+    __slots__ = ("max_length", "min_length", "pattern")
 
     def __init__(self, namespace: str, yaml_data: Dict[str, Any]) -> None:
         super(StringSchema, self).__init__(namespace=namespace, yaml_data=yaml_data)
@@ -182,6 +194,8 @@ class StringSchema(PrimitiveSchema):
 
 
 class DatetimeSchema(PrimitiveSchema):
+    __slots__ = ("format",)
+
     def __init__(self, namespace: str, yaml_data: Dict[str, Any]) -> None:
         super(DatetimeSchema, self).__init__(namespace=namespace, yaml_data=yaml_data)
         self.format = self.Formats(yaml_data["format"])
@@ -219,6 +233,8 @@ class DatetimeSchema(PrimitiveSchema):
         return file_import
 
 class TimeSchema(PrimitiveSchema):
+    __slots__ = ()
+
     @property
     def serialization_type(self) -> str:
         return "time"
@@ -248,6 +264,8 @@ class TimeSchema(PrimitiveSchema):
 
 
 class UnixTimeSchema(PrimitiveSchema):
+    __slots__ = ()
+
     @property
     def serialization_type(self) -> str:
         return "unix-time"
@@ -277,6 +295,8 @@ class UnixTimeSchema(PrimitiveSchema):
 
 
 class DateSchema(PrimitiveSchema):
+    __slots__ = ()
+
     @property
     def serialization_type(self) -> str:
         return "date"
@@ -306,6 +326,8 @@ class DateSchema(PrimitiveSchema):
 
 
 class DurationSchema(PrimitiveSchema):
+    __slots__ = ()
+
     @property
     def serialization_type(self) -> str:
         return "duration"
@@ -335,6 +357,8 @@ class DurationSchema(PrimitiveSchema):
 
 
 class ByteArraySchema(PrimitiveSchema):
+    __slots__ = ("format",)
+
     def __init__(self, namespace: str, yaml_data: Dict[str, Any]) -> None:
         super(ByteArraySchema, self).__init__(namespace=namespace, yaml_data=yaml_data)
         self.format = self.Formats(yaml_data["format"])
@@ -12,6 +12,11 @@ from .base_schema import BaseSchema
 
 
 class Property(BaseModel):  # pylint: disable=too-many-instance-attributes
+    __slots__ = (
+        "name", "schema", "original_swagger_name", "flattened_names", "required", "readonly", "is_discriminator",
+        "constant", "description", "validation_map", "client_default_value",
+    )
+
     def __init__(
         self,
         yaml_data: Dict[str, Any],
@@ -75,7 +80,7 @@ class Property(BaseModel):  # pylint: disable=too-many-instance-attributes
             name=name,
             schema=schema,
             original_swagger_name=yaml_data["serializedName"],
-            flattened_names=yaml_data.get("flattenedNames", []),
+            flattened_names=list(yaml_data.get("flattenedNames", [])),
             client_default_value=yaml_data.get("clientDefaultValue"),
         )
 
@@ -0,0 +1,123 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+from .base_schema import BaseSchema
+from .enum_schema import EnumSchema
+from .object_schema import ObjectSchema
+from .primitive_schemas import get_primitive_schema
+
+
+def _hashable(yaml_data: Any) -> Hashable:
+    if isinstance(yaml_data, dict):
+        return tuple(sorted((key, _hashable(value)) for key, value in yaml_data.items()))
+    if isinstance(yaml_data, list):
+        return tuple(_hashable(value) for value in yaml_data)
+    return yaml_data
+
+
+class SchemaRegistry:
+    """The schemas we have created, indexed by the yaml id of the schema they were created from.
+
+    :param objects: The object schemas we are going to serialize in the models files.
+    :type objects: dict[int, ~autorest.models.ObjectSchema]
+    :param enums: The enums we are going to serialize.
+    :type enums: dict[int, ~autorest.models.EnumSchema]
+    :param primitives: The other schemas.
+    :type primitives: dict[int, ~autorest.models.BaseSchema]
+    """
+
+    def __init__(self) -> None:
+        self.objects: Dict[int, ObjectSchema] = {}
+        self.enums: Dict[int, EnumSchema] = {}
+        self.primitives: Dict[int, BaseSchema] = {}
+        self._schemas: Dict[int, BaseSchema] = {}
+        self._registration_order: Dict[int, int] = {}
+        # Names are only known once the schemas are filled, so this index is built on first use
+        self._schemas_by_name: Optional[Dict[str, BaseSchema]] = None
+        self._interned_primitives: Dict[Tuple[str, Hashable], BaseSchema] = {}
+        self._yaml_ids_released = False
+
+    def add(self, yaml_id: int, schema: BaseSchema) -> None:
+        """Add a schema, in the objects, enums or primitives view depending on its type.
+        """
+        if isinstance(schema, ObjectSchema):
+            self.objects[yaml_id] = schema
+        elif isinstance(schema, EnumSchema):
+            self.enums[yaml_id] = schema
+        else:
+            self.primitives[yaml_id] = schema
+        self._schemas[yaml_id] = schema
+        self._registration_order.setdefault(yaml_id, len(self._registration_order))
+        self._schemas_by_name = None
+
+    def get_primitive_schema(self, namespace: str, yaml_data: Dict[str, Any]) -> BaseSchema:
+        """Get the primitive schema of a yaml schema, shared by all the yaml schemas with the same content.
+
+        Specs have thousands of primitive schemas, like strings, that only differ by their description.
+        """
+        # primitive schemas don't use the names and descriptions of their yaml
+        key = (namespace, _hashable({k: v for k, v in yaml_data.items() if k != "language"}))
+        try:
+            return self._interned_primitives[key]
+        except KeyError:
+            schema = self._interned_primitives[key] = get_primitive_schema(namespace=namespace, yaml_data=yaml_data)
+            return schema
+
+    def replace(self, view: Dict[int, BaseSchema], schemas: Dict[int, BaseSchema]) -> None:
+        """Replace all the schemas of a view, i.e. objects, by new ones.
+        """
+        for yaml_id in view:
+            del self._schemas[yaml_id]
+            del self._registration_order[yaml_id]
+        view.clear()
+        for yaml_id, schema in schemas.items():
+            self.add(yaml_id, schema)
+
+    def lookup(self, yaml_id: int) -> BaseSchema:
+        """Get a schema by the yaml id of the schema it was created from.
+
+        :raises: KeyError if schema is not found, RuntimeError if the yaml ids were released
+        """
+        if self._yaml_ids_released:
+            raise RuntimeError(f"Can't look up yaml id {yaml_id}, the yaml tree of the code model was released")
+        return self._schemas[yaml_id]
+
+    def release_yaml_ids(self) -> None:
+        """Forget the yaml ids, once the yaml tree is released: new objects may get them.
+
+        The views keep their schemas, in the same order, keyed by their position instead. Lookups by
+        yaml id raise from now on.
+        """
+        for view in (self.objects, self.enums, self.primitives):
+            schemas = list(view.values())
+            view.clear()
+            view.update(enumerate(schemas))  # type: ignore
+        self._schemas.clear()
+        self._registration_order.clear()
+        self._yaml_ids_released = True
+
+    def lookup_by_name(self, name: str) -> BaseSchema:
+        """Get an object schema or an enum by its Python name.
+
+        :raises: KeyError if schema is not found
+        """
+        if self._schemas_by_name is None:
+            self._schemas_by_name = {schema.name: schema for schema in self.enums.values()}
+            self._schemas_by_name.update((schema.name, schema) for schema in self.objects.values())
+        return self._schemas_by_name[name]
+
+    def registration_order(self, yaml_id: int) -> int:
+        return self._registration_order[yaml_id]
+
+    def __contains__(self, yaml_id: object) -> bool:
+        return yaml_id in self._schemas
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._schemas)
+
+    def __len__(self) -> int:
+        return len(self._schemas)
@@ -19,6 +19,12 @@ class SchemaRequest(BaseModel):
         super().__init__(yaml_data)
         self.media_types = media_types
         self.parameters = ParameterList(parameters)
+        http_protocol = yaml_data.get("protocol", {}).get("http", {})
+        if http_protocol.get("knownMediaType"):
+            # FIXME: this might be an m4 issue
+            self._is_stream_request: bool = http_protocol["knownMediaType"] == "binary"
+        else:
+            self._is_stream_request = http_protocol.get("binary", False)
 
     @property
     def pre_semicolon_media_types(self) -> List[str]:
@@ -36,9 +42,7 @@ class SchemaRequest(BaseModel):
     @property
     def is_stream_request(self) -> bool:
         """Is the request expected to be streamable, like a download."""
-        if self.yaml_data['protocol']['http'].get('knownMediaType'):
-            return self.yaml_data['protocol']['http']['knownMediaType'] == 'binary' # FIXME: this might be an m4 issue
-        return self.yaml_data["protocol"]["http"].get("binary", False)
+        return self._is_stream_request
 
     @classmethod
     def from_yaml(cls, yaml_data: Dict[str, Any]) -> "SchemaRequest":
@@ -49,7 +53,7 @@ class SchemaRequest(BaseModel):
 
         return cls(
             yaml_data=yaml_data,
-            media_types=yaml_data["protocol"]["http"].get("mediaTypes", []),
+            media_types=list(yaml_data["protocol"]["http"].get("mediaTypes", [])),
             parameters=parameters
         )
 
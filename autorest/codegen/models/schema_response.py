@@ -11,6 +11,8 @@ from .object_schema import ObjectSchema
 
 
 class HeaderResponse:
+    __slots__ = ("name", "schema")
+
     def __init__(self, name: str, schema) -> None:
         self.name = name
         self.schema = schema
@@ -21,6 +23,8 @@ class HeaderResponse:
 
 
 class SchemaResponse(BaseModel):
+    __slots__ = ("schema", "media_types", "status_codes", "headers", "binary", "nullable")
+
     def __init__(
         self,
         yaml_data: Dict[str, Any],
@@ -97,7 +101,7 @@ class SchemaResponse(BaseModel):
         return cls(
             yaml_data=yaml_data,
             schema=yaml_data.get("schema", None),  # FIXME replace by operation model
-            media_types=yaml_data["protocol"]["http"].get("mediaTypes", []),
+            media_types=list(yaml_data["protocol"]["http"].get("mediaTypes", [])),
             status_codes=[
                 int(code) if code != "default" else "default" for code in yaml_data["protocol"]["http"]["statusCodes"]
             ],
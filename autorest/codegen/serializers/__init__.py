@@ -3,14 +3,23 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import concurrent.futures
+import hashlib
+import itertools
+import logging
 from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
 
-from jinja2 import PackageLoader, Environment
+from jinja2 import Environment
 
+from ... import get_mp_context
+from ...jinja_environment import get_environment
 from ...jsonrpc import AutorestAPI
+from ...manifest import OutputManifest
 from ..models import CodeModel
 
 from .enum_serializer import EnumSerializer
+from .fragment_cache import FragmentCache
 from .general_serializer import GeneralSerializer
 from .model_generic_serializer import ModelGenericSerializer
 from .model_init_serializer import ModelInitSerializer
@@ -23,31 +32,167 @@ __all__ = [
     "JinjaSerializer",
 ]
 
+_LOGGER = logging.getLogger(__name__)
+
+# Larger files are streamed to autorest even with a manifest, which needs the whole content to tell if a file
+# changed: they are written every time, and recorded in the manifest with the hash of the streamed chunks
+_STREAMED_FILE_SIZE = 1024 * 1024
+
+# The files rendered in a process pool with --python.jobs: ("models",), ("models_py3",), ("enums",),
+# or ("operation_group", index of the operation group, async mode)
+RenderKey = Union[Tuple[str], Tuple[str, int, bool]]
+
+
+def _render(
+    code_model: CodeModel, env: Environment, key: RenderKey, fragment_cache: Optional[FragmentCache]
+) -> Iterable[str]:
+    kind = key[0]
+    if kind == "models":
+        return ModelGenericSerializer(code_model=code_model, env=env, fragment_cache=fragment_cache).generate()
+    if kind == "models_py3":
+        return ModelPython3Serializer(code_model=code_model, env=env, fragment_cache=fragment_cache).generate()
+    if kind == "enums":
+        return EnumSerializer(code_model=code_model, env=env, fragment_cache=fragment_cache).generate()
+    _, operation_group_index, async_mode = key  # type: ignore
+    return OperationGroupSerializer(
+        code_model=code_model,
+        env=env,
+        operation_group=code_model.operation_groups[operation_group_index],
+        async_mode=async_mode,
+        fragment_cache=fragment_cache,
+    ).generate()
+
+
+class _WorkerState:
+    """The code model, environment and fragment cache of a worker process of the pool.
+
+    :param code_model: The code model, as pickled to the worker
+    """
+
+    def __init__(self, code_model: CodeModel) -> None:
+        # pickled models are not frozen
+        code_model.freeze()
+        self.code_model = code_model
+        self.env = get_environment("autorest.codegen")
+        self.fragment_cache = FragmentCache.create(code_model)
+
+    def render(self, key: RenderKey) -> str:
+        return "".join(_render(self.code_model, self.env, key, self.fragment_cache))
+
+
+_WORKER_STATE: Optional[_WorkerState] = None
+
+
+def _init_worker(code_model: CodeModel) -> None:
+    global _WORKER_STATE  # pylint: disable=global-statement
+    _WORKER_STATE = _WorkerState(code_model)
+
+
+def _render_in_worker(key: RenderKey) -> str:
+    assert _WORKER_STATE is not None, "The worker was not initialized"
+    return _WORKER_STATE.render(key)
+
 
 class JinjaSerializer:
-    def __init__(self, autorestapi: AutorestAPI) -> None:
+    """Serialize a code model into files, written through the autorest API.
+
+    :param autorestapi: The autorest API
+    :param int jobs: The number of processes rendering the models and operation groups files.
+     With more than one, files are rendered in a process pool, and written in the same order as with one.
+    :param manifest: The manifest of the output folder. If given, files generated as in the previous run are not
+     written again, except the large ones, which are streamed.
+    """
+
+    def __init__(self, autorestapi: AutorestAPI, jobs: int = 1, manifest: Optional[OutputManifest] = None) -> None:
         self._autorestapi = autorestapi
+        self._jobs = jobs
+        self._manifest = manifest
+        self._rendered: Dict[RenderKey, "concurrent.futures.Future[str]"] = {}
+        self._fragment_cache: Optional[FragmentCache] = None
+
+    def _write_file(self, filename: Path, file_content: str) -> None:
+        if self._manifest and self._manifest.add_generated_file(filename, file_content):
+            _LOGGER.debug("Not writing unchanged file %s", filename)
+            return
+        self._autorestapi.write_file(filename, file_content)
+
+    def _write_file_chunks(self, filename: Path, file_chunks: Iterable[str]) -> None:
+        if not self._manifest:
+            self._autorestapi.write_file_stream(filename, file_chunks)
+            return
+        file_chunks = iter(file_chunks)
+        buffered_chunks = []
+        buffered_size = 0
+        for chunk in file_chunks:
+            buffered_chunks.append(chunk)
+            buffered_size += len(chunk)
+            if buffered_size > _STREAMED_FILE_SIZE:
+                break
+        else:
+            self._write_file(filename, "".join(buffered_chunks))
+            return
+
+        digest = hashlib.sha256()
+
+        def _hashed_chunks() -> Iterable[str]:
+            for chunk in itertools.chain(buffered_chunks, file_chunks):
+                digest.update(chunk.encode("utf-8"))
+                yield chunk
+
+        _LOGGER.debug("Streaming large file %s", filename)
+        self._autorestapi.write_file_stream(filename, _hashed_chunks())
+        self._manifest.add_written_file(filename, digest.hexdigest())
+
+    def _render_keys(self, code_model: CodeModel) -> Iterable[RenderKey]:
+        if code_model.schemas:
+            yield ("models",)
+            yield ("models_py3",)
+        if code_model.enums:
+            yield ("enums",)
+        for index in range(len(code_model.operation_groups or [])):
+            yield ("operation_group", index, False)
+            if not code_model.options["no_async"]:
+                yield ("operation_group", index, True)
+
+    def _write_rendered_file(
+        self, filename: Path, code_model: CodeModel, env: Environment, key: RenderKey
+    ) -> None:
+        future: Optional["concurrent.futures.Future[str]"] = self._rendered.pop(key, None)
+        if future is not None:
+            self._write_file(filename, future.result())
+        else:
+            self._write_file_chunks(filename, _render(code_model, env, key, self._fragment_cache))
 
     def serialize(self, code_model: CodeModel) -> None:
-        env = Environment(
-            loader=PackageLoader("autorest.codegen", "templates"),
-            keep_trailing_newline=True,
-            line_statement_prefix="##",
-            line_comment_prefix="###",
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        if self._jobs > 1:
+            _LOGGER.debug("Rendering files in %s processes", self._jobs)
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._jobs, mp_context=get_mp_context(), initializer=_init_worker, initargs=(code_model,)
+            ) as executor:
+                self._rendered = {
+                    key: executor.submit(_render_in_worker, key) for key in self._render_keys(code_model)
+                }
+                try:
+                    self._serialize(code_model)
+                finally:
+                    for future in self._rendered.values():
+                        future.cancel()
+                    self._rendered = {}
+        else:
+            self._serialize(code_model)
+
+    def _serialize(self, code_model: CodeModel) -> None:
+        env = get_environment("autorest.codegen")
+        self._fragment_cache = FragmentCache.create(code_model)
 
         namespace_path = (
             Path(".") if code_model.options["no_namespace_folders"] else Path(*(code_model.namespace.split(".")))
         )
 
         # if there was a patch file before, we keep it
-        if self._autorestapi.read_file(namespace_path / "_patch.py"):
-            self._autorestapi.write_file(
-                namespace_path / Path("_patch.py"),
-                self._autorestapi.read_file(namespace_path / "_patch.py")
-            )
+        patch_file = self._autorestapi.read_file(namespace_path / "_patch.py")
+        if patch_file:
+            self._write_file(namespace_path / Path("_patch.py"), patch_file)
 
         if code_model.schemas or code_model.enums:
             self._serialize_and_write_models_folder(code_model=code_model, env=env, namespace_path=namespace_path)
@@ -67,22 +212,20 @@ class JinjaSerializer:
                     code_model, env=env, namespace_path=namespace_path
                 )
 
+        if self._manifest:
+            self._manifest.write(self._autorestapi)
+
     def _serialize_and_write_models_folder(self, code_model: CodeModel, env: Environment, namespace_path: Path) -> None:
         # Write the models folder
         models_path = namespace_path / Path("models")
         if code_model.schemas:
-            self._autorestapi.write_file(
-                models_path / Path("_models.py"), ModelGenericSerializer(code_model=code_model, env=env).serialize()
-            )
-            self._autorestapi.write_file(
-                models_path / Path("_models_py3.py"), ModelPython3Serializer(code_model=code_model, env=env).serialize()
-            )
+            self._write_rendered_file(models_path / Path("_models.py"), code_model, env, ("models",))
+            self._write_rendered_file(models_path / Path("_models_py3.py"), code_model, env, ("models_py3",))
         if code_model.enums:
-            self._autorestapi.write_file(
-                models_path / Path(f"_{code_model.module_name}_enums.py"),
-                EnumSerializer(code_model=code_model, env=env).serialize(),
+            self._write_rendered_file(
+                models_path / Path(f"_{code_model.module_name}_enums.py"), code_model, env, ("enums",)
             )
-        self._autorestapi.write_file(
+        self._write_file(
             models_path / Path("__init__.py"), ModelInitSerializer(code_model=code_model, env=env).serialize()
         )
 
@@ -91,62 +234,55 @@ class JinjaSerializer:
     ) -> None:
         # write sync operations init file
         operations_init_serializer = OperationsInitSerializer(code_model=code_model, env=env, async_mode=False)
-        self._autorestapi.write_file(
+        self._write_file(
             namespace_path / Path(f"operations") / Path("__init__.py"), operations_init_serializer.serialize()
         )
 
         # write async operations init file
         if not code_model.options["no_async"]:
             operations_async_init_serializer = OperationsInitSerializer(code_model=code_model, env=env, async_mode=True)
-            self._autorestapi.write_file(
+            self._write_file(
                 namespace_path / Path("aio") / Path(f"operations") / Path("__init__.py"),
                 operations_async_init_serializer.serialize(),
             )
 
-        for operation_group in code_model.operation_groups:
+        for index, operation_group in enumerate(code_model.operation_groups):
             # write sync operation group and operation files
-            operation_group_serializer = OperationGroupSerializer(
-                code_model=code_model, env=env, operation_group=operation_group, async_mode=False
-            )
-            self._autorestapi.write_file(
+            self._write_rendered_file(
                 namespace_path / Path(f"operations") / Path(f"{operation_group.filename}.py"),
-                operation_group_serializer.serialize(),
+                code_model,
+                env,
+                ("operation_group", index, False),
             )
 
             if not code_model.options["no_async"]:
                 # write async operation group and operation files
-                operation_group_async_serializer = OperationGroupSerializer(
-                    code_model=code_model, env=env, operation_group=operation_group, async_mode=True
-                )
-                self._autorestapi.write_file(
+                self._write_rendered_file(
                     (
                         namespace_path
                         / Path("aio")
                         / Path(f"operations")
                         / Path(f"{operation_group.filename}.py")
                     ),
-                    operation_group_async_serializer.serialize(),
+                    code_model,
+                    env,
+                    ("operation_group", index, True),
                 )
 
 
     def _serialize_and_write_version_file(
         self, code_model: CodeModel, namespace_path: Path, general_serializer: GeneralSerializer
     ):
-        def _read_version_file(original_version_file_name: str) -> str:
+        def _read_version_file(original_version_file_name: str) -> Optional[str]:
             return self._autorestapi.read_file(namespace_path / original_version_file_name)
 
-        def _write_version_file(original_version_file_name: str) -> None:
-            self._autorestapi.write_file(
-                namespace_path / Path("_version.py"),
-                _read_version_file(original_version_file_name)
-            )
-        keep_version_file = code_model.options['keep_version_file']
-        if keep_version_file and _read_version_file("_version.py"):
-            _write_version_file(original_version_file_name="_version.py")
-        elif keep_version_file and _read_version_file("version.py"):
-            _write_version_file(original_version_file_name="version.py")
+        version_file = None
+        if code_model.options['keep_version_file']:
+            version_file = _read_version_file("_version.py") or _read_version_file("version.py")
+        if version_file:
+            self._write_file(namespace_path / Path("_version.py"), version_file)
         elif code_model.options['package_version']:
-            self._autorestapi.write_file(
+            self._write_file(
                 namespace_path / Path("_version.py"),
                 general_serializer.serialize_version_file()
             )
@@ -157,24 +293,24 @@ class JinjaSerializer:
         general_serializer = GeneralSerializer(code_model=code_model, env=env, async_mode=False)
 
         if code_model.operation_groups:
-            self._autorestapi.write_file(
+            self._write_file(
                 namespace_path / Path("__init__.py"), general_serializer.serialize_init_file()
             )
         else:
-            self._autorestapi.write_file(
+            self._write_file(
                 namespace_path / Path("__init__.py"), general_serializer.serialize_pkgutil_init_file()
             )
         p = namespace_path.parent
         while p != Path("."):
             # write pkgutil init file
-            self._autorestapi.write_file(
+            self._write_file(
                 p / Path("__init__.py"), general_serializer.serialize_pkgutil_init_file()
             )
             p = p.parent
 
         # Write the service client
         if code_model.operation_groups:
-            self._autorestapi.write_file(
+            self._write_file(
                 namespace_path / Path(f"_{code_model.module_name}.py"),
                 general_serializer.serialize_service_client_file()
             )
@@ -182,17 +318,17 @@ class JinjaSerializer:
         self._serialize_and_write_version_file(code_model, namespace_path, general_serializer)
 
         # write the empty py.typed file
-        self._autorestapi.write_file(namespace_path / Path("py.typed"), "# Marker file for PEP 561.")
+        self._write_file(namespace_path / Path("py.typed"), "# Marker file for PEP 561.")
 
         # Write the config file
         if code_model.operation_groups:
-            self._autorestapi.write_file(
+            self._write_file(
                 namespace_path / Path("_configuration.py"), general_serializer.serialize_config_file()
             )
 
         # Write the setup file
         if code_model.options["basic_setup_py"]:
-            self._autorestapi.write_file(Path("setup.py"), general_serializer.serialize_setup_file())
+            self._write_file(Path("setup.py"), general_serializer.serialize_setup_file())
 
     def _serialize_and_write_aio_folder(self, code_model: CodeModel, env: Environment, namespace_path: Path) -> None:
         aio_general_serializer = GeneralSerializer(code_model=code_model, env=env, async_mode=True)
@@ -200,19 +336,19 @@ class JinjaSerializer:
         aio_path = namespace_path / Path("aio")
 
         # Write the __init__ file
-        self._autorestapi.write_file(aio_path / Path("__init__.py"), aio_general_serializer.serialize_init_file())
+        self._write_file(aio_path / Path("__init__.py"), aio_general_serializer.serialize_init_file())
 
         # Write the service client
-        self._autorestapi.write_file(
+        self._write_file(
             aio_path / Path(f"_{code_model.module_name}.py"),
             aio_general_serializer.serialize_service_client_file(),
         )
 
         # Write the config file
-        self._autorestapi.write_file(
+        self._write_file(
             aio_path / Path("_configuration.py"), aio_general_serializer.serialize_config_file()
         )
 
     def _serialize_and_write_metadata(self, code_model: CodeModel, env: Environment, namespace_path: Path) -> None:
         metadata_serializer = MetadataSerializer(code_model, env)
-        self._autorestapi.write_file(namespace_path / Path("_metadata.json"), metadata_serializer.serialize())
+        self._write_file(namespace_path / Path("_metadata.json"), metadata_serializer.serialize())
@@ -4,16 +4,31 @@
 # license information.
 # --------------------------------------------------------------------------
 
+from typing import Iterator, Optional
 from jinja2 import Environment
-from ..models import CodeModel
+from ..models import CodeModel, EnumSchema
+from .fragment_cache import FileFragments, FragmentCache
 
 
 class EnumSerializer:
-    def __init__(self, code_model: CodeModel, env: Environment) -> None:
+    def __init__(
+        self, code_model: CodeModel, env: Environment, fragment_cache: Optional[FragmentCache] = None
+    ) -> None:
         self.code_model = code_model
         self.env = env
+        self.fragment_cache = fragment_cache
 
     def serialize(self) -> str:
-        # Generate the enum file
+        return "".join(self.generate())
+
+    def generate(self) -> Iterator[str]:
+        # Generate the enum file, chunk by chunk, with the class of each enum rendered or read from the cache
+        fragments = FileFragments(self.fragment_cache, "enums")
         template = self.env.get_template("enum_container.py.jinja2")
-        return template.render(code_model=self.code_model)
+        yield from template.generate(
+            code_model=self.code_model, enum_fragment=lambda enum: fragments.render(enum, self.render_enum)
+        )
+        fragments.save()
+
+    def render_enum(self, enum: EnumSchema) -> str:
+        return self.env.get_template("enum.py.jinja2").render(enum=enum)
@@ -0,0 +1,187 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Rendered fragments of the generated files, cached across runs in a "fragments" cache (see autorest.cache).
+
+A fragment is the class of a model or of an enum, or the method of an operation. It is keyed by a hash of its
+element of the code model, and of every element this one refers to, so changing a model only renders again
+the fragments of this model and of the models and operations using it. The fragments of a file are cached in
+one entry, keyed by the file, the templates, the code of autorest.codegen computing what they render, and the
+options.
+"""
+import hashlib
+import io
+import logging
+import pickle
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...cache import get_cache_folder, get_sources_hash, hash_object, read_cache, write_cache
+from ...jinja_environment import get_templates_hash
+from ..models import CodeModel
+
+_LOGGER = logging.getLogger(__name__)
+
+_CACHE_NAME = "fragments"
+
+# Most of what is pickled, and never an element or a set
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+class _ElementPickler(pickle.Pickler):
+    """Pickle one element of the code model, the same from one run to the other.
+
+    Sets are pickled sorted, and the other elements it refers to are pickled as their name, and recorded.
+    Strings are not memoized, since which equal strings are the same object changes from one run to the other:
+    the memo of pickle is off, and the other objects are memoized as the order in which they were first pickled.
+    """
+
+    def __init__(self, file: io.BytesIO, element_names: Dict[int, Tuple[str, ...]]) -> None:
+        super(_ElementPickler, self).__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.fast = True
+        self._element_names = element_names
+        # id of a pickled object to its index, and the object to keep its id from being reused
+        self._memo: Dict[int, Tuple[int, Any]] = {}
+        self.references: List[Any] = []
+
+    def persistent_id(self, obj: Any) -> Any:  # pylint: disable=method-hidden
+        if type(obj) in _SCALAR_TYPES:  # pylint: disable=unidiomatic-typecheck
+            return None
+        memo_entry = self._memo.get(id(obj))
+        if memo_entry is not None:
+            return memo_entry[0]
+        if self._memo:
+            element_name = self._element_names.get(id(obj))
+            if element_name is not None:
+                self.references.append(obj)
+                return element_name
+        if isinstance(obj, (set, frozenset)):
+            return sorted(obj, key=repr)
+        self._memo[id(obj)] = (len(self._memo), obj)
+        return None
+
+
+class FragmentCache:
+    """The keys of the fragments of a code model, and their cache. Create it with FragmentCache.create.
+
+    :param code_model: The code model
+    """
+
+    def __init__(self, code_model: CodeModel) -> None:
+        self._context = hash_object((
+            get_templates_hash("autorest.codegen"),
+            get_sources_hash("autorest.codegen"),
+            sorted(code_model.options.items()),
+            code_model.base_url,
+            code_model.namespace,
+        ))
+        self._element_names: Dict[int, Tuple[str, ...]] = {}
+        for schema in code_model.sorted_schemas:
+            self._element_names[id(schema)] = ("model", schema.name)
+        for enum in code_model.enums.values():
+            self._element_names[id(enum)] = ("enum", enum.name)
+        for operation_group in code_model.operation_groups:
+            for operation in operation_group.operations:
+                self._element_names[id(operation)] = ("operation", operation_group.name, operation.name)
+        # id of an element to the digest of its own pickle, and the elements it refers to
+        self._own_digests: Dict[int, Tuple[bytes, List[Any]]] = {}
+        self._keys: Dict[int, str] = {}
+
+    @classmethod
+    def create(cls, code_model: CodeModel) -> Optional["FragmentCache"]:
+        """Create the fragment cache of a code model.
+
+        :param code_model: The code model
+        :returns: The fragment cache, or None if caches are disabled
+        """
+        if get_cache_folder(_CACHE_NAME) is None:
+            return None
+        return cls(code_model)
+
+    def _own_digest(self, element: Any) -> Tuple[bytes, List[Any]]:
+        try:
+            return self._own_digests[id(element)]
+        except KeyError:
+            pass
+        content = io.BytesIO()
+        pickler = _ElementPickler(content, self._element_names)
+        pickler.dump(element)
+        own_digest = (hashlib.sha256(content.getvalue()).digest(), pickler.references)
+        self._own_digests[id(element)] = own_digest
+        return own_digest
+
+    def element_key(self, element: Any) -> str:
+        """The key of the fragment of an element: a hash of the element, and of the elements it refers to.
+
+        :param element: A model, an enum or an operation
+        :rtype: str
+        """
+        try:
+            return self._keys[id(element)]
+        except KeyError:
+            pass
+        digest = hashlib.sha256()
+        seen = {id(element)}
+        to_hash = [element]
+        while to_hash:
+            own_digest, references = self._own_digest(to_hash.pop())
+            digest.update(own_digest)
+            for reference in reversed(references):
+                if id(reference) not in seen:
+                    seen.add(id(reference))
+                    to_hash.append(reference)
+        key = digest.hexdigest()
+        self._keys[id(element)] = key
+        return key
+
+    def file_key(self, file_id: str) -> str:
+        """The key of the cache entry of the fragments of a file.
+
+        :param str file_id: What the file is, i.e. "models_py3"
+        :rtype: str
+        """
+        return hash_object((self._context, file_id))
+
+
+class FileFragments:
+    """The fragments of a file, rendered or read from the fragment cache.
+
+    :param fragment_cache: The fragment cache, or None to render every fragment
+    :param str file_id: What the file is, i.e. "models_py3"
+    """
+
+    def __init__(self, fragment_cache: Optional[FragmentCache], file_id: str) -> None:
+        self._fragment_cache = fragment_cache
+        self._cached: Dict[str, str] = {}
+        self._rendered: Dict[str, str] = {}
+        if fragment_cache:
+            self._file_key = fragment_cache.file_key(file_id)
+            self._cached = read_cache(_CACHE_NAME, self._file_key) or {}
+
+    def render(self, element: Any, render_fragment: Callable[[Any], str]) -> str:
+        """Get the fragment of an element.
+
+        :param element: A model, an enum or an operation
+        :param render_fragment: Renders the fragment of an element
+        :rtype: str
+        """
+        if not self._fragment_cache:
+            return render_fragment(element)
+        key = self._fragment_cache.element_key(element)
+        fragment = self._cached.get(key)
+        if fragment is None:
+            fragment = render_fragment(element)
+        self._rendered[key] = fragment
+        return fragment
+
+    def save(self) -> None:
+        """Write the fragments of this file in the cache, unless they are the cached ones.
+        """
+        if self._fragment_cache and self._rendered != self._cached:
+            _LOGGER.debug(
+                "Caching fragments, %s of %s rendered",
+                sum(1 for key in self._rendered if key not in self._cached),
+                len(self._rendered),
+            )
+            write_cache(_CACHE_NAME, self._file_key, self._rendered)
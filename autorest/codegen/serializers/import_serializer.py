@@ -3,7 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from copy import deepcopy
+from copy import copy
 from typing import Dict, Set, Optional, List, Tuple, Union
 from ..models.imports import ImportType, FileImport, TypingSection
 
@@ -46,35 +46,31 @@ class FileImportSerializer:
         self._file_import = file_import
         self.is_python_3_file = is_python_3_file
 
-    def _switch_typing_section_key(self, new_key: TypingSection):
-        switched_dictionary = {}
-        switched_dictionary[new_key] = self._file_import.imports[TypingSection.CONDITIONAL]
-        return switched_dictionary
-
-    def _get_imports_dict(self, baseline_typing_section: TypingSection, add_conditional_typing: bool):
+    def _get_imports_dict(
+        self, file_import: FileImport, baseline_typing_section: TypingSection, add_conditional_typing: bool
+    ):
         # If this is a python 3 file, our regular imports include the CONDITIONAL category
         # If this is not a python 3 file, our typing imports include the CONDITIONAL category
-        file_import_copy = deepcopy(self._file_import)
-        if add_conditional_typing and self._file_import.imports.get(TypingSection.CONDITIONAL):
-            # we switch the TypingSection key for the CONDITIONAL typing imports so we can merge
-            # the imports together
-            switched_imports_dictionary = self._switch_typing_section_key(baseline_typing_section)
-            switched_imports = FileImport(switched_imports_dictionary)
-            file_import_copy.merge(switched_imports)
-        return file_import_copy.imports.get(baseline_typing_section, {})
+        if add_conditional_typing and file_import.imports.get(TypingSection.CONDITIONAL):
+            file_import = file_import.switch_typing_section(TypingSection.CONDITIONAL, baseline_typing_section)
+        return file_import.imports.get(baseline_typing_section, {})
 
-    def _add_type_checking_import(self):
+    def _with_type_checking_import(self) -> FileImport:
         if (
             self._file_import.imports.get(TypingSection.TYPING) or
             (not self.is_python_3_file and self._file_import.imports.get(TypingSection.CONDITIONAL))
         ):
-            self._file_import.add_from_import("typing", "TYPE_CHECKING", ImportType.STDLIB)
+            # the given imports may be shared, add to a copy
+            file_import = copy(self._file_import)
+            file_import.add_from_import("typing", "TYPE_CHECKING", ImportType.STDLIB)
+            return file_import
+        return self._file_import
 
     def __str__(self) -> str:
-        self._add_type_checking_import()
+        file_import = self._with_type_checking_import()
         regular_imports = ""
         regular_imports_dict = self._get_imports_dict(
-            baseline_typing_section=TypingSection.REGULAR, add_conditional_typing=self.is_python_3_file
+            file_import, baseline_typing_section=TypingSection.REGULAR, add_conditional_typing=self.is_python_3_file
         )
 
         if regular_imports_dict:
@@ -84,7 +80,7 @@ class FileImportSerializer:
 
         typing_imports = ""
         typing_imports_dict = self._get_imports_dict(
-            baseline_typing_section=TypingSection.TYPING, add_conditional_typing=not self.is_python_3_file
+            file_import, baseline_typing_section=TypingSection.TYPING, add_conditional_typing=not self.is_python_3_file
         )
         if typing_imports_dict:
             typing_imports += "\n\nif TYPE_CHECKING:\n    # pylint: disable=unused-import,ungrouped-imports\n    "
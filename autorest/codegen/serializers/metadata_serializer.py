@@ -19,6 +19,7 @@ from ..models import (
     TypingSection,
     ImportType
 )
+from .operation_view import OperationView
 
 def _correct_credential_parameter(global_parameters: ParameterList, async_mode: bool) -> None:
     credential_param = [
@@ -127,6 +128,9 @@ class MetadataSerializer:
         def _is_paging(operation):
             return isinstance(operation, PagingOperation)
 
+        def _operation_view(operation):
+            return OperationView(self.code_model, operation)
+
         mixin_operation_group: Optional[OperationGroup] = next(
             (operation_group
             for operation_group in self.code_model.operation_groups if operation_group.is_empty_operation_group),
@@ -171,6 +175,7 @@ class MetadataSerializer:
             any=any,
             is_lro=_is_lro,
             is_paging=_is_paging,
+            operation_view=_operation_view,
             str=str,
             sync_mixin_imports=sync_mixin_imports,
             async_mixin_imports=async_mixin_imports,
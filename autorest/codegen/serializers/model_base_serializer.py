@@ -4,25 +4,45 @@
 # license information.
 # --------------------------------------------------------------------------
 from abc import abstractmethod
-from typing import cast, List
+from typing import cast, Iterator, List, Optional
 from jinja2 import Environment
 from ..models import EnumSchema, ObjectSchema, CodeModel, Property, ConstantSchema
 from ..models.imports import FileImport, ImportType
+from .fragment_cache import FileFragments, FragmentCache
 from .import_serializer import FileImportSerializer
 
 
 class ModelBaseSerializer:
-    def __init__(self, code_model: CodeModel, env: Environment, is_python_3_file: bool) -> None:
+    def __init__(
+        self,
+        code_model: CodeModel,
+        env: Environment,
+        is_python_3_file: bool,
+        fragment_cache: Optional[FragmentCache] = None,
+    ) -> None:
         self.code_model = code_model
         self.env = env
         self.is_python_3_file = is_python_3_file
+        self.fragment_cache = fragment_cache
 
     def serialize(self) -> str:
-        # Generate the models
+        return "".join(self.generate())
+
+    def generate(self) -> Iterator[str]:
+        # Generate the models, chunk by chunk, with the class of each model rendered or read from the cache
+        fragments = FileFragments(self.fragment_cache, "models_py3" if self.is_python_3_file else "models")
         template = self.env.get_template("model_container.py.jinja2")
-        return template.render(
+        yield from template.generate(
             code_model=self.code_model,
             imports=FileImportSerializer(self.imports(), is_python_3_file=self.is_python_3_file),
+            model_fragment=lambda model: fragments.render(model, self.render_model),
+        )
+        fragments.save()
+
+    def render_model(self, model: ObjectSchema) -> str:
+        template = self.env.get_template("model.py.jinja2")
+        return template.render(
+            model=model,
             str=str,
             init_line=self.init_line,
             init_args=self.init_args,
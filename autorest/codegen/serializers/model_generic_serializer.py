@@ -3,17 +3,20 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from typing import List
+from typing import List, Optional
 from jinja2 import Environment
+from .fragment_cache import FragmentCache
 from .model_base_serializer import ModelBaseSerializer
 from ..models import ObjectSchema, CodeModel, Property
 
 
 class ModelGenericSerializer(ModelBaseSerializer):
 
-    def __init__(self, code_model: CodeModel, env: Environment) -> None:
+    def __init__(
+        self, code_model: CodeModel, env: Environment, fragment_cache: Optional[FragmentCache] = None
+    ) -> None:
         super(ModelGenericSerializer, self).__init__(
-            code_model=code_model, env=env, is_python_3_file=False
+            code_model=code_model, env=env, is_python_3_file=False, fragment_cache=fragment_cache
         )
 
     def init_line(self, model: ObjectSchema) -> List[str]:
@@ -3,8 +3,9 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from typing import cast, List
+from typing import cast, List, Optional
 from jinja2 import Environment
+from .fragment_cache import FragmentCache
 from .model_base_serializer import ModelBaseSerializer
 from ..models import ObjectSchema, CodeModel, Property
 from ..models.imports import FileImport
@@ -12,9 +13,11 @@ from ..models.imports import FileImport
 
 class ModelPython3Serializer(ModelBaseSerializer):
 
-    def __init__(self, code_model: CodeModel, env: Environment) -> None:
+    def __init__(
+        self, code_model: CodeModel, env: Environment, fragment_cache: Optional[FragmentCache] = None
+    ) -> None:
         super(ModelPython3Serializer, self).__init__(
-            code_model=code_model, env=env, is_python_3_file=True
+            code_model=code_model, env=env, is_python_3_file=True, fragment_cache=fragment_cache
         )
 
     def init_line(self, model: ObjectSchema) -> List[str]:
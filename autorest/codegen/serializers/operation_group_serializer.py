@@ -3,33 +3,43 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+from typing import Iterator, Optional
 from jinja2 import Environment
 
+from .fragment_cache import FileFragments, FragmentCache
 from .import_serializer import FileImportSerializer
-from ..models import LROOperation, PagingOperation, CodeModel, OperationGroup
+from .operation_view import OperationView
+from ..models import LROOperation, PagingOperation, CodeModel, Operation, OperationGroup
 
 
 class OperationGroupSerializer:
     def __init__(
-        self, code_model: CodeModel, env: Environment, operation_group: OperationGroup, async_mode: bool
+        self,
+        code_model: CodeModel,
+        env: Environment,
+        operation_group: OperationGroup,
+        async_mode: bool,
+        fragment_cache: Optional[FragmentCache] = None,
     ) -> None:
         self.code_model = code_model
         self.env = env
         self.operation_group = operation_group
         self.async_mode = async_mode
+        self.fragment_cache = fragment_cache
 
     def serialize(self) -> str:
-        def _is_lro(operation):
-            return isinstance(operation, LROOperation)
-
-        def _is_paging(operation):
-            return isinstance(operation, PagingOperation)
+        return "".join(self.generate())
 
+    def generate(self) -> Iterator[str]:
+        # Generate the operation group, with the method of each operation rendered or read from the cache
+        fragments = FileFragments(
+            self.fragment_cache, f"operation_group {self.operation_group.name} {'async' if self.async_mode else 'sync'}"
+        )
         operation_group_template = self.env.get_template("operations_container.py.jinja2")
         if self.operation_group.is_empty_operation_group:
             operation_group_template = self.env.get_template("operations_container_mixin.py.jinja2")
 
-        return operation_group_template.render(
+        yield from operation_group_template.generate(
             code_model=self.code_model,
             operation_group=self.operation_group,
             imports=FileImportSerializer(
@@ -40,6 +50,22 @@ class OperationGroupSerializer:
                 is_python_3_file=self.async_mode
             ),
             async_mode=self.async_mode,
-            is_lro=_is_lro,
-            is_paging=_is_paging,
+            operation_fragment=lambda operation: fragments.render(operation, self.render_operation),
+        )
+        fragments.save()
+
+    def render_operation(self, operation: Operation) -> str:
+        if isinstance(operation, LROOperation) and isinstance(operation, PagingOperation):
+            template_name = "lro_paging_operation.py.jinja2"
+        elif isinstance(operation, LROOperation):
+            template_name = "lro_operation.py.jinja2"
+        elif isinstance(operation, PagingOperation):
+            template_name = "paging_operation.py.jinja2"
+        else:
+            template_name = "operation.py.jinja2"
+        return self.env.get_template(template_name).render(
+            code_model=self.code_model,
+            async_mode=self.async_mode,
+            operation=operation,
+            view=OperationView(self.code_model, operation),
         )
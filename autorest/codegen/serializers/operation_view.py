@@ -0,0 +1,118 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from itertools import chain
+from typing import Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from ..models import CodeModel, Operation, PagingOperation, Parameter
+
+T = TypeVar("T")
+
+
+def _unique(values: Iterable[T]) -> List[T]:
+    """Same as the "unique" filter of Jinja: keep the first of the values, comparing strings case-insensitively."""
+    seen = set()
+    unique_values = []
+    for value in values:
+        key = value.lower() if isinstance(value, str) else value
+        if key not in seen:
+            seen.add(key)
+            unique_values.append(value)
+    return unique_values
+
+
+class OperationView:  # pylint: disable=too-many-instance-attributes
+    """What the operation templates render for an operation, computed once instead of by filters in each template.
+
+    :param code_model: The code model
+    :param operation: The operation to render
+    """
+
+    def __init__(self, code_model: CodeModel, operation: Operation) -> None:
+        self.operation = operation
+        self.has_optional_return_type = operation.has_optional_return_type
+
+        body_responses = [response for response in operation.responses if response.has_body]
+        self.response_type_annotations = _unique(response.operation_type_annotation for response in body_responses)
+        self.response_docstring_text = " or ".join(_unique(response.docstring_text for response in body_responses))
+        self.response_docstring_type = " or ".join(_unique(response.docstring_type for response in body_responses))
+
+        self.constant_parameters = [
+            parameter for parameter in operation.parameters.constant if parameter.implementation == "Method"
+        ]
+        self.constant_parameters_in_method_code = [
+            parameter for parameter in self.constant_parameters
+            if parameter.original_parameter is None and parameter.in_method_code
+        ]
+        self.content_type_constant = next(
+            (
+                parameter for parameter in self.constant_parameters_in_method_code
+                if parameter.serialized_name == "content_type"
+            ),
+            None
+        )
+        self.request_media_types = _unique(chain.from_iterable(request.media_types for request in operation.requests))
+
+        self.error_map = self._error_map(code_model)
+        self.path_parameters = self._serialize_calls(operation.parameters.path, "url")
+        self.query_parameters = self._serialize_calls(operation.parameters.query, "query")
+        self.header_parameters = self._serialize_calls(operation.parameters.headers, "header")
+
+        next_operation = operation.next_operation if isinstance(operation, PagingOperation) else None
+        self.next_operation = OperationView(code_model, next_operation) if next_operation else None
+
+    def _serialize_calls(self, parameters: Sequence[Parameter], function_name: str) -> List[Tuple[Parameter, str]]:
+        return [
+            (parameter, self.operation.build_serialize_data_call(parameter, function_name))
+            for parameter in parameters
+        ]
+
+    def _error_map(self, code_model: CodeModel) -> List[str]:
+        """The entries of the error map of the operation, if it has status code exceptions.
+        """
+        if not self.operation.status_code_exceptions:
+            return []
+        error_map = []
+        exception_status_codes = self.operation.status_code_exceptions_status_codes
+        if 401 not in exception_status_codes:
+            error_map.append("401: ClientAuthenticationError")
+        if 404 not in exception_status_codes:
+            error_map.append("404: ResourceNotFoundError")
+        if 409 not in exception_status_codes:
+            error_map.append("409: ResourceExistsError")
+        error_format = ", error_format=ARMErrorFormat" if code_model.options["azure_arm"] else ""
+        known_errors = {401: "ClientAuthenticationError", 404: "ResourceNotFoundError", 409: "ResourceExistsError"}
+        for exception in self.operation.status_code_exceptions:
+            error_model = (
+                f", model=self._deserialize(_models.{exception.serialization_type}, response)"
+                if exception.is_exception else ""
+            )
+            for status_code in exception.status_codes:
+                error = known_errors.get(status_code, "HttpResponseError")
+                if status_code not in known_errors and not error_model and not error_format:
+                    error_map.append(f"{status_code}: {error}")
+                else:
+                    error_map.append(
+                        f"{status_code}: lambda response: {error}(response=response{error_model}{error_format})"
+                    )
+        return error_map
+
+    def return_type_annotation(self, return_type_wrapper: Optional[Sequence[str]] = None) -> str:
+        """The type annotation of what the operation returns.
+
+        :param return_type_wrapper: The types wrapping the response types, outermost first, i.e. ["LROPoller"]
+        :rtype: str
+        """
+        if not self.response_type_annotations:
+            annotation = "None"
+        elif len(self.response_type_annotations) > 1:
+            annotation = f"Union[{', '.join(self.response_type_annotations)}]"
+        else:
+            annotation = self.response_type_annotations[0]
+        if self.has_optional_return_type:
+            annotation = f"Optional[{annotation}]"
+        if return_type_wrapper:
+            annotation = "[".join(return_type_wrapper) + "[" + annotation + "]" * len(return_type_wrapper)
+        return annotation
@@ -0,0 +1,66 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import logging
+from typing import Any, Dict, List, Set, Type
+
+from .models.operation import Operation
+from .models.operation_group import OperationGroup
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _is_cloud_error(schema: Dict[str, Any]) -> bool:
+    return schema["language"]["default"]["name"] == "CloudError"
+
+
+class YamlIndex:
+    """What the code model is built from, collected in one walk of the YAML.
+
+    :param exceptions_set: The yaml ids of the schemas used as exceptions by operations
+    :type exceptions_set: set[int]
+    :param schemas: All the schemas of the code model, in the order of the YAML
+    :type schemas: list[dict[str, Any]]
+    :param operation_classes: The model class of each operation, by yaml id
+    :type operation_classes: dict[int, type]
+    """
+
+    def __init__(self) -> None:
+        self.exceptions_set: Set[int] = set()
+        self.schemas: List[Dict[str, Any]] = []
+        self.operation_classes: Dict[int, Type[Operation]] = {}
+
+    @classmethod
+    def from_yaml(cls, yaml_data: Dict[str, Any], remove_cloud_errors: bool = False) -> "YamlIndex":
+        """Index the YAML code model.
+
+        :param dict yaml_data: The code model
+        :param bool remove_cloud_errors: Remove the CloudError exceptions of operations and the CloudError schema
+         from the YAML, since ARM clients raise ARMErrorFormat errors instead.
+        """
+        index = cls()
+        for group in yaml_data.get("operationGroups", []):
+            for operation in group["operations"]:
+                index.operation_classes[id(operation)] = OperationGroup.get_operation_class(operation)
+                exceptions = operation.get("exceptions")
+                if not exceptions:
+                    continue
+                if remove_cloud_errors:
+                    exceptions[:] = [
+                        e for e in exceptions if not (e.get("schema") and _is_cloud_error(e["schema"]))
+                    ]
+                index.exceptions_set.update(id(e["schema"]) for e in exceptions if e.get("schema"))
+
+        for kind, type_list in (yaml_data.get("schemas") or {}).items():
+            if remove_cloud_errors and kind == "objects":
+                cloud_error_index = next((i for i, s in enumerate(type_list) if _is_cloud_error(s)), None)
+                if cloud_error_index is not None:
+                    del type_list[cloud_error_index]
+            index.schemas.extend(type_list)
+        _LOGGER.debug(
+            "Indexed %s schemas and %s operations", len(index.schemas), len(index.operation_classes)
+        )
+        return index
@@ -0,0 +1,71 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""The Jinja environments of the generator, one per templates package, shared by all the serializers of a process.
+
+Compiled templates are kept in a "jinja" cache (see autorest.cache), so new processes don't compile them again.
+"""
+import functools
+import logging
+from pathlib import Path
+from typing import Optional
+
+import jinja2
+from jinja2 import Environment, FileSystemBytecodeCache, PackageLoader
+
+from .cache import get_cache_folder, hash_content
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def create_environment(package_name: str, bytecode_cache_folder: Optional[Path] = None) -> Environment:
+    """Create the environment of the templates of a package.
+
+    :param str package_name: The package with a "templates" folder, i.e. "autorest.codegen"
+    :param bytecode_cache_folder: Where compiled templates are cached, if anywhere
+    :rtype: ~jinja2.Environment
+    """
+    return Environment(
+        loader=PackageLoader(package_name, "templates"),
+        keep_trailing_newline=True,
+        line_statement_prefix="##",
+        line_comment_prefix="###",
+        trim_blocks=True,
+        lstrip_blocks=True,
+        # templates only change with the generator, no need to check their files before each render
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache(str(bytecode_cache_folder)) if bytecode_cache_folder else None,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_environment(package_name: str) -> Environment:
+    """Get the environment of the templates of a package, created once per process.
+
+    :param str package_name: The package with a "templates" folder, i.e. "autorest.codegen"
+    :rtype: ~jinja2.Environment
+    """
+    # Compiled templates depend on the Jinja version, the generator version is part of the cache folder
+    bytecode_cache_folder = get_cache_folder(f"jinja-{jinja2.__version__}")
+    _LOGGER.debug(
+        "Creating Jinja environment of %s, compiled templates cached in %s", package_name, bytecode_cache_folder
+    )
+    return create_environment(package_name, bytecode_cache_folder)
+
+
+@functools.lru_cache(maxsize=None)
+def get_templates_hash(package_name: str) -> str:
+    """Hash of the names and sources of the templates of a package, for cache keys of what they render.
+
+    :param str package_name: The package with a "templates" folder, i.e. "autorest.codegen"
+    :rtype: str
+    """
+    env = get_environment(package_name)
+    sources = []
+    for template_name in env.list_templates():
+        sources.append(template_name)
+        sources.append(env.loader.get_source(env, template_name)[0])  # type: ignore
+    return hash_content("\0".join(sources))
@@ -4,11 +4,13 @@
 # license information.
 # --------------------------------------------------------------------------
 from abc import ABC, abstractmethod
+import contextlib
+from contextvars import ContextVar
 from enum import Enum
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 import logging
-import logging.config # need to include this extra import so mypy doesn't throw logging module has no config
 from pathlib import Path
+import threading
 
 
 class Channel(Enum):
@@ -39,14 +41,51 @@ _LEVEL_MAPPING = {
     logging.DEBUG: Channel.Debug,
 }
 
+# The log handler of the session running in this context, set by the JSON-RPC server for each session.
+# Records logged where no session is set, i.e. outside the server, go to every handler.
+_SESSION_HANDLER: ContextVar[Optional["AutorestHandler"]] = ContextVar("autorest_session_handler", default=None)
+
+# The handlers of the open sessions. The "autorest" logger filters at the most verbose of their levels,
+# the root logger is left as the application configured it.
+_OPEN_HANDLERS: Set["AutorestHandler"] = set()
+_OPEN_HANDLERS_LOCK = threading.Lock()
+
+
+def _update_autorest_log_level() -> None:
+    """Set the level of the "autorest" logger, so records no session will forward are not even created.
+    """
+    with _OPEN_HANDLERS_LOCK:
+        level = min((handler.level for handler in _OPEN_HANDLERS), default=logging.NOTSET)
+        logging.getLogger("autorest").setLevel(level)
+
 
 class AutorestHandler(logging.Handler):
-    def __init__(self, autorest_api: "AutorestAPI") -> None:
-        # Initialize this handler with the max loglevel, since
-        # autorest is deciding what to show, not us
-        # so we want to log everything and let autorest filters.
+    """Forward log records to autorest.
+
+    Records are buffered and sent together, either when the buffer is full, when an error is logged,
+    or after a short delay.
+
+    :param autorest_api: The API to send messages to
+    :param int capacity: How many records can be buffered before they are sent
+    :param float flush_interval: How long, in seconds, a record can stay in the buffer
+    """
+
+    def __init__(self, autorest_api: "AutorestAPI", capacity: int = 100, flush_interval: float = 0.2) -> None:
+        # Initialize this handler with the max loglevel, until we know
+        # from autorest configuration what will be displayed.
         super(AutorestHandler, self).__init__(logging.DEBUG)
         self._autorest_api = autorest_api
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._buffer: List[Tuple[Channel, str]] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Several sessions can run at the same time, only forward the records of the session of this handler
+        session_handler = _SESSION_HANDLER.get()
+        if session_handler is not None and session_handler is not self:
+            return False
+        return bool(super(AutorestHandler, self).filter(record))
 
     @staticmethod
     def _get_log_level(level: int) -> Channel:
@@ -57,11 +96,43 @@ class AutorestHandler(logging.Handler):
     def emit(self, record: logging.LogRecord) -> None:
         try:
             msg = self.format(record)
-            self._autorest_api.message(self._get_log_level(record.levelno), msg)
         except RecursionError:  # See issue 36272
             raise
         except Exception:  # pylint: disable=broad-except
             self.handleError(record)
+            return
+        self.acquire()
+        try:
+            self._buffer.append((self._get_log_level(record.levelno), msg))
+            should_flush = len(self._buffer) >= self.capacity or record.levelno >= logging.ERROR
+            if not should_flush and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        finally:
+            self.release()
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            messages, self._buffer = self._buffer, []
+        finally:
+            self.release()
+        if messages:
+            try:
+                self._autorest_api.messages(messages)
+            except Exception:  # pylint: disable=broad-except
+                # Nowhere to log it, autorest is not reachable
+                pass
+
+    def close(self) -> None:
+        self.flush()
+        super(AutorestHandler, self).close()
 
 
 class AutorestAPI(ABC):
@@ -69,18 +140,55 @@ class AutorestAPI(ABC):
     """
 
     def __init__(self) -> None:
+        # Configuration doesn't change during a session, so values are fetched once
+        self._values_cache: Dict[str, Any] = {}
+        # file name to the hash of the text its YAML tree was parsed from
+        self._yaml_hashes: Dict[str, str] = {}
+        self._handler: Optional["AutorestHandler"] = None
         if Path("logging.conf").exists():
-            logging.config.fileConfig(Path("logging.conf"))
+            # Only imported when needed, to keep the server start fast
+            from logging import config as logging_config  # pylint: disable=import-outside-toplevel
+
+            logging_config.fileConfig(Path("logging.conf"))
         else:
-            self._handler: Optional["AutorestHandler"] = AutorestHandler(self)
+            self._handler = AutorestHandler(self)
             fmt = logging.Formatter("[%(name)s.%(funcName)s:%(lineno)d] %(message)s")
             self._handler.setFormatter(fmt)
             logging.getLogger().addHandler(self._handler)
-            logging.getLogger().setLevel(logging.DEBUG)
+            with _OPEN_HANDLERS_LOCK:
+                _OPEN_HANDLERS.add(self._handler)
+            _update_autorest_log_level()
+
+    def configure_log_level(self) -> None:
+        """Ask autorest if debug messages will be displayed, and stop producing them if they won't.
+
+        Does nothing if logging is configured by a "logging.conf" file.
+        """
+        if not self._handler:
+            return
+        level = logging.DEBUG if self.get_boolean_value("debug", False) else logging.INFO
+        self._handler.setLevel(level)
+        # Filter at the logger too, so records that won't be displayed are not even created
+        _update_autorest_log_level()
+
+    @contextlib.contextmanager
+    def session(self) -> Iterator[None]:
+        """Send the records logged in this context, and in the threads started with a copy of it,
+        to this API only.
+        """
+        token = _SESSION_HANDLER.set(self._handler)
+        try:
+            yield
+        finally:
+            _SESSION_HANDLER.reset(token)
 
     def close(self) -> None:
         if self._handler:
             logging.getLogger().removeHandler(self._handler)
+            with _OPEN_HANDLERS_LOCK:
+                _OPEN_HANDLERS.discard(self._handler)
+            _update_autorest_log_level()
+            self._handler.close()
             self._handler = None
 
     @abstractmethod
@@ -93,32 +201,142 @@ class AutorestAPI(ABC):
         :param file_content: The content as string
         """
 
+    def write_file_stream(self, filename: Union[str, Path], file_chunks: Iterable[str]) -> None:
+        """Ask autorest to write the content to the current path, content being given in chunks.
+
+        This avoids to build big files as one string. pathlib.Path object are acceptable but must be relative.
+
+        :param filename: A file path
+        :param file_chunks: The content, as an iterable of strings
+        """
+        self.write_file(filename, "".join(file_chunks))
+
     @abstractmethod
-    def read_file(self, filename: Union[str, Path]) -> str:
+    def read_file(self, filename: Union[str, Path]) -> Optional[str]:
         """Ask autorest to read a file for me.
 
         pathlib.Path object are acceptable but must be relative.
 
         :param filename: A file path
-        :return: The content of the file
-        :rtype: str
+        :return: The content of the file, or None if there is no such file
+        :rtype: str or None
+        """
+
+    def read_files(self, filenames: Iterable[Union[str, Path]]) -> List[Optional[str]]:
+        """Ask autorest to read several files.
+
+        Implementations may keep all the requests in flight at the same time.
+
+        :param filenames: The file paths
+        :return: The content of the files, in the same order, None for the missing ones
+        :rtype: list[str or None]
+        """
+        return [self.read_file(filename) for filename in filenames]
+
+    async def read_file_async(self, filename: Union[str, Path]) -> Optional[str]:
+        """Asyncio version of "read_file".
         """
+        return self.read_file(filename)
+
+    def read_yaml(self, filename: Union[str, Path]) -> Any:
+        """Ask autorest to read a YAML file, and parse it.
+
+        Implementations that keep files in memory may return an already parsed tree.
+
+        :param filename: A file path
+        :return: The parsed YAML tree
+        """
+        from .. import yaml_loader  # pylint: disable=import-outside-toplevel
+
+        content = self.read_file(filename)
+        if content is None:
+            raise FileNotFoundError(f"Autorest has no file {filename}")
+        yaml_data, self._yaml_hashes[Path(filename).as_posix()] = yaml_loader.load_with_hash(content)
+        return yaml_data
+
+    def get_yaml_hash(self, filename: Union[str, Path]) -> Optional[str]:
+        """The SHA-256 of the text "read_yaml" parsed the tree of this file from.
+
+        The tree must not have been updated since. None if the tree was not parsed from a text by this API,
+        i.e. if it was written as a tree by "write_yaml".
+
+        :param filename: A file path
+        :rtype: str or None
+        """
+        return self._yaml_hashes.get(Path(filename).as_posix())
+
+    def write_yaml(self, filename: Union[str, Path], yaml_data: Any) -> None:
+        """Dump a YAML tree, and ask autorest to write it.
+
+        Implementations that keep files in memory may store the tree as is, without dumping it.
+
+        :param filename: A file path
+        :param yaml_data: The YAML tree
+        """
+        from .. import yaml_loader  # pylint: disable=import-outside-toplevel
+
+        self._yaml_hashes.pop(Path(filename).as_posix(), None)
+        self.write_file(filename, yaml_loader.dump(yaml_data))
 
     @abstractmethod
     def list_inputs(self) -> List[str]:
         """List possible inputs for this plugin.
         """
 
-    @abstractmethod
     def get_value(self, key: str) -> Any:
         """Get a value from configuration.
+
+        Values are memoized for the lifetime of this API.
+        """
+        try:
+            return self._values_cache[key]
+        except KeyError:
+            value = self._values_cache[key] = self._get_value(key)
+            return value
+
+    def get_values(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values from configuration, asking autorest only for the ones not already known.
+
+        :param keys: The configuration keys
+        :return: A dict of key to value
+        :rtype: dict[str, Any]
+        """
+        keys = list(keys)
+        missing_keys = [key for key in keys if key not in self._values_cache]
+        if missing_keys:
+            self._values_cache.update(self._get_values(missing_keys))
+        return {key: self._values_cache[key] for key in keys}
+
+    @abstractmethod
+    def _get_value(self, key: str) -> Any:
+        """Get a value from configuration, without memoization.
         """
 
+    def _get_values(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values from configuration, without memoization.
+
+        Implementations may keep all the requests in flight at the same time.
+        """
+        return {key: self._get_value(key) for key in keys}
+
+    async def get_value_async(self, key: str) -> Any:
+        """Asyncio version of "get_value".
+        """
+        return self.get_value(key)
+
     @abstractmethod
     def message(self, channel: Channel, text: str) -> None:
         """Send a log message to autorest.
         """
 
+    def messages(self, messages: Iterable[Tuple[Channel, str]]) -> None:
+        """Send several log messages to autorest.
+
+        :param messages: Pairs of channel and text
+        """
+        for channel, text in messages:
+            self.message(channel, text)
+
     def get_boolean_value(self, key: str, default: bool = None) -> Optional[bool]:
         """Check if value is present on the line, and interpret it as bool if it was.
 
@@ -0,0 +1,60 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""JSON codec used on the autorest stream.
+
+Uses orjson or ujson if one of them is installed, and the standard library otherwise.
+Messages are decoded straight from bytes and encoded straight to bytes, to avoid
+copying large payloads (like the code model) through intermediate strings.
+"""
+import json
+from typing import Any, Callable, Union
+
+# pylint: disable=import-outside-toplevel
+
+JsonBytes = Union[bytes, bytearray, memoryview]
+
+
+def _load_codec():
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        # orjson reads any buffer and writes bytes, no conversion needed
+        return "orjson", orjson.loads, orjson.dumps  # pylint: disable=no-member
+
+    try:
+        import ujson
+    except ImportError:
+        pass
+    else:
+        def ujson_loads(data: JsonBytes) -> Any:
+            if not isinstance(data, bytes):
+                data = bytes(data)
+            return ujson.loads(data)
+
+        def ujson_dumps(obj: Any) -> bytes:
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+        return "ujson", ujson_loads, ujson_dumps
+
+    def json_loads(data: JsonBytes) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    return "json", json_loads, json_dumps
+
+
+CODEC_NAME: str
+loads: Callable[[JsonBytes], Any]
+dumps: Callable[[Any], bytes]
+CODEC_NAME, loads, dumps = _load_codec()
+
+__all__ = ["CODEC_NAME", "loads", "dumps"]
@@ -0,0 +1,119 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""A long-lived generator process, reused across autorest invocations.
+
+The daemon listens on the Unix socket given by AUTOREST_PYTHON_DAEMON_SOCKET (or --socket).
+When this variable is set, "start.py" relays autorest's stdin/stdout to the daemon instead of
+starting a new interpreter, so imports and caches are paid once for all the runs.
+
+The relay first sends a "autorest-python <version>" line. The daemon answers "ok" and serves the connection
+if it runs the same version, and "mismatch" otherwise, the relay then starts the generator as usual.
+
+    python -m autorest.jsonrpc.daemon --socket /tmp/autorest-python.sock
+"""
+import argparse
+import logging
+import os
+import socket
+import socketserver
+from typing import Optional
+
+from .._version import VERSION
+from .server import preload_plugins, serve, _PLUGINS
+from .stdstream import StdStreamConnection
+
+
+_LOGGER = logging.getLogger(__name__)
+
+SOCKET_ENV_VARIABLE = "AUTOREST_PYTHON_DAEMON_SOCKET"
+
+# First line sent by the relay, followed by its version
+HANDSHAKE = "autorest-python"
+
+
+class _AutorestRequestHandler(socketserver.StreamRequestHandler):
+    """Serve one autorest invocation, relayed by "start.py".
+    """
+
+    def handle(self) -> None:
+        handshake = self.rfile.readline().decode("utf-8", "replace").split()
+        if handshake != [HANDSHAKE, VERSION]:
+            _LOGGER.warning("Refusing a relay of version %s, the daemon runs %s", " ".join(handshake[1:]), VERSION)
+            self.wfile.write(b"mismatch\n")
+            return
+        self.wfile.write(b"ok\n")
+        self.wfile.flush()
+
+        connection = StdStreamConnection(self.rfile, self.wfile)  # type: ignore
+        try:
+            serve(connection)
+        except Exception:  # pylint: disable=broad-except
+            # Autorest is done and closed its stdin, or the relay died
+            _LOGGER.debug("Autorest connection closed")
+
+
+class AutorestDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve autorest invocations on a Unix socket, each one on its own thread.
+
+    :param str socket_path: The path of the Unix socket to listen on
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str) -> None:
+        self.socket_path = socket_path
+        super().__init__(socket_path, _AutorestRequestHandler)
+        # Only the user who started the daemon can use it
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _is_daemon_running(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:  # type: ignore
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def main(socket_path: Optional[str] = None) -> None:
+    if not hasattr(socket, "AF_UNIX"):
+        raise SystemExit("The generator daemon needs Unix sockets, that this platform does not support")
+    if not socket_path:
+        parser = argparse.ArgumentParser(description="Run the Python generator as a daemon.")
+        parser.add_argument(
+            "--socket", default=os.environ.get(SOCKET_ENV_VARIABLE), help=f"Defaults to ${SOCKET_ENV_VARIABLE}"
+        )
+        socket_path = parser.parse_args().socket
+        if not socket_path:
+            parser.error(f"--socket or ${SOCKET_ENV_VARIABLE} is required")
+
+    if os.path.exists(socket_path):
+        if _is_daemon_running(socket_path):
+            raise SystemExit(f"A daemon is already listening on {socket_path}")
+        # Left by a daemon that didn't exit cleanly
+        os.unlink(socket_path)
+
+    # The daemon logs on its stderr, session records are also sent to their autorest
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    preload_plugins(_PLUGINS)
+    with AutorestDaemon(socket_path) as daemon:
+        _LOGGER.info("Python generator daemon %s listening on %s", VERSION, socket_path)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
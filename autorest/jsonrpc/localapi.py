@@ -3,9 +3,12 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import contextlib
 import logging
+import os
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+import threading
+from typing import Dict, Iterable, List, Optional, Union
 
 from . import AutorestAPI, Channel
 
@@ -31,15 +34,34 @@ class LocalAutorestAPI(AutorestAPI):
             fd.write(file_content)
         _LOGGER.debug("Written file: %s", filename)
 
-    def read_file(self, filename: Union[str, Path]) -> str:
+    def write_file_stream(self, filename: Union[str, Path], file_chunks: Iterable[str]) -> None:
+        _LOGGER.debug("Writing file: %s", filename)
+        path = self._output_folder / Path(filename)
+        # Write then rename, so an error while producing the chunks doesn't leave a truncated file
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with temp_path.open("w") as fd:
+                for chunk in file_chunks:
+                    fd.write(chunk)
+            os.replace(temp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+        _LOGGER.debug("Written file: %s", filename)
+
+    def read_file(self, filename: Union[str, Path]) -> Optional[str]:
         _LOGGER.debug("Reading file: %s", filename)
-        with (self._output_folder / Path(filename)).open("r") as fd:
-            return fd.read()
+        try:
+            with (self._output_folder / Path(filename)).open("r") as fd:
+                return fd.read()
+        except FileNotFoundError:
+            return None
 
     def list_inputs(self) -> List[str]:
         return self._reachable_files
 
-    def get_value(self, key: str) -> Optional[str]:
+    def _get_value(self, key: str) -> Optional[str]:
         return self.values.get(key, None)
 
     def message(self, channel: Channel, text: str) -> None:
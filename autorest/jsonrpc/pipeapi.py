@@ -0,0 +1,101 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import logging
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from . import AutorestAPI, Channel
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# The AutorestAPI methods a plugin process is allowed to call on its parent
+_FORWARDED_METHODS = {
+    "write_file", "read_file", "read_files", "list_inputs", "get_value", "get_values", "message", "messages"
+}
+
+
+class PipeAutorestAPI(AutorestAPI):
+    """An API used inside a worker process, that forwards every call to the
+    parent process through a multiprocessing pipe.
+
+    :param pipe: The worker end of the pipe, served on the other end by "serve_pipe"
+    """
+
+    def __init__(self, pipe: Connection) -> None:
+        super().__init__()
+        self._pipe = pipe
+
+    def _call(self, method: str, *args: Any) -> Any:
+        self._pipe.send((method, args, True))
+        status, value = self._pipe.recv()
+        if status == "error":
+            raise value
+        return value
+
+    def _notify(self, method: str, *args: Any) -> None:
+        self._pipe.send((method, args, False))
+
+    def write_file(self, filename: Union[str, Path], file_content: str) -> None:
+        self._notify("write_file", filename, file_content)
+
+    def read_file(self, filename: Union[str, Path]) -> Optional[str]:
+        return self._call("read_file", filename)
+
+    def read_files(self, filenames: Iterable[Union[str, Path]]) -> List[Optional[str]]:
+        return self._call("read_files", list(filenames))
+
+    def list_inputs(self) -> List[str]:
+        return self._call("list_inputs")
+
+    def _get_value(self, key: str) -> Any:
+        return self._call("get_value", key)
+
+    def _get_values(self, keys: List[str]) -> Dict[str, Any]:
+        return self._call("get_values", keys)
+
+    def message(self, channel: Channel, text: str) -> None:
+        # Don't log anything here, or you will create a cycle with the autorest handler
+        self._notify("message", channel, text)
+
+    def messages(self, messages: Iterable[Tuple[Channel, str]]) -> None:
+        self._notify("messages", list(messages))
+
+    def done(self, result: bool) -> None:
+        """Tell the parent process the plugin is done.
+        """
+        self._pipe.send(("done", (result,), False))
+
+
+def serve_pipe(pipe: Connection, autorestapi: AutorestAPI) -> bool:
+    """Serve the calls of a PipeAutorestAPI with the given API, until the worker is done.
+
+    :param pipe: The parent end of the pipe
+    :param autorestapi: The API to forward calls to
+    :returns: The result of the plugin process, False if the worker died before finishing
+    :rtype: bool
+    """
+    while True:
+        try:
+            method, args, wants_reply = pipe.recv()
+        except EOFError:
+            _LOGGER.error("Plugin worker process ended unexpectedly")
+            return False
+        if method == "done":
+            return args[0]
+        response: Tuple[str, Any]
+        if method not in _FORWARDED_METHODS:
+            # answer anyway, the worker would wait forever otherwise
+            _LOGGER.error("Plugin worker asked for unknown method %s", method)
+            response = ("error", ValueError(f"Plugin worker asked for unknown method {method}"))
+        else:
+            try:
+                response = ("ok", getattr(autorestapi, method)(*args))
+            except Exception as err:  # pylint: disable=broad-except
+                response = ("error", err)
+        if wants_reply:
+            pipe.send(response)
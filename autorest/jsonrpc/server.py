@@ -3,56 +3,157 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+from concurrent.futures import ThreadPoolExecutor
 import contextlib
+import importlib
 import os
 import sys
 import logging
+import threading
+
+from typing import Any, Dict, Iterable, List, Type, TYPE_CHECKING
 
 from jsonrpc import dispatcher, JSONRPCResponseManager
+from jsonrpc.exceptions import JSONRPCInvalidRequest, JSONRPCInvalidRequestException
+from jsonrpc.jsonrpc import JSONRPCRequest
+from jsonrpc.jsonrpc2 import JSONRPC20Response
+
+from . import AutorestAPI
+from .stdstream import get_connection, StdStreamConnection
 
-from .stdstream import read_message, write_message
+if TYPE_CHECKING:
+    # pylint: disable=unused-import
+    from multiprocessing.connection import Connection
+    from .. import Plugin
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# How many "Process" sessions can run at the same time, and whether each one
+# runs on a thread of this process ("thread") or in its own process ("process").
+_MAX_WORKERS = int(os.environ.get("AUTOREST_PYTHON_MAX_WORKERS", 0)) or None
+_WORKER_TYPE = os.environ.get("AUTOREST_PYTHON_WORKER_TYPE", "thread")
+
+# Plugin name to module and class, in the order autorest usually calls them
+_PLUGINS = {
+    "m2r": ("..m2r", "M2R"),
+    "namer": ("..namer", "Namer"),
+    "codegen": ("..codegen", "CodeGenerator"),
+    "black": ("..black", "BlackScriptPlugin"),
+    "multiapiscript": ("..multiapi", "MultiApiScriptPlugin"),
+}
+
+# The plugins imported in the background when the server starts, comma separated. Empty to disable.
+_PRELOADED_PLUGINS = os.environ.get("AUTOREST_PYTHON_PRELOAD", ",".join(_PLUGINS))
+
 
 @dispatcher.add_method
 def GetPluginNames():
     return ["codegen", "m2r", "namer", "black", "multiapiscript"]
 
 
-@dispatcher.add_method
-def Process(plugin_name: str, session_id: str) -> bool:
+def _load_plugin(plugin_name: str) -> Type["Plugin"]:
+    try:
+        module_name, class_name = _PLUGINS[plugin_name]
+    except KeyError:
+        _LOGGER.fatal("Unknown plugin name %s", plugin_name)
+        raise RuntimeError(f"Unknown plugin name {plugin_name}")
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
+def preload_plugins(plugin_names: Iterable[str]) -> None:
+    """Import the given plugins, so the first "Process" call doesn't pay for it.
+    """
+    for plugin_name in plugin_names:
+        try:
+            _load_plugin(plugin_name)
+        except Exception:  # pylint: disable=broad-except
+            # The Process call will raise it
+            _LOGGER.debug("Unable to preload plugin %s", plugin_name, exc_info=True)
+
+
+def _preloaded_plugin_names() -> List[str]:
+    return [plugin_name.strip() for plugin_name in _PRELOADED_PLUGINS.split(",") if plugin_name.strip()]
+
+
+def _run_plugin(plugin_name: str, autorestapi: AutorestAPI) -> bool:
+    PluginToLoad = _load_plugin(plugin_name)  # pylint: disable=invalid-name
+    plugin = PluginToLoad(autorestapi)
+
+    try:
+        _LOGGER.debug("Starting plugin %s", PluginToLoad.__name__)
+        return plugin.process()
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.exception("Python generator raised an exception")
+    return False
+
+
+def _worker_process_main(plugin_name: str, pipe: "Connection") -> None:
+    """Entry point of a worker process running one plugin session.
+    """
+    from .pipeapi import PipeAutorestAPI  # pylint: disable=import-outside-toplevel
+
+    pipe_connection = PipeAutorestAPI(pipe)
+    result = False
+    try:
+        pipe_connection.configure_log_level()
+        result = _run_plugin(plugin_name, pipe_connection)
+    finally:
+        # Close first, so buffered log messages are sent while the parent still listens
+        pipe_connection.close()
+        pipe_connection.done(result)
+
+
+def _process_in_worker_process(plugin_name: str, stdstream_connection: AutorestAPI) -> bool:
+    # pylint: disable=import-outside-toplevel
+    import multiprocessing
+    from .pipeapi import serve_pipe
+
+    # spawn, since forking a process that has a reader thread running is not safe
+    context = multiprocessing.get_context("spawn")
+    parent_pipe, child_pipe = context.Pipe()
+    process = context.Process(target=_worker_process_main, args=(plugin_name, child_pipe))
+    process.start()
+    child_pipe.close()
+    try:
+        return serve_pipe(parent_pipe, stdstream_connection)
+    finally:
+        parent_pipe.close()
+        process.join()
+
+
+@dispatcher.add_method(context_arg="context")
+def Process(plugin_name: str, session_id: str, context: Dict[str, Any]) -> bool:
     # pylint: disable=import-outside-toplevel
     """JSON-RPC process call.
     """
     from .stdstream import StdStreamAutorestAPI
 
-    with contextlib.closing(StdStreamAutorestAPI(session_id)) as stdstream_connection:
+    with contextlib.closing(
+        StdStreamAutorestAPI(session_id, connection=context["connection"])
+    ) as stdstream_connection, stdstream_connection.session():
+        stdstream_connection.configure_log_level()
 
         _LOGGER.debug("Autorest called process with plugin_name '%s' and session_id: '%s'", plugin_name, session_id)
-        if plugin_name == "m2r":
-            from ..m2r import M2R as PluginToLoad
-        elif plugin_name == "namer":
-            from ..namer import Namer as PluginToLoad  # type: ignore
-        elif plugin_name == "codegen":
-            from ..codegen import CodeGenerator as PluginToLoad  # type: ignore
-        elif plugin_name == "black":
-            from ..black import BlackScriptPlugin  as PluginToLoad  # type: ignore
-        elif plugin_name == "multiapiscript":
-            from ..multiapi import MultiApiScriptPlugin as PluginToLoad  # type: ignore
-        else:
-            _LOGGER.fatal("Unknown plugin name %s", plugin_name)
-            raise RuntimeError(f"Unknown plugin name {plugin_name}")
-
-        plugin = PluginToLoad(stdstream_connection)
-
-        try:
-            _LOGGER.debug("Starting plugin %s", PluginToLoad.__name__)
-            return plugin.process()
-        except Exception:  # pylint: disable=broad-except
-            _LOGGER.exception("Python generator raised an exception")
-    return False
+        if _WORKER_TYPE == "process":
+            return _process_in_worker_process(plugin_name, stdstream_connection)
+        return _run_plugin(plugin_name, stdstream_connection)
+
+
+def _handle_message(connection: StdStreamConnection, data: Any) -> None:
+    # Message is already parsed by the connection, don't let the jsonrpc library parse it again
+    try:
+        request = JSONRPCRequest.from_data(data)
+    except JSONRPCInvalidRequestException:
+        response = JSONRPC20Response(error=JSONRPCInvalidRequest()._data)  # pylint: disable=protected-access
+    else:
+        response = JSONRPCResponseManager.handle_request(request, dispatcher, {"connection": connection})
+    if response is None:
+        _LOGGER.debug("Notification processed")
+        return
+    _LOGGER.debug("Produced: %s", response.data)
+    connection.write(response.data)
+    _LOGGER.debug("Message processed")
 
 
 def main() -> None:
@@ -70,17 +171,28 @@ def main() -> None:
         breakpoint()  # pylint: disable=undefined-variable
 
     _LOGGER.debug("Starting JSON RPC server")
+    if _WORKER_TYPE != "process":
+        # Import the plugins while autorest prepares the first "Process" call.
+        # Not for worker processes, that import their plugin themselves.
+        threading.Thread(
+            target=preload_plugins, args=(_preloaded_plugin_names(),), name="autorest-preload", daemon=True
+        ).start()
+    serve(get_connection())
+    _LOGGER.debug("Ending JSON RPC server")
 
-    while True:
-        _LOGGER.debug("Trying to read")
-        message = read_message()
 
-        response = JSONRPCResponseManager.handle(message, dispatcher).json
-        _LOGGER.debug("Produced: %s", response)
-        write_message(response)
-        _LOGGER.debug("Message processed")
+def serve(connection: StdStreamConnection) -> None:
+    """Answer the requests of autorest on this connection, until it's closed.
 
-    _LOGGER.debug("Ending JSON RPC server")
+    :raises Exception: The error that closed the connection
+    """
+    # Each message is handled on a worker, so sessions asked by autorest at the same time run in parallel.
+    # Responses are written by the connection, which serializes frames.
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="autorest-session") as executor:
+        while True:
+            _LOGGER.debug("Trying to read")
+            data = connection.next_request()
+            executor.submit(_handle_message, connection, data)
 
 
 if __name__ == "__main__":
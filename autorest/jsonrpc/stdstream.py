@@ -3,22 +3,27 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-import json
+from concurrent.futures import Future
+import itertools
 import os
 import logging
+import queue
 import sys
+import threading
 from pathlib import Path
-from typing import Any, BinaryIO, List, Union
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
 
-from jsonrpc.jsonrpc2 import JSONRPC20Request
-
-from . import AutorestAPI, Channel
+from . import AutorestAPI, Channel, codec
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def read_message(stream: BinaryIO = sys.stdin.buffer) -> str:
+def read_frame(stream: BinaryIO = sys.stdin.buffer) -> bytearray:
+    """Read one framed message, as raw bytes.
+
+    The body is read directly into a buffer of the announced size, without intermediate copies.
+    """
     # Content-Length
     order = stream.readline().rstrip()
 
@@ -34,60 +39,265 @@ def read_message(stream: BinaryIO = sys.stdin.buffer) -> str:
 
     # Read the right number of bytes
     _LOGGER.debug("Trying to read the message")
-    message = stream.read(bytes_size)
-    assert isinstance(message, bytes)
-    message_str = message.decode("utf-8")
-    _LOGGER.debug("Received a %d bytes message", len(message_str))
-    # _LOGGER.debug("Read %s", message)
+    message = bytearray(bytes_size)
+    view = memoryview(message)
+    position = 0
+    while position < bytes_size:
+        read = stream.readinto(view[position:])  # type: ignore
+        if not read:
+            raise ValueError(f"Stream closed after {position} bytes of a {bytes_size} bytes message")
+        position += read
+    _LOGGER.debug("Received a %d bytes message", bytes_size)
 
-    return message_str
+    return message
 
 
-def write_message(message: str, stream: BinaryIO = sys.stdout.buffer) -> None:
-    bytes_message = message.encode("utf-8")
-    stream.write(b"Content-Length: ")
-    stream.write(str(len(bytes_message)).encode("ascii"))
-    stream.write(b"\r\n\r\n")
-    stream.write(bytes_message)
+def read_message(stream: BinaryIO = sys.stdin.buffer) -> str:
+    return read_frame(stream).decode("utf-8")
+
+
+def read_json(stream: BinaryIO = sys.stdin.buffer) -> Any:
+    """Read one framed message, and parse it as JSON without decoding it to a string first.
+    """
+    return codec.loads(read_frame(stream))
+
+
+def _frame_header(payload_size: int) -> bytes:
+    return f"Content-Length: {payload_size}\r\n\r\n".encode("ascii")
+
+
+def write_frame(payload: Union[bytes, bytearray], stream: BinaryIO = sys.stdout.buffer) -> None:
+    """Write one framed message, header then body, flushed once.
+
+    The body is written as is, not copied into a buffer with the header.
+    """
+    stream.write(_frame_header(len(payload)))
+    stream.write(payload)
     stream.flush()
 
 
+def write_message(message: str, stream: BinaryIO = sys.stdout.buffer) -> None:
+    write_frame(message.encode("utf-8"), stream)
+
+
+def write_json(data: Any, stream: BinaryIO = sys.stdout.buffer) -> None:
+    write_frame(codec.dumps(data), stream)
+
+
+class StdStreamConnection:
+    """A multiplexed JSON-RPC connection with Autorest over a pair of streams.
+
+    Every request gets a unique id, and a single reader thread routes each response to the future
+    waiting for it. This allows several calls to Autorest to be in flight at the same time.
+    Messages that are not responses (i.e. requests coming from Autorest) are queued and
+    available through "next_request".
+
+    :param input_stream: The stream to read messages from
+    :param output_stream: The stream to write messages to
+    """
+
+    def __init__(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+        self._input_stream = input_stream
+        self._output_stream = output_stream
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._requests: "queue.Queue[Any]" = queue.Queue()
+        self._reader: Optional[threading.Thread] = None
+        self._reader_lock = threading.Lock()
+        self._closed_error: Optional[Exception] = None
+
+    def _ensure_reader(self) -> None:
+        with self._reader_lock:
+            if self._reader is None:
+                self._reader = threading.Thread(target=self._read_loop, name="autorest-reader", daemon=True)
+                self._reader.start()
+
+    def _read_loop(self) -> None:
+        while True:
+            try:
+                data = read_json(self._input_stream)
+            except Exception as err:  # pylint: disable=broad-except
+                self._fail_all(err)
+                return
+            if isinstance(data, dict) and "method" not in data and "id" in data:
+                self._resolve(data)
+            else:
+                self._requests.put(data)
+
+    def _resolve(self, data: Dict[str, Any]) -> None:
+        with self._pending_lock:
+            future = self._pending.pop(data["id"], None)
+        if future is None:
+            _LOGGER.warning("Received a response for unknown request id %s", data["id"])
+            return
+        if "error" in data:
+            future.set_exception(RuntimeError(f"Autorest returned an error: {data['error']}"))
+        else:
+            future.set_result(data.get("result"))
+
+    def _fail_all(self, error: Exception) -> None:
+        with self._pending_lock:
+            self._closed_error = error
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            future.set_exception(error)
+        self._requests.put(error)
+
+    def write(self, data: Any) -> None:
+        """Write a JSON framed message, safe to call from any thread."""
+        payload = codec.dumps(data)
+        with self._write_lock:
+            write_frame(payload, self._output_stream)
+
+    def send_request(self, method: str, params: List[Any]) -> Future:
+        """Send a request to Autorest and return a future of its result.
+        """
+        self._ensure_reader()
+        future: Future = Future()
+        with self._pending_lock:
+            if self._closed_error:
+                raise self._closed_error
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+        self.write({"jsonrpc": "2.0", "method": method, "params": params, "id": request_id})
+        return future
+
+    def send_notification(self, method: str, params: List[Any]) -> None:
+        self.write({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def send_notifications(self, method: str, params_list: Iterable[List[Any]]) -> None:
+        """Send several notifications of the same method, their frames flushed once.
+        """
+        payloads = [codec.dumps({"jsonrpc": "2.0", "method": method, "params": params}) for params in params_list]
+        if not payloads:
+            return
+        with self._write_lock:
+            for payload in payloads:
+                self._output_stream.write(_frame_header(len(payload)))
+                self._output_stream.write(payload)
+            self._output_stream.flush()
+
+    def send_write_file_notification(self, session_id: str, filename: str, file_chunks: Iterable[str]) -> None:
+        """Send a WriteFile notification, encoding the content chunk by chunk into the frame.
+
+        The Content-Length header needs the full size, so the encoded chunks are kept until the end,
+        then written one after the other: the content is never built as one string, nor as one buffer.
+        """
+        # JSON escaping is done per character, so the escaped chunks can be concatenated
+        pieces: List[Union[bytes, memoryview]] = [
+            b'{"jsonrpc":"2.0","method":"WriteFile","params":[',
+            codec.dumps(session_id),
+            b",",
+            codec.dumps(filename),
+            b',"',
+        ]
+        pieces.extend(memoryview(codec.dumps(chunk))[1:-1] for chunk in file_chunks)
+        pieces.append(b'",null]}')  # sourceMap ?
+        with self._write_lock:
+            self._output_stream.write(_frame_header(sum(len(piece) for piece in pieces)))
+            for piece in pieces:
+                self._output_stream.write(piece)
+            self._output_stream.flush()
+
+    def call(self, method: str, params: List[Any]) -> Any:
+        """Send a request to Autorest and wait for its result.
+        """
+        return self.send_request(method, params).result()
+
+    async def call_async(self, method: str, params: List[Any]) -> Any:
+        """Send a request to Autorest and await its result.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        return await asyncio.wrap_future(self.send_request(method, params))
+
+    def next_request(self) -> Any:
+        """Block until Autorest sends a request, and return it parsed.
+
+        :raises Exception: The error that stopped the reader, if the input stream is closed or corrupted
+        """
+        self._ensure_reader()
+        request = self._requests.get()
+        if isinstance(request, Exception):
+            # Let other waiters see it too
+            self._requests.put(request)
+            raise request
+        return request
+
+
+_CONNECTION: Optional[StdStreamConnection] = None
+_CONNECTION_LOCK = threading.Lock()
+
+
+def get_connection() -> StdStreamConnection:
+    """Get the process-wide connection over stdin/stdout.
+    """
+    global _CONNECTION  # pylint: disable=global-statement
+    with _CONNECTION_LOCK:
+        if _CONNECTION is None:
+            _CONNECTION = StdStreamConnection(sys.stdin.buffer, sys.stdout.buffer)
+        return _CONNECTION
+
+
 class StdStreamAutorestAPI(AutorestAPI):
     """The stream API with Autorest
     """
 
-    def __init__(self, session_id: str) -> None:
+    def __init__(self, session_id: str, connection: Optional[StdStreamConnection] = None) -> None:
         super().__init__()
         self.session_id = session_id
+        self._connection = connection or get_connection()
 
     def write_file(self, filename: Union[str, Path], file_content: str) -> None:
         _LOGGER.debug("Writing a file: %s", filename)
         filename = os.fspath(filename)
-        request = JSONRPC20Request(
-            method="WriteFile",
-            params=[self.session_id, filename, file_content, None],  # sourceMap ?
-            is_notification=True,
+        self._connection.send_notification(
+            "WriteFile", [self.session_id, filename, file_content, None]  # sourceMap ?
         )
-        write_message(request.json)
 
-    def read_file(self, filename: Union[str, Path]) -> str:
+    def write_file_stream(self, filename: Union[str, Path], file_chunks: Iterable[str]) -> None:
+        _LOGGER.debug("Writing a file: %s", filename)
+        self._connection.send_write_file_notification(self.session_id, os.fspath(filename), file_chunks)
+
+    def read_file(self, filename: Union[str, Path]) -> Optional[str]:
         _LOGGER.debug("Asking content for file %s", filename)
         filename = os.fspath(filename)
-        request = JSONRPC20Request(method="ReadFile", params=[self.session_id, filename], _id=42)
-        write_message(request.json)
-        return json.loads(read_message())["result"]
+        return self._connection.call("ReadFile", [self.session_id, filename])
+
+    def read_files(self, filenames: Iterable[Union[str, Path]]) -> List[Optional[str]]:
+        futures = [
+            self._connection.send_request("ReadFile", [self.session_id, os.fspath(filename)])
+            for filename in filenames
+        ]
+        _LOGGER.debug("Asked content for %d files", len(futures))
+        return [future.result() for future in futures]
+
+    async def read_file_async(self, filename: Union[str, Path]) -> Optional[str]:
+        return await self._connection.call_async("ReadFile", [self.session_id, os.fspath(filename)])
 
     def list_inputs(self) -> List[str]:
         _LOGGER.debug("Calling list inputs to Autorest")
-        request = JSONRPC20Request(method="ListInputs", params=[self.session_id, None], _id=42)
-        write_message(request.json)
-        return json.loads(read_message())["result"]
+        return self._connection.call("ListInputs", [self.session_id, None])
 
-    def get_value(self, key: str) -> Any:
+    def _get_value(self, key: str) -> Any:
         _LOGGER.debug("Calling get value to Autorest: %s", key)
-        request = JSONRPC20Request(method="GetValue", params=[self.session_id, key], _id=42)
-        write_message(request.json)
-        return json.loads(read_message())["result"]
+        return self._connection.call("GetValue", [self.session_id, key])
+
+    def _get_values(self, keys: List[str]) -> Dict[str, Any]:
+        _LOGGER.debug("Calling get value to Autorest: %s", keys)
+        futures = [self._connection.send_request("GetValue", [self.session_id, key]) for key in keys]
+        return {key: future.result() for key, future in zip(keys, futures)}
+
+    async def get_value_async(self, key: str) -> Any:
+        try:
+            return self._values_cache[key]
+        except KeyError:
+            value = await self._connection.call_async("GetValue", [self.session_id, key])
+            self._values_cache[key] = value
+            return value
 
     def message(self, channel: Channel, text: str) -> None:
         # https://github.com/Azure/autorest/blob/ad7f01ffe17aa74ad0075d6b1562a3fa78fd2e96/src/autorest-core/lib/message.ts#L53
@@ -96,5 +306,11 @@ class StdStreamAutorestAPI(AutorestAPI):
             "Channel": channel.value,
             "Text": text,
         }
-        request = JSONRPC20Request(method="Message", params=[self.session_id, message], is_notification=True)
-        write_message(request.json)
+        self._connection.send_notification("Message", [self.session_id, message])
+
+    def messages(self, messages: Iterable[Tuple[Channel, str]]) -> None:
+        # Don't log anything here, or you will create a cycle with the autorest handler
+        self._connection.send_notifications(
+            "Message",
+            ([self.session_id, {"Channel": channel.value, "Text": text}] for channel, text in messages)
+        )
@@ -0,0 +1,152 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""The manifest of an output folder: the hash of each generated file, as generated and as formatted.
+
+It is written in the output folder with the generated files, so the next run only writes the files
+whose content changed, and only formats those. It is not used with "clear-output-folder", since the
+folder is then emptied before each run.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from .cache import hash_content
+from .jsonrpc import AutorestAPI
+from ._version import VERSION
+
+
+_LOGGER = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = ".autorest-python-manifest.json"
+
+
+class OutputManifest:
+    """The files generated in an output folder, by file name relative to the folder.
+
+    :param str options_hash: The hash of the options the files were generated with
+    :param output_folder: The output folder, where files must still be to be considered unchanged
+    :param previous: The manifest of the previous run in this output folder, if any
+    """
+
+    def __init__(
+        self, options_hash: str, output_folder: Optional[Path] = None, previous: Optional["OutputManifest"] = None
+    ) -> None:
+        self.options_hash = options_hash
+        self.output_folder = output_folder
+        # file name to {"generated": hash, "formatted": hash}, "formatted" only once formatted
+        self.files: Dict[str, Dict[str, str]] = {}
+        self.formatter: Optional[str] = None
+        self._previous_files: Dict[str, Dict[str, str]] = {}
+        self._content: Optional[str] = None
+        if previous:
+            self._content = previous._content  # pylint: disable=protected-access
+            self.formatter = previous.formatter
+            if previous.options_hash == options_hash:
+                self._previous_files = previous.files
+
+    @classmethod
+    def read(cls, autorestapi: AutorestAPI, output_folder: Optional[Path] = None) -> Optional["OutputManifest"]:
+        """Read the manifest of the output folder.
+
+        :param autorestapi: The autorest API
+        :param output_folder: The output folder
+        :returns: The manifest, or None if there is none written by this generator version
+        """
+        content = autorestapi.read_file(MANIFEST_FILE_NAME)
+        if not content:
+            return None
+        try:
+            manifest_data = json.loads(content)
+            if manifest_data["generator"] != VERSION:
+                _LOGGER.debug("Ignoring manifest of generator version %s", manifest_data["generator"])
+                return None
+            manifest = cls(manifest_data["options"], output_folder)
+            manifest.formatter = manifest_data["formatter"]
+            manifest.files = manifest_data["files"]
+        except (ValueError, KeyError, TypeError):
+            _LOGGER.debug("Ignoring invalid manifest", exc_info=True)
+            return None
+        manifest._content = content  # pylint: disable=protected-access
+        return manifest
+
+    def write(self, autorestapi: AutorestAPI) -> None:
+        """Write the manifest in the output folder, unless it didn't change.
+        """
+        content = json.dumps(
+            {"generator": VERSION, "options": self.options_hash, "formatter": self.formatter, "files": self.files},
+            indent=2,
+            sort_keys=True,
+        )
+        if content != self._content:
+            autorestapi.write_file(MANIFEST_FILE_NAME, content)
+            self._content = content
+
+    def _add_generated_hash(self, key: str, generated_hash: str) -> bool:
+        entry = {"generated": generated_hash}
+        previous_entry = self._previous_files.get(key, {})
+        unchanged = previous_entry.get("generated") == generated_hash
+        if unchanged and "formatted" in previous_entry:
+            entry["formatted"] = previous_entry["formatted"]
+        self.files[key] = entry
+        return unchanged
+
+    def add_generated_file(self, filename: Union[str, Path], file_content: str) -> bool:
+        """Record a generated file.
+
+        :param filename: The file name, relative to the output folder
+        :param str file_content: The generated content
+        :returns: True if the previous run generated the same content, and the file in the output folder is still
+         the one it wrote
+        :rtype: bool
+        """
+        key = Path(filename).as_posix()
+        if not self._add_generated_hash(key, hash_content(file_content)) or self.output_folder is None:
+            return False
+        entry = self.files[key]
+        try:
+            written_content = (self.output_folder / key).read_text()
+        except (OSError, UnicodeDecodeError):
+            return False
+        return hash_content(written_content) == entry.get("formatted", entry["generated"])
+
+    def add_written_file(self, filename: Union[str, Path], generated_hash: str) -> None:
+        """Record a generated file written without asking if it changed, i.e. streamed.
+
+        :param filename: The file name, relative to the output folder
+        :param str generated_hash: The hash of the generated content, as hash_content computes it
+        """
+        self._add_generated_hash(Path(filename).as_posix(), generated_hash)
+
+    def is_formatted(self, filename: Union[str, Path], file_content: str, formatter: str) -> bool:
+        """Tell if a generated file is known to be left as it is by this formatter, so doesn't need to be formatted.
+
+        :param filename: The file name, relative to the output folder
+        :param str file_content: The generated content of the file
+        :param str formatter: The name and version of the formatter, and its options
+        :rtype: bool
+        """
+        if formatter != self.formatter:
+            return False
+        entry = self.files.get(Path(filename).as_posix(), {})
+        content_hash = hash_content(file_content)
+        return entry.get("generated") == content_hash and entry.get("formatted") == content_hash
+
+    def add_formatted_file(self, filename: Union[str, Path], file_content: str, formatter: str) -> None:
+        """Record the formatted content of a generated file. Files not generated are not recorded.
+
+        :param filename: The file name, relative to the output folder
+        :param str file_content: The formatted content
+        :param str formatter: The name and version of the formatter, and its options
+        """
+        if formatter != self.formatter:
+            # formatted by another formatter, or with other options: these hashes don't tell anything anymore
+            for file_entry in self.files.values():
+                file_entry.pop("formatted", None)
+            self.formatter = formatter
+        entry: Optional[Dict[str, str]] = self.files.get(Path(filename).as_posix())
+        if entry is not None:
+            entry["formatted"] = hash_content(file_content)
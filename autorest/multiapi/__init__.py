@@ -22,6 +22,8 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class MultiApiScriptPlugin(Plugin):
+    CONFIGURATION_KEYS = ["package-name", "output-folder", "default-api", "no-async"]
+
     def process(self) -> bool:
         input_package_name: str = self._autorestapi.get_value("package-name")
         output_folder: str = self._autorestapi.get_value("output-folder")
@@ -75,7 +77,8 @@ class MultiAPI:
             if self.default_api_version.replace("-", "_") == path_to_version.stem:
                 path_to_default_version = path_to_version
                 break
-        return json.loads(self._autorestapi.read_file(path_to_default_version / "_metadata.json"))
+        # paths_to_versions only lists the folders with a metadata file
+        return json.loads(cast(str, self._autorestapi.read_file(path_to_default_version / "_metadata.json")))
 
     @property
     def module_name(self) -> str:
@@ -111,16 +114,20 @@ class MultiAPI:
 
     @property
     def version_path_to_metadata(self) -> Dict[Path, Dict[str, Any]]:
+        paths_to_versions = self.paths_to_versions
+        metadata_files = self._autorestapi.read_files(
+            [version_path / "_metadata.json" for version_path in paths_to_versions]
+        )
         return {
-            version_path: json.loads(self._autorestapi.read_file(version_path / "_metadata.json"))
-            for version_path in self.paths_to_versions
+            version_path: json.loads(cast(str, metadata_file))
+            for version_path, metadata_file in zip(paths_to_versions, metadata_files)
         }
 
     @property
     def mod_to_api_version(self) -> Dict[str, str]:
         mod_to_api_version: Dict[str, str] = defaultdict(str)
         for version_path in self.paths_to_versions:
-            metadata_json = json.loads(self._autorestapi.read_file(version_path / "_metadata.json"))
+            metadata_json = json.loads(cast(str, self._autorestapi.read_file(version_path / "_metadata.json")))
             version = metadata_json['chosen_version']
             total_api_version_list = metadata_json['total_api_version_list']
             if not version:
@@ -5,10 +5,9 @@
 # --------------------------------------------------------------------------
 from pathlib import Path
 from typing import Any, Optional
-from jinja2 import PackageLoader, Environment
-
 from .import_serializer import FileImportSerializer
 
+from ...jinja_environment import get_environment
 from ...jsonrpc import AutorestAPI
 from ..models import CodeModel
 
@@ -34,14 +33,7 @@ def _get_file_path(filename: str, async_mode: bool) -> Path:
 class MultiAPISerializer(object):
     def __init__(self, autorestapi: AutorestAPI) -> None:
         self._autorestapi = autorestapi
-        self.env = Environment(
-            loader=PackageLoader("autorest.multiapi", "templates"),
-            keep_trailing_newline=True,
-            line_statement_prefix="##",
-            line_comment_prefix="###",
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        self.env = get_environment("autorest.multiapi")
 
 
     def _serialize_helper(self, code_model: CodeModel, async_mode: bool) -> None:
@@ -87,16 +79,9 @@ class MultiAPISerializer(object):
         self._autorestapi.write_file(Path("models.py"), _render_template("models"))
 
     def _serialize_version_file(self) -> None:
-        if self._autorestapi.read_file("_version.py"):
-            self._autorestapi.write_file(
-                "_version.py",
-                self._autorestapi.read_file("_version.py")
-            )
-        elif self._autorestapi.read_file("version.py"):
-            self._autorestapi.write_file(
-                "_version.py",
-                self._autorestapi.read_file("version.py")
-            )
+        version_file = self._autorestapi.read_file("_version.py") or self._autorestapi.read_file("version.py")
+        if version_file:
+            self._autorestapi.write_file("_version.py", version_file)
         else:
             template = self.env.get_template("multiapi_version.py.jinja2")
             self._autorestapi.write_file(
@@ -113,10 +98,8 @@ class MultiAPISerializer(object):
         self._serialize_version_file()
 
         # don't erase patch file
-        if self._autorestapi.read_file("_patch.py"):
-            self._autorestapi.write_file(
-                "_patch.py",
-                self._autorestapi.read_file("_patch.py")
-            )
+        patch_file = self._autorestapi.read_file("_patch.py")
+        if patch_file:
+            self._autorestapi.write_file("_patch.py", patch_file)
 
         self._autorestapi.write_file(Path("py.typed"), "# Marker file for PEP 561.")
@@ -0,0 +1,166 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Run the Python generator plugins in process, without autorest.
+
+The plugins share one parsed code model, and generated files are kept in memory until they
+are formatted, so only the final outputs are written to disk.
+
+    python -m autorest.pipeline code-model-v4-no-tags.yaml --output-folder=generated --azure-arm --namespace=foo
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Type, Union
+
+from . import Plugin, yaml_loader
+from .jsonrpc import Channel
+from .jsonrpc.localapi import LocalAutorestAPI
+
+
+_LOGGER = logging.getLogger(__name__)
+
+_CODE_MODEL_FILE_NAME = "code-model-v4-no-tags.yaml"
+
+
+class PipelineAutorestAPI(LocalAutorestAPI):
+    """A local API that keeps the files in memory, shared between the plugins of a pipeline.
+
+    The code model is parsed once and passed as a tree between plugins. Other files are read from
+    memory first, then from the output folder.
+
+    :param str code_model: The content of the code model YAML file
+    :param str output_folder: Where "write_to_disk" writes the generated files
+    :param dict values: The configuration, as autorest would give it
+    """
+
+    def __init__(self, code_model: str, output_folder: str, values: Dict[str, Any]) -> None:
+        super().__init__(reachable_files=[_CODE_MODEL_FILE_NAME], output_folder=output_folder)
+        self.values = values
+        # file name to content, and to the parsed tree for YAML files read or written as such
+        self._artifacts: Dict[str, Any] = {_CODE_MODEL_FILE_NAME: code_model}
+        self._parsed_artifacts: Dict[str, Any] = {}
+
+    def write_file(self, filename: Union[str, Path], file_content: str) -> None:
+        _LOGGER.debug("Keeping file in memory: %s", filename)
+        self._parsed_artifacts.pop(Path(filename).as_posix(), None)
+        self._artifacts[Path(filename).as_posix()] = file_content
+
+    def write_file_stream(self, filename: Union[str, Path], file_chunks: Iterable[str]) -> None:
+        self.write_file(filename, "".join(file_chunks))
+
+    def read_file(self, filename: Union[str, Path]) -> Optional[str]:
+        key = Path(filename).as_posix()
+        if key in self._parsed_artifacts:
+            return yaml_loader.dump(self._parsed_artifacts[key])
+        if key in self._artifacts:
+            return self._artifacts[key]
+        # Like autorest, files generated by a previous run are readable
+        return super().read_file(filename)
+
+    def read_yaml(self, filename: Union[str, Path]) -> Any:
+        key = Path(filename).as_posix()
+        if key not in self._parsed_artifacts:
+            self._parsed_artifacts[key] = super().read_yaml(filename)
+        return self._parsed_artifacts[key]
+
+    def write_yaml(self, filename: Union[str, Path], yaml_data: Any) -> None:
+        key = Path(filename).as_posix()
+        self._yaml_hashes.pop(key, None)
+        self._artifacts.pop(key, None)
+        self._parsed_artifacts[key] = yaml_data
+
+    def message(self, channel: Channel, text: str) -> None:
+        print(f"{channel.value.upper()}: {text}", file=sys.stderr)
+
+    def generated_files(self) -> Dict[str, str]:
+        """The files written by the plugins, except the code model.
+        """
+        return {
+            filename: content
+            for filename, content in self._artifacts.items()
+            if filename != _CODE_MODEL_FILE_NAME
+        }
+
+    def write_to_disk(self) -> None:
+        for filename, content in self.generated_files().items():
+            path = self._output_folder / filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            super().write_file(filename, content)
+
+
+def _pipeline_plugins() -> List[Type[Plugin]]:
+    # pylint: disable=import-outside-toplevel
+    from .m2r import M2R
+    from .namer import Namer
+    from .codegen import CodeGenerator
+
+    # Same order as the autorest configuration in README.md
+    return [M2R, Namer, CodeGenerator]
+
+
+def run_pipeline(code_model: str, output_folder: str, values: Dict[str, Any], black: bool = True) -> bool:
+    """Run m2r, namer, codegen, and optionally black, on a code model, and write the result in output_folder.
+
+    :param str code_model: The content of the "code-model-v4-no-tags.yaml" file given by modelerfour
+    :param str output_folder: The output folder
+    :param dict values: The configuration, as autorest would give it (a flag without value is {})
+    :param bool black: Whether to format the generated files with black
+    :returns: True if everything's ok, False otherwise
+    :rtype: bool
+    """
+    values = dict(values, **{"output-folder": output_folder, "black": black})
+    autorestapi = PipelineAutorestAPI(code_model, output_folder, values)
+    try:
+        autorestapi.configure_log_level()
+        for plugin_class in _pipeline_plugins():
+            _LOGGER.debug("Starting plugin %s", plugin_class.__name__)
+            if not plugin_class(autorestapi).process():
+                return False
+
+        if black:
+            from .black import BlackScriptPlugin  # pylint: disable=import-outside-toplevel
+
+            BlackScriptPlugin(autorestapi).format_files(
+                (Path(filename), file_content) for filename, file_content in autorestapi.generated_files().items()
+            )
+
+        autorestapi.write_to_disk()
+        return True
+    finally:
+        autorestapi.close()
+
+
+def _parse_values(args: List[str]) -> Dict[str, Any]:
+    """Parse "--key=value" and "--key" like autorest, a flag without value being {}.
+    """
+    values: Dict[str, Any] = {}
+    for arg in args:
+        if not arg.startswith("--"):
+            raise ValueError(f"Unexpected argument {arg}, options must look like --key or --key=value")
+        key, has_value, value = arg[2:].partition("=")
+        values[key] = value if has_value else {}
+    return values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate Python code from a modelerfour code model, without autorest.",
+        epilog="Any other --key or --key=value is passed to the generator like the autorest option of the same name.",
+    )
+    parser.add_argument("code_model", help="The code-model-v4-no-tags.yaml file")
+    parser.add_argument("--output-folder", default="generated")
+    parser.add_argument("--no-black", action="store_true", help="Don't format the generated files with black")
+    args, generator_args = parser.parse_known_args()
+
+    values = _parse_values(generator_args)
+    code_model = Path(args.code_model).read_text(encoding="utf-8")
+    if not run_pipeline(code_model, args.output_folder, values, black=not args.no_black):
+        raise SystemExit("Process didn't finish gracefully")
+
+
+if __name__ == "__main__":
+    main()
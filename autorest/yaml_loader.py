@@ -0,0 +1,59 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Load and dump the code model YAML.
+
+Uses libyaml when PyYAML was built with it. Like yaml.safe_load, nodes shared through anchors
+are loaded as the same Python object, which the generator relies on (schemas are identified by
+the id of their YAML data). Parsed trees are cached on disk, keyed by the SHA-256 of the YAML,
+so an unchanged code model is never parsed twice.
+"""
+import logging
+from typing import Any, Tuple
+
+import yaml
+
+from .cache import hash_content, read_cache, write_cache
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper  # type: ignore
+
+
+_LOGGER = logging.getLogger(__name__)
+
+_CACHE_NAME = "yaml"
+
+
+def load(yaml_text: str) -> Any:
+    """Parse a YAML text, or get its parsed tree from the cache.
+
+    Each call returns a new tree, callers are free to update it.
+    """
+    return load_with_hash(yaml_text)[0]
+
+
+def load_with_hash(yaml_text: str) -> Tuple[Any, str]:
+    """Like load, and also return the SHA-256 of the YAML text, to key what is built from the tree.
+    """
+    key = hash_content(yaml_text)
+    yaml_data = read_cache(_CACHE_NAME, key)
+    if yaml_data is not None:
+        _LOGGER.debug("Parsed YAML found in cache")
+        return yaml_data, key
+    yaml_data = yaml.load(yaml_text, Loader=SafeLoader)
+    # pickle keeps shared nodes shared
+    write_cache(_CACHE_NAME, key, yaml_data)
+    return yaml_data, key
+
+
+def dump(yaml_data: Any) -> str:
+    """Dump a YAML tree. Objects shared in the tree are dumped as anchors and aliases.
+    """
+    return yaml.dump(yaml_data, Dumper=SafeDumper)
+
+
+__all__ = ["load", "load_with_hash", "dump"]
@@ -45,7 +45,7 @@ setup(
         'test',
     ]),
     install_requires=[
-        "json-rpc",
+        "json-rpc >= 1.13", # I need the "context_arg" of dispatcher methods
         "Jinja2 >= 2.11", # I need "include" and auto-context + blank line are not indented by default
         "pyyaml",
         "m2r",
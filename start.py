@@ -9,15 +9,91 @@ import sys
 if not sys.version_info >= (3, 6, 0):
     raise Exception("Autorest for Python extension requires Python 3.6 at least")
 
+import os
 from pathlib import Path
+import re
+import socket
+import threading
 import venv
 
 from venvtools import python_run
 
 _ROOT_DIR = Path(__file__).parent
 
+# Set to the socket of a daemon started with "python -m autorest.jsonrpc.daemon" to reuse it
+_DAEMON_SOCKET_ENV_VARIABLE = "AUTOREST_PYTHON_DAEMON_SOCKET"
+_RELAY_CHUNK_SIZE = 64 * 1024
+# Sent to the daemon with our version, see autorest.jsonrpc.daemon
+_DAEMON_HANDSHAKE = "autorest-python"
+
+
+def _get_version():
+    # Read, not imported: this script doesn't run in the virtual environment
+    with open(_ROOT_DIR / "autorest" / "_version.py", "r") as fd:
+        return re.search(r'^VERSION\s*=\s*[\'"]([^\'"]*)[\'"]', fd.read(), re.MULTILINE).group(1)
+
+
+def _daemon_handshake(daemon):
+    """Check the daemon runs the same version as this script, reading its answer byte by byte
+    so nothing sent after it is consumed.
+    """
+    daemon.sendall(f"{_DAEMON_HANDSHAKE} {_get_version()}\n".encode("utf-8"))
+    answer = b""
+    while not answer.endswith(b"\n"):
+        data = daemon.recv(1)
+        if not data:
+            break
+        answer += data
+    return answer == b"ok\n"
+
+
+def relay_to_daemon(socket_path):
+    """Relay stdin/stdout to the generator daemon listening on socket_path.
+
+    Returns False, without reading anything, if no daemon of this version is listening there.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    daemon = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        daemon.connect(socket_path)
+        if not _daemon_handshake(daemon):
+            # Started from another version, the generator of this one runs instead
+            daemon.close()
+            return False
+    except OSError:
+        daemon.close()
+        return False
+
+    def _stdin_to_daemon():
+        stdin = sys.stdin.fileno()
+        try:
+            while True:
+                data = os.read(stdin, _RELAY_CHUNK_SIZE)
+                if not data:
+                    break
+                daemon.sendall(data)
+        finally:
+            # Tell the daemon autorest is done
+            daemon.shutdown(socket.SHUT_WR)
+
+    threading.Thread(target=_stdin_to_daemon, daemon=True).start()
+    with daemon:
+        stdout = sys.stdout.buffer
+        while True:
+            data = daemon.recv(_RELAY_CHUNK_SIZE)
+            if not data:
+                break
+            stdout.write(data)
+            stdout.flush()
+    return True
+
 
 def main():
+    daemon_socket = os.environ.get(_DAEMON_SOCKET_ENV_VARIABLE)
+    if daemon_socket and "--debug" not in sys.argv and relay_to_daemon(daemon_socket):
+        return
+
     venv_path = _ROOT_DIR / "venv"
     venv_prexists = venv_path.exists()
 
@@ -0,0 +1,183 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+from autorest import cache
+from autorest.codegen import CodeGenerator
+from autorest.m2r import M2R
+from autorest.namer import Namer
+from autorest.pipeline import PipelineAutorestAPI
+
+_WIDGETS_SERVICE = """
+info:
+  title: Widgets
+  description: ''
+language:
+  default:
+    name: Widgets
+    description: ''
+"""
+
+# a Widget model with a Color enum, and a Gadget model
+_WIDGETS_MODELS = """
+globalParameters:
+  - &ref_1
+    schema: &ref_0
+      type: string
+      language:
+        default:
+          name: string
+          description: ''
+    clientDefaultValue: http://localhost
+    implementation: Client
+    required: true
+    language:
+      default:
+        name: $host
+        description: server parameter
+        serializedName: $host
+    protocol:
+      http:
+        in: uri
+schemas:
+  strings:
+    - *ref_0
+  choices:
+    - &ref_2
+      type: choice
+      choiceType: *ref_0
+      choices:
+        - value: red
+          language:
+            default:
+              name: red
+              description: ''
+      language:
+        default:
+          name: Color
+          description: ''
+  objects:
+    - &ref_3
+      type: object
+      language:
+        default:
+          name: Widget
+          description: A widget.
+      properties:
+        - schema: *ref_2
+          serializedName: color
+          language:
+            default:
+              name: color
+              description: The color.
+    - type: object
+      language:
+        default:
+          name: Gadget
+          description: %(gadget_description)s
+      properties:
+        - schema: *ref_0
+          serializedName: name
+          language:
+            default:
+              name: name
+              description: The name.
+"""
+
+# an operation group with an operation returning a Widget
+_OPERATION_GROUP = """
+  - $key: %(name)s
+    language:
+      default:
+        name: %(name)s
+        description: ''
+    operations:
+      - apiVersions:
+          - version: 2020-01-01
+        language:
+          default:
+            name: get
+            description: Get a widget.
+        parameters:
+          - *ref_1
+        requests:
+          - language:
+              default:
+                name: ''
+                description: ''
+            protocol:
+              http:
+                path: /%(path)s
+                method: get
+                uri: '{$host}'
+        responses:
+          - schema: *ref_3
+            language:
+              default:
+                name: ''
+                description: ''
+            protocol:
+              http:
+                statusCodes:
+                  - '200'
+                mediaTypes:
+                  - application/json
+                knownMediaType: json
+"""
+
+
+def _widgets_code_model(*operation_groups, models=True, gadget_description="A gadget."):
+    if not models:
+        return _WIDGETS_SERVICE + "schemas: {}\noperationGroups: []\n"
+    code_model = _WIDGETS_SERVICE + _WIDGETS_MODELS % {"gadget_description": gadget_description}
+    if not operation_groups:
+        return code_model + "operationGroups: []\n"
+    return code_model + "operationGroups:" + "".join(
+        _OPERATION_GROUP % {"name": name, "path": name.lower()} for name in operation_groups
+    )
+
+
+@pytest.fixture
+def no_cache(monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VARIABLE, "")
+
+
+@pytest.fixture
+def widgets_code_model():
+    """Builds the code model YAML of a Widgets service.
+
+    Called with the names of the operation groups, each with a "get" operation; models=False for a service
+    without models nor operations; and gadget_description to change the Gadget model.
+    """
+    return _widgets_code_model
+
+
+@pytest.fixture
+def named_autorestapi(tmp_path):
+    """Builds an autorest API on a code model YAML and options, and runs M2R and Namer on it."""
+    apis = []
+
+    def _named_autorestapi(code_model, values):
+        api = PipelineAutorestAPI(code_model, str(tmp_path / "generated"), dict(values))
+        apis.append(api)
+        assert M2R(api).process()
+        assert Namer(api).process()
+        return api
+
+    yield _named_autorestapi
+    for api in apis:
+        api.close()
+
+
+@pytest.fixture
+def generate(named_autorestapi):
+    """Generates the code of a code model YAML with options, and returns the generated files."""
+
+    def _generate(code_model, values):
+        api = named_autorestapi(code_model, values)
+        assert CodeGenerator(api).process()
+        return api.generated_files()
+
+    return _generate
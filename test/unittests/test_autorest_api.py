@@ -3,6 +3,11 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import logging
+
+import pytest
+from autorest import cache
+from autorest.jsonrpc import Channel
 from autorest.jsonrpc.localapi import LocalAutorestAPI
 
 def test_get_bool():
@@ -41,3 +46,142 @@ def test_get_bool():
 
     assert api.get_boolean_value('dashdash') is True
     assert api.get_boolean_value('dashdash', False) is True
+    api.close()
+
+
+class CountingAutorestAPI(LocalAutorestAPI):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def _get_value(self, key):
+        self.calls.append(key)
+        return super()._get_value(key)
+
+
+def test_get_value_is_memoized():
+    api = CountingAutorestAPI()
+    api.values = {'namespace': 'foo.bar', 'azure-arm': True}
+
+    assert api.get_value('namespace') == 'foo.bar'
+    assert api.get_value('namespace') == 'foo.bar'
+    assert api.get_boolean_value('azure-arm') is True
+    assert api.get_boolean_value('azure-arm') is True
+    assert api.calls == ['namespace', 'azure-arm']
+    api.close()
+
+
+def test_get_values():
+    api = CountingAutorestAPI()
+    api.values = {'namespace': 'foo.bar', 'azure-arm': True}
+
+    api.get_value('namespace')
+    assert api.get_values(['namespace', 'azure-arm', 'nothere']) == {
+        'namespace': 'foo.bar',
+        'azure-arm': True,
+        'nothere': None,
+    }
+    assert api.calls == ['namespace', 'azure-arm', 'nothere']
+    assert api.get_boolean_value('nothere', True) is True
+    assert api.calls == ['namespace', 'azure-arm', 'nothere']
+    api.close()
+
+
+def test_write_file_stream(tmp_path):
+    api = LocalAutorestAPI(output_folder=str(tmp_path))
+    api.write_file_stream("a.py", (line for line in ["import os\n", "\n", "print(os.sep)\n"]))
+    assert api.read_file("a.py") == "import os\n\nprint(os.sep)\n"
+    api.close()
+
+
+def test_write_file_stream_error(tmp_path):
+    api = LocalAutorestAPI(output_folder=str(tmp_path))
+    api.write_file("a.py", "import os\n")
+
+    def _chunks():
+        yield "import sys\n"
+        raise ValueError("Rendering failed")
+
+    with pytest.raises(ValueError):
+        api.write_file_stream("a.py", _chunks())
+    # the file is left as it was, without a temporary file next to it
+    assert api.read_file("a.py") == "import os\n"
+    assert [path.name for path in tmp_path.iterdir()] == ["a.py"]
+    api.close()
+
+
+def test_read_missing_file(tmp_path):
+    api = LocalAutorestAPI(output_folder=str(tmp_path))
+    try:
+        assert api.read_file("missing.py") is None
+        assert api.read_files(["missing.py"]) == [None]
+        with pytest.raises(FileNotFoundError):
+            api.read_yaml("missing.yaml")
+    finally:
+        api.close()
+
+
+def test_yaml_hash(tmp_path):
+    (tmp_path / "a.yaml").write_text("a: 1\n")
+    api = LocalAutorestAPI(output_folder=str(tmp_path))
+    assert api.get_yaml_hash("a.yaml") is None
+    yaml_data = api.read_yaml("a.yaml")
+    assert api.get_yaml_hash("a.yaml") == cache.hash_content("a: 1\n")
+
+    # the written tree may not be the one of this text anymore
+    yaml_data["a"] = 2
+    api.write_yaml("a.yaml", yaml_data)
+    assert api.get_yaml_hash("a.yaml") is None
+    api.close()
+
+
+class RecordingAutorestAPI(LocalAutorestAPI):
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    def messages(self, messages):
+        self.sent.append(list(messages))
+
+
+def test_log_records_are_batched():
+    api = RecordingAutorestAPI()
+    logger = logging.getLogger("autorest.test_log_records_are_batched")
+    try:
+        logger.info("first")
+        logger.warning("second %s", "arg")
+        assert api.sent == []
+        logger.error("third")
+        assert [[text.split("] ")[1] for _, text in batch] for batch in api.sent] == [["first", "second arg", "third"]]
+        assert [channel for channel, _ in api.sent[0]] == [Channel.Information, Channel.Warning, Channel.Error]
+
+        logger.info("fourth")
+        api._handler.flush()
+        assert len(api.sent) == 2
+    finally:
+        api.close()
+
+
+def test_configure_log_level():
+    root_level = logging.getLogger().level
+    api = RecordingAutorestAPI()
+    logger = logging.getLogger("autorest.test_configure_log_level")
+    try:
+        api.configure_log_level()
+        assert not logger.isEnabledFor(logging.DEBUG)
+        logger.debug("dropped")
+        logger.info("kept")
+    finally:
+        api.close()
+    assert [[text.split("] ")[1] for _, text in batch] for batch in api.sent] == [["kept"]]
+
+    api = RecordingAutorestAPI()
+    api.values = {"debug": {}}
+    try:
+        api.configure_log_level()
+        assert logger.isEnabledFor(logging.DEBUG)
+    finally:
+        api.close()
+    # only the "autorest" logger was filtered, and not anymore
+    assert logging.getLogger().level == root_level
+    assert logging.getLogger("autorest").level == logging.NOTSET
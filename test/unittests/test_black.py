@@ -0,0 +1,65 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from pathlib import Path
+
+import black
+from autorest import cache
+from autorest.black import BlackScriptPlugin
+from autorest.jsonrpc.localapi import LocalAutorestAPI
+
+_UNFORMATTED = "x = {  'a':37,'b':42,\n'c':927}\n"
+_FORMATTED = 'x = {"a": 37, "b": 42, "c": 927}\n'
+
+
+class _InMemoryAutorestAPI(LocalAutorestAPI):
+    def __init__(self, files, values):
+        super().__init__(reachable_files=list(files))
+        self.files = dict(files)
+        self.values = values
+
+    def write_file(self, filename, file_content):
+        self.files[Path(filename).as_posix()] = file_content
+
+    def read_file(self, filename):
+        return self.files.get(Path(filename).as_posix())
+
+
+def _format(values):
+    autorestapi = _InMemoryAutorestAPI(
+        {
+            "widgets/_models.py": _UNFORMATTED,
+            "widgets/aio/_models.py": _UNFORMATTED.replace("x", "y"),
+            "widgets/py.typed": "  typed",
+        },
+        values,
+    )
+    try:
+        assert BlackScriptPlugin(autorestapi).process()
+    finally:
+        autorestapi.close()
+    return autorestapi.files
+
+
+def test_format_written_python_files(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VARIABLE, str(tmp_path))
+    expected = {
+        "widgets/_models.py": _FORMATTED,
+        "widgets/aio/_models.py": _FORMATTED.replace("x", "y"),
+        "widgets/py.typed": "  typed",
+    }
+    assert _format({}) == expected
+
+    # formatted contents are read from the cache
+    def _fail(*args, **kwargs):
+        raise AssertionError("Cached contents should not be formatted again")
+
+    monkeypatch.setattr(black, "format_file_contents", _fail)
+    assert _format({}) == expected
+
+
+def test_format_in_process_pool(monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VARIABLE, "")
+    assert _format({"jobs": "2"}) == _format({})
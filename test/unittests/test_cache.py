@@ -0,0 +1,45 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import os
+
+import pytest
+from autorest import VERSION, cache
+
+
+@pytest.fixture
+def cache_root(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VARIABLE, str(tmp_path))
+    monkeypatch.setattr(cache, "_PRUNED", False)
+    return tmp_path
+
+
+def test_least_recently_used_entries_evicted(cache_root, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_MAX_SIZE_ENV_VARIABLE, "1")
+    monkeypatch.setattr(cache, "_PRUNED", True)
+    for key in ("old", "used", "new"):
+        cache.write_cache("test", key, b"x" * 400 * 1024)
+    folder = cache_root / VERSION / "test"
+    for timestamp, key in enumerate(("old", "used", "new")):
+        os.utime(folder / f"{key}.pickle", (timestamp, timestamp))
+    # reading an entry makes it the most recently used
+    assert cache.read_cache("test", "used") == b"x" * 400 * 1024
+
+    cache.prune_caches()
+    assert sorted(path.name for path in folder.iterdir()) == ["new.pickle", "used.pickle"]
+
+
+def test_other_versions_deleted(cache_root):
+    (cache_root / "0.0.1" / "test").mkdir(parents=True)
+    (cache_root / "not-a-version").mkdir()
+
+    # pruned before the first write of the process
+    cache.write_cache("test", "key", "value")
+    assert sorted(path.name for path in cache_root.iterdir()) == sorted([VERSION, "not-a-version"])
+    assert cache.read_cache("test", "key") == "value"
+
+    cache.clear_caches()
+    assert [path.name for path in cache_root.iterdir()] == ["not-a-version"]
+    assert cache.read_cache("test", "key") is None
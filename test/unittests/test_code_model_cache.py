@@ -0,0 +1,84 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+from autorest import cache
+import autorest.codegen
+from autorest.codegen import CodeGenerator
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VARIABLE, str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def generate_widgets(generate, widgets_code_model):
+    def _generate_widgets(values):
+        return generate(widgets_code_model(), values)
+
+    return _generate_widgets
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("The code model should come from the cache")
+
+
+def test_code_model_cached(cache_dir, generate_widgets, monkeypatch):
+    generated = generate_widgets({"namespace": "widgets"})
+    assert "widgets/models/_models.py" in generated
+
+    monkeypatch.setattr(CodeGenerator, "_create_code_model", _fail)
+    assert generate_widgets({"namespace": "widgets"}) == generated
+
+
+def test_cache_keyed_by_options(cache_dir, generate_widgets, monkeypatch):
+    generate_widgets({"namespace": "widgets"})
+    created = []
+    create_code_model = CodeGenerator._create_code_model
+
+    def _create(self, **kwargs):
+        created.append(kwargs["options"])
+        return create_code_model(self, **kwargs)
+
+    monkeypatch.setattr(CodeGenerator, "_create_code_model", _create)
+    generated = generate_widgets({"namespace": "gadgets"})
+    assert "gadgets/models/_models.py" in generated
+    generate_widgets({"namespace": "widgets", "client-side-validation": {}})
+    assert [options["client_side_validation"] for options in created] == [False, True]
+
+
+def test_cache_keyed_by_code(cache_dir, generate_widgets, monkeypatch):
+    generate_widgets({"namespace": "widgets"})
+    created = []
+    create_code_model = CodeGenerator._create_code_model
+
+    def _create(self, **kwargs):
+        created.append(kwargs["options"])
+        return create_code_model(self, **kwargs)
+
+    # as if the code building the models changed
+    monkeypatch.setattr(autorest.codegen, "get_sources_hash", lambda package_name: "changed")
+    monkeypatch.setattr(CodeGenerator, "_create_code_model", _create)
+    generate_widgets({"namespace": "widgets"})
+    assert len(created) == 1
+
+
+def test_cached_code_model_is_frozen(cache_dir, generate_widgets, monkeypatch):
+    generate_widgets({"namespace": "widgets"})
+    code_models = []
+    get_code_model = CodeGenerator._get_code_model
+
+    def _get(self, **kwargs):
+        code_models.append(get_code_model(self, **kwargs))
+        return code_models[-1]
+
+    monkeypatch.setattr(CodeGenerator, "_create_code_model", _fail)
+    monkeypatch.setattr(CodeGenerator, "_get_code_model", _get)
+    generate_widgets({"namespace": "widgets"})
+    widget = next(iter(code_models[0].schemas.values()))
+    assert widget.name == "Widget"
+    assert widget.frozen
@@ -0,0 +1,59 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import os
+import socket
+import threading
+
+import pytest
+from autorest import VERSION
+from autorest.jsonrpc.daemon import HANDSHAKE, AutorestDaemon, _is_daemon_running
+from autorest.jsonrpc.stdstream import read_json, write_json
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Needs Unix sockets")
+
+
+def test_daemon_serves_several_connections(tmp_path):
+    socket_path = str(tmp_path / "daemon.sock")
+    daemon = AutorestDaemon(socket_path)
+    threading.Thread(target=daemon.serve_forever, daemon=True).start()
+    try:
+        assert _is_daemon_running(socket_path)
+        for request_id in range(2):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(socket_path)
+                with client.makefile("rb") as input_stream, client.makefile("wb") as output_stream:
+                    output_stream.write(f"{HANDSHAKE} {VERSION}\n".encode("utf-8"))
+                    output_stream.flush()
+                    assert input_stream.readline() == b"ok\n"
+                    write_json(
+                        {"jsonrpc": "2.0", "method": "GetPluginNames", "params": [], "id": request_id}, output_stream
+                    )
+                    response = read_json(input_stream)
+            assert response["id"] == request_id
+            assert "codegen" in response["result"]
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
+    assert not os.path.exists(socket_path)
+    assert not _is_daemon_running(socket_path)
+
+
+def test_daemon_refuses_other_versions(tmp_path):
+    socket_path = str(tmp_path / "daemon.sock")
+    daemon = AutorestDaemon(socket_path)
+    threading.Thread(target=daemon.serve_forever, daemon=True).start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            with client.makefile("rb") as input_stream, client.makefile("wb") as output_stream:
+                output_stream.write(f"{HANDSHAKE} 0.0.0-other\n".encode("utf-8"))
+                output_stream.flush()
+                assert input_stream.readline() == b"mismatch\n"
+                # and the connection is closed
+                assert input_stream.read() == b""
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
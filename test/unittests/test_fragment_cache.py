@@ -0,0 +1,69 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+from autorest import cache
+from autorest.codegen.serializers import fragment_cache
+from autorest.codegen.serializers.enum_serializer import EnumSerializer
+from autorest.codegen.serializers.model_base_serializer import ModelBaseSerializer
+from autorest.codegen.serializers.operation_group_serializer import OperationGroupSerializer
+
+
+@pytest.fixture
+def rendered(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VARIABLE, str(tmp_path / "cache"))
+    rendered_fragments = []
+
+    def _record(render_fragment):
+        def _render_and_record(self, element):
+            rendered_fragments.append(element.name)
+            return render_fragment(self, element)
+        return _render_and_record
+
+    monkeypatch.setattr(ModelBaseSerializer, "render_model", _record(ModelBaseSerializer.render_model))
+    monkeypatch.setattr(EnumSerializer, "render_enum", _record(EnumSerializer.render_enum))
+    monkeypatch.setattr(
+        OperationGroupSerializer, "render_operation", _record(OperationGroupSerializer.render_operation)
+    )
+    return rendered_fragments
+
+
+@pytest.fixture
+def generate_widgets(generate, widgets_code_model):
+    def _generate_widgets(gadget_description="A gadget."):
+        return generate(widgets_code_model("Widgets", gadget_description=gadget_description), {"namespace": "widgets"})
+
+    return _generate_widgets
+
+
+def test_cached_fragments_same_files(generate_widgets, rendered, monkeypatch):
+    generated = generate_widgets()
+    assert sorted(rendered) == ["Color", "Gadget", "Gadget", "Widget", "Widget", "get", "get"]
+
+    rendered.clear()
+    assert list(generate_widgets().items()) == list(generated.items())
+    assert rendered == []
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VARIABLE, "")
+    assert list(generate_widgets().items()) == list(generated.items())
+
+
+def test_changed_model_rendered_again(generate_widgets, rendered):
+    generate_widgets()
+    rendered.clear()
+
+    generated = generate_widgets(gadget_description="A better gadget.")
+    assert rendered == ["Gadget", "Gadget"]
+    assert "A better gadget." in generated["widgets/models/_models_py3.py"]
+
+
+def test_fragments_keyed_by_code(generate_widgets, rendered, monkeypatch):
+    generated = generate_widgets()
+    rendered.clear()
+
+    # as if the code computing what the templates render changed
+    monkeypatch.setattr(fragment_cache, "get_sources_hash", lambda package_name: "changed")
+    assert list(generate_widgets().items()) == list(generated.items())
+    assert sorted(rendered) == ["Color", "Gadget", "Gadget", "Widget", "Widget", "get", "get"]
@@ -0,0 +1,69 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import copy
+
+import pytest
+from autorest.codegen.models import AnySchema, Operation, Parameter
+from autorest.codegen.models.parameter import ParameterLocation
+from autorest.codegen.models.parameter_list import ParameterList
+
+
+def get_parameter(name, location):
+    return Parameter(
+        schema=AnySchema(namespace="freeze", yaml_data={}),
+        yaml_data={},
+        rest_api_name=name,
+        serialized_name=name,
+        description="Parameter to test freezing",
+        implementation="Method",
+        required=True,
+        location=location,
+        skip_url_encoding=False,
+        constraints=[],
+    )
+
+
+@pytest.fixture
+def parameter_list():
+    return ParameterList([get_parameter("name", ParameterLocation.Path), get_parameter("top", ParameterLocation.Query)])
+
+
+def test_properties_cached_once_frozen(parameter_list):
+    path = parameter_list.path
+    assert parameter_list.path is not path
+
+    parameter_list.freeze()
+    path = parameter_list.path
+    assert [p.rest_api_name for p in path] == ["name"]
+    assert parameter_list.path is path
+    assert [p.rest_api_name for p in parameter_list.query] == ["top"]
+
+
+def test_frozen_parameter_list_is_read_only(parameter_list):
+    parameter_list.freeze()
+    with pytest.raises(ValueError):
+        parameter_list.append(get_parameter("skip", ParameterLocation.Query))
+    with pytest.raises(ValueError):
+        del parameter_list[0]
+    with pytest.raises(AttributeError):
+        parameter_list.implementation = "Client"
+
+    parameter_list_copy = copy.deepcopy(parameter_list)
+    assert not parameter_list_copy.frozen
+    parameter_list_copy.append(get_parameter("skip", ParameterLocation.Query))
+    assert len(parameter_list_copy.query) == 2
+
+
+def test_frozen_operation(parameter_list):
+    operation = Operation(
+        yaml_data={}, name="get", description="", url="/", method="GET", multipart=False, api_versions=set(),
+        requests=[], parameters=parameter_list.parameters,
+    )
+    operation.freeze()
+    assert operation.parameters.frozen
+    assert operation.success_status_code is operation.success_status_code
+    with pytest.raises(AttributeError):
+        operation.responses = []
@@ -0,0 +1,61 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Heavy modules that are only imported by plugins, in the background or when autorest calls them
+_NOT_IMPORTED_ON_START = ["yaml", "jinja2", "black", "m2r", "asyncio", "multiprocessing", "autorest.codegen"]
+
+# Everything the server imports, besides the standard library
+_IMPORTED_ON_START = {
+    "autorest", "autorest._version", "autorest.jsonrpc", "autorest.jsonrpc.codec", "autorest.jsonrpc.stdstream",
+    "autorest.jsonrpc.server",
+}
+# Third party packages the server imports: the JSON-RPC library, and the optional JSON codecs
+_THIRD_PARTY_IMPORTED_ON_START = {"jsonrpc", "orjson", "ujson"}
+
+_ROOT_DIR = Path(__file__).parents[2]
+
+
+def _imported_modules(statement):
+    """Run the statement in a new interpreter, and return the modules imported, in the order of "-X importtime"."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(_ROOT_DIR), os.environ.get("PYTHONPATH", "")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env, cwd=str(_ROOT_DIR), stderr=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    return [
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "[us]" not in line
+    ]
+
+
+def _import_server():
+    """The modules importing the server imports, without the ones the interpreter imports when it starts."""
+    on_start = set(_imported_modules("pass"))
+    return [name for name in _imported_modules("import autorest.jsonrpc.server") if name not in on_start]
+
+
+@pytest.mark.skipif(not hasattr(sys, "stdlib_module_names"), reason="Needs the list of standard library modules")
+def test_server_imports_only_its_dependencies():
+    imported = _import_server()
+    assert {name for name in imported if name.split(".")[0] == "autorest"} <= _IMPORTED_ON_START
+    third_party = {
+        name.split(".")[0] for name in imported
+        if name.split(".")[0] not in sys.stdlib_module_names and not name.startswith("_sysconfigdata")
+    }
+    assert third_party <= _THIRD_PARTY_IMPORTED_ON_START | {"autorest"}
+
+
+def test_server_does_not_import_plugins():
+    imported = _import_server()
+    for module_name in _NOT_IMPORTED_ON_START:
+        assert module_name not in imported, f"{module_name} is imported when the server starts"
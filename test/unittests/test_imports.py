@@ -0,0 +1,95 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import copy
+
+from autorest.codegen.models import FileImport, ImportType, TypingSection
+from autorest.codegen.models.base_model import Freezable, cached_method_after_freeze
+from autorest.codegen.models.imports import _INTERNED_ENTRIES, interned_import_entries
+from autorest.codegen.serializers.import_serializer import FileImportSerializer
+
+
+def _file_import():
+    file_import = FileImport()
+    file_import.add_from_import("typing", "Any", ImportType.STDLIB, TypingSection.CONDITIONAL)
+    file_import.add_from_import("azure.core.exceptions", "map_error", ImportType.AZURECORE)
+    file_import.add_import("warnings", ImportType.STDLIB)
+    return file_import
+
+
+def test_nested_imports_in_insertion_order():
+    file_import = _file_import()
+    file_import.add_from_import("azure.core.exceptions", "HttpResponseError", ImportType.AZURECORE)
+    assert file_import.imports == {
+        TypingSection.CONDITIONAL: {ImportType.STDLIB: {"typing": {"Any"}}},
+        TypingSection.REGULAR: {
+            ImportType.AZURECORE: {"azure.core.exceptions": {"map_error", "HttpResponseError"}},
+            ImportType.STDLIB: {"warnings": {None}},
+        },
+    }
+    assert list(file_import.imports[TypingSection.REGULAR]) == [ImportType.AZURECORE, ImportType.STDLIB]
+    assert FileImport(file_import.imports) == file_import
+
+
+def test_merge_and_copies():
+    file_import = _file_import()
+    merged = FileImport()
+    merged.merge(file_import)
+    file_import_copy = copy.copy(file_import)
+    assert merged == file_import_copy == file_import
+
+    merged.add_from_import("typing", "Dict", ImportType.STDLIB, TypingSection.CONDITIONAL)
+    file_import_copy.merge(merged)
+    assert file_import_copy == merged
+    # updating a copy never updates the imports it was copied from
+    assert file_import == _file_import()
+    assert "Dict" not in file_import.imports[TypingSection.CONDITIONAL][ImportType.STDLIB]["typing"]
+
+
+def test_serializer_leaves_imports_unchanged():
+    file_import = _file_import()
+    file_import.add_from_import("azure.core.credentials", "TokenCredential", ImportType.AZURECORE, TypingSection.TYPING)
+
+    serialized = str(FileImportSerializer(file_import, is_python_3_file=True))
+    assert "from typing import Any, TYPE_CHECKING" in serialized
+    assert "    from azure.core.credentials import TokenCredential" in serialized
+    assert "TYPE_CHECKING" not in str(file_import.imports)
+    assert str(FileImportSerializer(file_import, is_python_3_file=True)) == serialized
+
+
+class _Model(Freezable):
+    def __init__(self):
+        self.calls = []
+
+    @cached_method_after_freeze
+    def imports(self, async_mode):
+        self.calls.append(async_mode)
+        return _file_import()
+
+
+def test_imports_cached_after_freeze():
+    model = _Model()
+    model.imports(False)
+    model.imports(False)
+    assert model.calls == [False, False]
+
+    model.freeze()
+    sync_imports = model.imports(False)
+    sync_imports.add_import("os", ImportType.STDLIB)
+    assert model.imports(False) == _file_import()
+    assert model.imports(async_mode=True) == _file_import()
+    assert model.calls == [False, False, False, True]
+
+
+def test_entries_interned_while_generating():
+    def _entry(file_import):
+        return next(iter(file_import._entries))
+
+    with interned_import_entries():
+        assert _entry(_file_import()) is _entry(_file_import())
+        assert _INTERNED_ENTRIES.get()
+    # the table goes away with the code model
+    assert _INTERNED_ENTRIES.get() is None
+    assert _entry(_file_import()) is not _entry(_file_import())
@@ -0,0 +1,30 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+from jinja2 import Environment
+from autorest.jinja_environment import create_environment, get_environment
+
+
+def _load_templates(env):
+    for template_name in env.list_templates():
+        env.get_template(template_name)
+
+
+def test_environment_shared():
+    assert get_environment("autorest.codegen") is get_environment("autorest.codegen")
+    assert get_environment("autorest.multiapi") is not get_environment("autorest.codegen")
+
+
+@pytest.mark.parametrize("package_name", ["autorest.codegen", "autorest.multiapi"])
+def test_compiled_templates_cached(tmp_path, monkeypatch, package_name):
+    _load_templates(create_environment(package_name, tmp_path))
+    assert any(tmp_path.iterdir())
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("Templates should be loaded from the bytecode cache")
+
+    monkeypatch.setattr(Environment, "compile", _fail)
+    _load_templates(create_environment(package_name, tmp_path))
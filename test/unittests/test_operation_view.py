@@ -0,0 +1,311 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+from autorest.codegen import CodeGenerator
+from autorest.codegen.serializers.operation_view import OperationView
+
+# an operation with a json and a binary request
+_CODE_MODEL = """
+info:
+  title: Widgets
+  description: ''
+language:
+  default:
+    name: Widgets
+    description: ''
+globalParameters:
+  - &ref_1
+    schema: &ref_0
+      type: string
+      language:
+        default:
+          name: string
+          description: ''
+    clientDefaultValue: http://localhost
+    implementation: Client
+    required: true
+    language:
+      default:
+        name: $host
+        description: server parameter
+        serializedName: $host
+    protocol:
+      http:
+        in: uri
+schemas:
+  strings:
+    - *ref_0
+  binaries:
+    - &ref_5
+      type: binary
+      language:
+        default:
+          name: binary
+          description: ''
+  constants:
+    - &ref_4
+      type: constant
+      value:
+        value: application/json
+      valueType: *ref_0
+      language:
+        default:
+          name: ApplicationJson
+          description: ''
+  sealedChoices:
+    - &ref_6
+      type: sealed-choice
+      choiceType: *ref_0
+      choices:
+        - value: application/octet-stream
+          language:
+            default:
+              name: ApplicationOctetStream
+              description: ''
+        - value: image/png
+          language:
+            default:
+              name: ImagePng
+              description: ''
+      language:
+        default:
+          name: ContentType
+          description: ''
+  objects:
+    - &ref_3
+      type: object
+      language:
+        default:
+          name: Widget
+          description: A widget.
+      properties:
+        - schema: *ref_0
+          serializedName: color
+          language:
+            default:
+              name: color
+              description: The color.
+operationGroups:
+  - $key: Widgets
+    language:
+      default:
+        name: Widgets
+        description: ''
+    operations:
+      - apiVersions:
+          - version: 2020-01-01
+        language:
+          default:
+            name: upload
+            description: Upload a widget.
+        parameters:
+          - *ref_1
+          - schema: *ref_0
+            implementation: Method
+            required: true
+            language:
+              default:
+                name: widget_name
+                description: The widget name.
+                serializedName: widgetName
+            protocol:
+              http:
+                in: path
+          - schema: *ref_0
+            implementation: Method
+            language:
+              default:
+                name: filter
+                description: The filter.
+                serializedName: $filter
+            protocol:
+              http:
+                in: query
+          - schema: *ref_0
+            implementation: Method
+            language:
+              default:
+                name: request_id
+                description: The request id.
+                serializedName: x-ms-request-id
+            protocol:
+              http:
+                in: header
+        requests:
+          - parameters:
+              - schema: *ref_4
+                implementation: Method
+                required: true
+                language:
+                  default:
+                    name: accept
+                    description: Accept header
+                    serializedName: Accept
+                protocol:
+                  http:
+                    in: header
+              - schema: *ref_3
+                implementation: Method
+                language:
+                  default:
+                    name: widget
+                    description: The widget.
+                protocol:
+                  http:
+                    in: body
+                    style: json
+              - schema: *ref_4
+                implementation: Method
+                required: true
+                language:
+                  default:
+                    name: content_type
+                    description: Body Parameter content-type
+                    serializedName: Content-Type
+                protocol:
+                  http:
+                    in: header
+            language:
+              default:
+                name: ''
+                description: ''
+            protocol:
+              http:
+                path: /widgets/{widgetName}
+                method: put
+                knownMediaType: json
+                mediaTypes:
+                  - application/json
+                  - text/json
+                uri: '{$host}'
+          - parameters:
+              - schema: *ref_4
+                implementation: Method
+                required: true
+                language:
+                  default:
+                    name: accept
+                    description: Accept header
+                    serializedName: Accept
+                protocol:
+                  http:
+                    in: header
+              - schema: *ref_5
+                implementation: Method
+                required: true
+                language:
+                  default:
+                    name: widget
+                    description: The widget.
+                protocol:
+                  http:
+                    in: body
+                    style: binary
+              - schema: *ref_6
+                implementation: Method
+                required: true
+                language:
+                  default:
+                    name: content_type
+                    description: Upload file type
+                    serializedName: Content-Type
+                protocol:
+                  http:
+                    in: header
+            language:
+              default:
+                name: ''
+                description: ''
+            protocol:
+              http:
+                path: /widgets/{widgetName}
+                method: put
+                knownMediaType: binary
+                binary: true
+                mediaTypes:
+                  - application/octet-stream
+                  - image/png
+                uri: '{$host}'
+        responses:
+          - schema: *ref_3
+            language:
+              default:
+                name: ''
+                description: ''
+            protocol:
+              http:
+                statusCodes:
+                  - '200'
+                mediaTypes:
+                  - application/json
+                knownMediaType: json
+          - language:
+              default:
+                name: ''
+                description: ''
+            protocol:
+              http:
+                statusCodes:
+                  - '204'
+        exceptions:
+          - schema: *ref_3
+            language:
+              default:
+                name: ''
+                description: ''
+            protocol:
+              http:
+                statusCodes:
+                  - '404'
+                  - '500'
+                mediaTypes:
+                  - application/json
+                knownMediaType: json
+"""
+
+
+pytestmark = pytest.mark.usefixtures("no_cache")
+
+
+@pytest.fixture
+def autorestapi(named_autorestapi):
+    return named_autorestapi(_CODE_MODEL, {"namespace": "widgets"})
+
+
+def test_operation_view(autorestapi):
+    code_generator = CodeGenerator(autorestapi)
+    code_model = code_generator._create_code_model(
+        autorestapi.read_yaml("code-model-v4-no-tags.yaml"), code_generator._build_code_model_options()
+    )
+    view = OperationView(code_model, code_model.operation_groups[0].operations[0])
+
+    assert view.return_type_annotation() == 'Optional["_models.Widget"]'
+    assert view.return_type_annotation(["LROPoller", "ItemPaged"]) == (
+        'LROPoller[ItemPaged[Optional["_models.Widget"]]]'
+    )
+    assert view.response_docstring_type == "~widgets.models.Widget"
+    assert view.content_type_constant.constant_declaration == '"application/json"'
+    assert view.request_media_types == ["application/json", "text/json", "application/octet-stream", "image/png"]
+    assert view.error_map == [
+        "401: ClientAuthenticationError",
+        "409: ResourceExistsError",
+        "404: lambda response: ResourceNotFoundError("
+        "response=response, model=self._deserialize(_models.Widget, response))",
+        "500: lambda response: HttpResponseError(response=response, model=self._deserialize(_models.Widget, response))",
+    ]
+    assert [call for _, call in view.query_parameters] == ["""self._serialize.query("filter", filter, 'str')"""]
+    assert view.next_operation is None
+
+
+def test_operation_rendered_from_view(autorestapi):
+    assert CodeGenerator(autorestapi).process()
+    operations = autorestapi.generated_files()["widgets/operations/_widgets_operations.py"]
+    assert """Default value is "application/json".
+         Allowed values are: "application/json", "text/json", "application/octet-stream", "image/png".""" in operations
+    assert """            409: ResourceExistsError,
+            404: lambda response: ResourceNotFoundError(""" in operations
+    assert "\"['application/json', 'text/json', 'application/octet-stream', 'image/png']\".format(" in operations
+    assert "        # type: (...) -> Optional[\"_models.Widget\"]" in operations
@@ -0,0 +1,111 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import json
+import os
+from pathlib import Path
+
+import black
+import pytest
+from autorest import cache
+from autorest.codegen import serializers
+from autorest.manifest import MANIFEST_FILE_NAME
+from autorest.pipeline import PipelineAutorestAPI, run_pipeline
+
+_VALUES = {"namespace": "widgets.client", "package-version": "1.0.0"}
+
+pytestmark = pytest.mark.usefixtures("no_cache")
+
+
+@pytest.fixture
+def code_model(widgets_code_model):
+    return widgets_code_model(models=False)
+
+
+def _generate_old_files(code_model, output_folder, values):
+    assert run_pipeline(code_model, str(output_folder), values)
+    files = [path for path in output_folder.rglob("*") if path.is_file()]
+    for path in files:
+        os.utime(path, ns=(0, 0))
+    return files
+
+
+def _new_files(files):
+    return sorted(path.name for path in files if not path.exists() or path.stat().st_mtime_ns != 0)
+
+
+def _fail_to_format(monkeypatch):
+    def _fail(*args, **kwargs):
+        raise AssertionError("Unchanged files should not be formatted again")
+
+    monkeypatch.setattr(black, "format_file_contents", _fail)
+
+
+def test_unchanged_files_not_written_again(code_model, tmp_path, monkeypatch):
+    files = _generate_old_files(code_model, tmp_path, _VALUES)
+    manifest = json.loads((tmp_path / MANIFEST_FILE_NAME).read_text())
+    assert sorted(manifest["files"]) == ["widgets/__init__.py", "widgets/client/__init__.py",
+                                         "widgets/client/_version.py", "widgets/client/py.typed"]
+    # only Python files are formatted
+    assert all(("formatted" in entry) == name.endswith(".py") for name, entry in manifest["files"].items())
+
+    _fail_to_format(monkeypatch)
+    assert run_pipeline(code_model, str(tmp_path), _VALUES)
+    assert _new_files(files) == []
+
+
+def test_changed_files_written_again(code_model, tmp_path):
+    files = _generate_old_files(code_model, tmp_path, _VALUES)
+    (tmp_path / "widgets" / "client" / "py.typed").unlink()
+
+    assert run_pipeline(code_model, str(tmp_path), _VALUES)
+    assert _new_files(files) == ["py.typed"]
+
+    # with other options, every file is written again
+    assert run_pipeline(code_model, str(tmp_path), dict(_VALUES, **{"package-version": "2.0.0"}))
+    assert _new_files(files) == sorted(path.name for path in files)
+
+
+def test_edited_files_written_again(code_model, tmp_path):
+    files = _generate_old_files(code_model, tmp_path, _VALUES)
+    version_file = tmp_path / "widgets" / "client" / "_version.py"
+    version = version_file.read_text()
+    version_file.write_text(version + "# edited\n")
+    os.utime(version_file, ns=(0, 0))
+
+    assert run_pipeline(code_model, str(tmp_path), _VALUES)
+    assert _new_files(files) == ["_version.py"]
+    assert version_file.read_text() == version
+
+
+def test_no_manifest_with_clear_output_folder(code_model, tmp_path):
+    values = dict(_VALUES, **{"clear-output-folder": True})
+    files = _generate_old_files(code_model, tmp_path, values)
+    assert not (tmp_path / MANIFEST_FILE_NAME).exists()
+
+    assert run_pipeline(code_model, str(tmp_path), values)
+    assert _new_files(files) == sorted(path.name for path in files)
+
+
+def test_large_files_streamed(widgets_code_model, tmp_path, monkeypatch):
+    monkeypatch.setattr(serializers, "_STREAMED_FILE_SIZE", 100)
+    streamed = {}
+    write_file_stream = PipelineAutorestAPI.write_file_stream
+
+    def _write_file_stream(self, filename, file_chunks):
+        file_chunks = list(file_chunks)
+        streamed[Path(filename).as_posix()] = "".join(file_chunks)
+        write_file_stream(self, filename, file_chunks)
+
+    monkeypatch.setattr(PipelineAutorestAPI, "write_file_stream", _write_file_stream)
+    assert run_pipeline(widgets_code_model("Widgets"), str(tmp_path), _VALUES, black=False)
+    assert "widgets/client/models/_models_py3.py" in streamed
+    assert "widgets/client/operations/_widgets_operations.py" in streamed
+
+    # streamed files are recorded with the hash of their content
+    manifest = json.loads((tmp_path / MANIFEST_FILE_NAME).read_text())
+    for name, file_content in streamed.items():
+        assert manifest["files"][name]["generated"] == cache.hash_content(file_content)
+        assert (tmp_path / name).read_text() == file_content
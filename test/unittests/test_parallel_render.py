@@ -0,0 +1,28 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+
+pytestmark = pytest.mark.usefixtures("no_cache")
+
+
+@pytest.fixture
+def code_model(widgets_code_model):
+    return widgets_code_model("Widgets", "Gadgets", "Gizmos")
+
+
+def test_parallel_render_same_files_in_same_order(generate, code_model):
+    generated = generate(code_model, {"namespace": "widgets"})
+    assert "widgets/aio/operations/_gizmos_operations.py" in generated
+    assert "widgets/models/_widgets_enums.py" in generated
+
+    generated_in_parallel = generate(code_model, {"namespace": "widgets", "jobs": "2"})
+    assert list(generated_in_parallel.items()) == list(generated.items())
+
+
+@pytest.mark.parametrize("jobs", ["0", "two"])
+def test_invalid_jobs(generate, code_model, jobs):
+    with pytest.raises(ValueError):
+        generate(code_model, {"namespace": "widgets", "jobs": jobs})
@@ -0,0 +1,68 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import multiprocessing
+import threading
+
+from autorest.jsonrpc.localapi import LocalAutorestAPI
+from autorest.jsonrpc.pipeapi import PipeAutorestAPI, serve_pipe
+
+
+def test_forward_calls_to_parent():
+    parent_api = LocalAutorestAPI(reachable_files=["code-model-v4-no-tags.yaml"])
+    parent_api.values = {"namespace": "foo.bar"}
+    parent_pipe, child_pipe = multiprocessing.Pipe()
+
+    def _worker():
+        worker_api = PipeAutorestAPI(child_pipe)
+        try:
+            assert worker_api.list_inputs() == ["code-model-v4-no-tags.yaml"]
+            assert worker_api.get_value("namespace") == "foo.bar"
+            assert worker_api.get_boolean_value("nothere", True) is True
+        finally:
+            worker_api.close()
+            worker_api.done(True)
+
+    thread = threading.Thread(target=_worker)
+    thread.start()
+    try:
+        assert serve_pipe(parent_pipe, parent_api) is True
+    finally:
+        thread.join()
+        parent_api.close()
+
+
+def test_worker_died():
+    parent_pipe, child_pipe = multiprocessing.Pipe()
+    child_pipe.close()
+    parent_api = LocalAutorestAPI()
+    try:
+        assert serve_pipe(parent_pipe, parent_api) is False
+    finally:
+        parent_api.close()
+
+
+def test_unknown_method_answered():
+    parent_api = LocalAutorestAPI()
+    parent_pipe, child_pipe = multiprocessing.Pipe()
+
+    def _worker():
+        worker_api = PipeAutorestAPI(child_pipe)
+        answered = False
+        try:
+            worker_api._call("delete_everything")
+        except ValueError:
+            answered = True
+        finally:
+            worker_api.close()
+            worker_api.done(answered)
+
+    thread = threading.Thread(target=_worker)
+    thread.start()
+    try:
+        assert serve_pipe(parent_pipe, parent_api) is True
+    finally:
+        thread.join()
+        parent_api.close()
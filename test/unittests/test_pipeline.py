@@ -0,0 +1,53 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+from autorest.namer import Namer
+from autorest.pipeline import PipelineAutorestAPI, _parse_values
+
+@pytest.fixture
+def code_model(widgets_code_model):
+    return widgets_code_model(models=False)
+
+
+def test_code_model_parsed_once(code_model, tmp_path):
+    api = PipelineAutorestAPI(code_model, str(tmp_path), {})
+    try:
+        yaml_data = api.read_yaml("code-model-v4-no-tags.yaml")
+        assert Namer(api).process()
+        # the plugin got the same tree, and gave it back without dumping it
+        assert api.read_yaml("code-model-v4-no-tags.yaml") is yaml_data
+        assert yaml_data["info"]["python_title"] == "widgets"
+        assert "python_title: widgets" in api.read_file("code-model-v4-no-tags.yaml")
+    finally:
+        api.close()
+
+
+def test_files_kept_in_memory(code_model, tmp_path):
+    (tmp_path / "previous.py").write_text("# previous run")
+    api = PipelineAutorestAPI(code_model, str(tmp_path / "out"), {})
+    api._output_folder = tmp_path
+    try:
+        api.write_file_stream("package/models.py", ["class A:\n", "    pass\n"])
+        assert not (tmp_path / "package").exists()
+        assert api.read_file("package/models.py") == "class A:\n    pass\n"
+        assert api.read_file("previous.py") == "# previous run"
+        assert api.read_file("missing.py") is None
+        assert api.generated_files() == {"package/models.py": "class A:\n    pass\n"}
+
+        api.write_to_disk()
+        assert (tmp_path / "package" / "models.py").read_text() == "class A:\n    pass\n"
+    finally:
+        api.close()
+
+
+def test_parse_values():
+    assert _parse_values(["--azure-arm", "--namespace=foo.bar", "--header-text="]) == {
+        "azure-arm": {},
+        "namespace": "foo.bar",
+        "header-text": "",
+    }
+    with pytest.raises(ValueError):
+        _parse_values(["azure-arm"])
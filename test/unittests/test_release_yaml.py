@@ -0,0 +1,181 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+from autorest.codegen import CodeGenerator
+from autorest.codegen.models import BaseModel, LROOperation, Operation, PagingOperation
+from autorest.codegen.models.code_model import _model_attribute_values
+from autorest import yaml_loader
+
+
+def _language(name):
+    return {"default": {"name": name, "description": f"The {name}."}}
+
+
+def _parameter(name, schema, location, implementation="Method", **kwargs):
+    parameter = {
+        "schema": schema,
+        "implementation": implementation,
+        "required": True,
+        "language": {"default": dict(_language(name)["default"], serializedName=name)},
+        "protocol": {"http": {"in": location}},
+    }
+    parameter.update(kwargs)
+    return parameter
+
+
+def _response(schema=None, status_code="200"):
+    response = {
+        "protocol": {"http": {"statusCodes": [status_code], "mediaTypes": ["application/json"], "knownMediaType": "json"}},
+        "language": _language(""),
+    }
+    if schema:
+        response["schema"] = schema
+    return response
+
+
+def _operation(name, path, method, parameters, responses, extensions=None, body=None):
+    http = {"path": path, "method": method, "uri": "{$host}"}
+    if body:
+        http.update({"mediaTypes": ["application/json"], "knownMediaType": "json"})
+    operation = {
+        "apiVersions": [{"version": "2020-01-01"}],
+        "language": _language(name),
+        "parameters": parameters,
+        "requests": [{"parameters": [body] if body else [], "protocol": {"http": http}, "language": _language("")}],
+        "responses": responses,
+        "exceptions": [],
+    }
+    if extensions:
+        operation["extensions"] = extensions
+    return operation
+
+
+def _code_model():
+    string = {"type": "string", "language": _language("string")}
+    api_version = {
+        "type": "constant",
+        "value": {"value": "2020-01-01", "language": _language("ApiVersion")},
+        "valueType": string,
+        "language": _language("ApiVersion"),
+    }
+    color = {
+        "type": "choice",
+        "choiceType": string,
+        "choices": [{"value": "red", "language": _language("red")}],
+        "language": _language("Color"),
+    }
+    resource = {
+        "type": "object",
+        "language": _language("Resource"),
+        "properties": [{"schema": string, "serializedName": "id", "language": _language("id"), "readOnly": True}],
+    }
+    widget = {
+        "type": "object",
+        "language": _language("Widget"),
+        "parents": {"immediate": [resource], "all": [resource]},
+        "properties": [{"schema": color, "serializedName": "color", "language": _language("color")}],
+    }
+    widgets = {"type": "array", "elementType": widget, "language": _language("WidgetArray")}
+    widget_list = {
+        "type": "object",
+        "language": _language("WidgetList"),
+        "properties": [
+            {"schema": widgets, "serializedName": "value", "language": _language("value")},
+            {"schema": string, "serializedName": "nextLink", "language": _language("nextLink")},
+        ],
+    }
+
+    host = _parameter("$host", string, "uri", implementation="Client", clientDefaultValue="http://localhost")
+    parameters = [host, _parameter("api-version", api_version, "query")]
+    next_link = _parameter("nextLink", string, "path", extensions={"x-ms-skip-url-encoding": True})
+    list_next = _operation("listNext", "{nextLink}", "get", parameters + [next_link], [_response(widget_list)])
+    list_widgets = _operation(
+        "list", "/widgets", "get", parameters, [_response(widget_list)],
+        extensions={"x-ms-pageable": {"nextLinkName": "nextLink", "itemName": "value"}},
+    )
+    list_widgets["language"]["default"]["paging"] = {"nextLinkOperation": list_next}
+    create = _operation(
+        "create", "/widgets/{name}", "put", parameters + [_parameter("name", string, "path")],
+        [_response(widget), _response(widget, "201")],
+        extensions={"x-ms-long-running-operation": True},
+        body=_parameter("widget", widget, "body"),
+    )
+    return {
+        "info": {"title": "Widgets", "description": "Widgets client"},
+        "language": _language("Widgets"),
+        "globalParameters": [host],
+        "schemas": {
+            "strings": [string],
+            "constants": [api_version],
+            "choices": [color],
+            "objects": [resource, widget, widget_list],
+            "arrays": [widgets],
+        },
+        "operationGroups": [{
+            "$key": "Widgets",
+            "language": _language("Widgets"),
+            "operations": [_operation("get", "/widgets", "get", parameters, [_response(widget)]), list_widgets, list_next, create],
+        }],
+    }
+
+
+def _yaml_ids(yaml_data):
+    ids = set()
+    stack = [yaml_data]
+    while stack:
+        value = stack.pop()
+        if id(value) in ids:
+            continue
+        ids.add(id(value))
+        children = value.values() if isinstance(value, dict) else value
+        stack.extend(child for child in children if isinstance(child, (dict, list)))
+    return ids
+
+
+@pytest.fixture
+def autorestapi(named_autorestapi):
+    return named_autorestapi(yaml_loader.dump(_code_model()), {"namespace": "widgets"})
+
+
+def test_no_model_references_yaml(autorestapi):
+    yaml_data = autorestapi.read_yaml("code-model-v4-no-tags.yaml")
+    code_generator = CodeGenerator(autorestapi)
+    code_model = code_generator._create_code_model(yaml_data, code_generator._build_code_model_options())
+    assert [type(o) for o in code_model.operation_groups[0].operations] == [
+        Operation, PagingOperation, Operation, LROOperation
+    ]
+
+    yaml_ids = _yaml_ids(yaml_data)
+    seen = set()
+    stack = [code_model]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        assert id(value) not in yaml_ids, f"{value!r} is still part of the YAML"
+        if isinstance(value, BaseModel):
+            assert value.yaml_data == {}
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stack.extend(value)
+        elif type(value).__module__.startswith("autorest"):
+            stack.extend(_model_attribute_values(value))
+    assert len(seen) > 50
+
+
+def test_yaml_ids_released(autorestapi):
+    yaml_data = autorestapi.read_yaml("code-model-v4-no-tags.yaml")
+    code_generator = CodeGenerator(autorestapi)
+    code_model = code_generator._create_code_model(yaml_data, code_generator._build_code_model_options())
+
+    # the schemas are still there, only their index by yaml id is gone
+    assert sorted(code_model.schemas.values(), key=id) == sorted(code_model.sorted_schemas, key=id)
+    schema_yaml = yaml_data["schemas"]["objects"][0]
+    with pytest.raises(RuntimeError, match="released"):
+        code_model.lookup_schema(id(schema_yaml))
+    assert [operation_group.operations_by_id for operation_group in code_model.operation_groups] == [{}]
@@ -0,0 +1,99 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import copy
+
+import pytest
+from autorest.codegen.models import CodeModel, ObjectSchema, SchemaRegistry, build_schema
+
+
+def _language(name):
+    return {"python": {"name": name, "description": ""}, "default": {"name": name, "description": ""}}
+
+
+def _object_schemas_yaml(count):
+    """Object schemas with a string property and a property referencing the previous schema."""
+    string_schema = {"type": "string", "language": _language("string")}
+    schemas = []
+    for i in range(count):
+        properties = [{"schema": string_schema, "serializedName": "name", "language": _language("name")}]
+        if schemas:
+            properties.append({"schema": schemas[-1], "serializedName": "previous", "language": _language("previous")})
+        schemas.append({"type": "object", "properties": properties, "language": _language(f"Model{i}")})
+    return schemas
+
+
+def _build(schemas_yaml):
+    code_model = CodeModel(options={})
+    for schema_yaml in schemas_yaml:
+        build_schema(yaml_data=schema_yaml, code_model=code_model)
+    return code_model
+
+
+def test_lookup_by_id_and_name():
+    schemas_yaml = _object_schemas_yaml(3)
+    code_model = _build(schemas_yaml)
+    registry = code_model.schema_registry
+
+    model = registry.lookup(id(schemas_yaml[1]))
+    assert model is code_model.lookup_schema(id(schemas_yaml[1]))
+    assert registry.lookup_by_name("Model1") is model
+    assert model.properties[1].schema is registry.lookup(id(schemas_yaml[0]))
+    # the shared string schema is created once
+    assert len(code_model.schemas) == 3
+    assert len(code_model.primitives) == 1
+    assert len(registry) == 4
+    with pytest.raises(KeyError):
+        code_model.lookup_schema(0)
+
+
+def test_views_can_be_replaced():
+    code_model = _build(_object_schemas_yaml(2))
+    pet = ObjectSchema(namespace="namespace", yaml_data={}, name="Pet")
+    code_model.schemas = {1: pet}
+    assert code_model.schemas == {1: pet}
+    assert code_model.lookup_schema(1) is pet
+    assert len(code_model.schema_registry) == 2
+
+
+def test_build_schema_does_not_scan_the_registry(monkeypatch):
+    # a schema referencing another one finds it by yaml id, building stays linear in the number of schemas
+    def _fail(*args):
+        raise AssertionError("Schemas should be looked up by yaml id, without scanning the registry")
+
+    monkeypatch.setattr(SchemaRegistry, "__iter__", _fail)
+    monkeypatch.setattr(SchemaRegistry, "lookup_by_name", _fail)
+    schemas_yaml = _object_schemas_yaml(100)
+    code_model = _build(schemas_yaml)
+    assert len(code_model.schemas) == 100
+    assert code_model.lookup_schema(id(schemas_yaml[-1])).properties[1].schema is code_model.lookup_schema(
+        id(schemas_yaml[-2])
+    )
+
+
+def test_primitive_schemas_interned():
+    string_yaml = {"type": "string", "language": _language("name")}
+    code_model = _build([
+        string_yaml,
+        {"type": "string", "language": _language("description")},
+        {"type": "string", "maxLength": 10, "language": _language("name")},
+    ])
+    registry = code_model.schema_registry
+    assert len(registry) == 3
+    assert len({id(schema) for schema in code_model.primitives.values()}) == 2
+    assert registry.lookup(id(string_yaml)).yaml_data is string_yaml
+    # compact instances, without a __dict__
+    assert not hasattr(registry.lookup(id(string_yaml)), "__dict__")
+
+
+def test_frozen_object_schema_copy():
+    code_model = _build(_object_schemas_yaml(2))
+    model = code_model.schema_registry.lookup_by_name("Model1")
+    model.freeze()
+    model_copy = copy.deepcopy(model)
+    assert not model_copy.frozen
+    assert model_copy.name == "Model1"
+    assert [p.name for p in model_copy.properties] == ["name", "previous"]
+    assert model_copy.properties[0].schema.namespace == model.namespace
@@ -0,0 +1,84 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import contextvars
+import logging
+import threading
+from concurrent.futures import Future
+
+from autorest.jsonrpc import server
+
+_LOGGER = logging.getLogger("autorest.test_server")
+
+
+class FakeConnection:
+    """A connection to autorest that records, per session, the messages sent."""
+
+    def __init__(self):
+        self.messages = {}
+        self.responses = []
+        self._lock = threading.Lock()
+
+    def call(self, method, params):
+        return None
+
+    def send_request(self, method, params):
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def send_notification(self, method, params):
+        self.send_notifications(method, [params])
+
+    def send_notifications(self, method, params_list):
+        with self._lock:
+            for session_id, message in params_list:
+                self.messages.setdefault(session_id, []).append(message["Text"])
+
+    def write(self, data):
+        with self._lock:
+            self.responses.append(data)
+
+
+def test_overlapping_sessions_get_their_own_records(monkeypatch):
+    # both sessions are running when the records are logged
+    barrier = threading.Barrier(2, timeout=10)
+
+    class FakePlugin:
+        def __init__(self, autorestapi):
+            self._session_id = autorestapi.session_id
+
+        def process(self):
+            _LOGGER.info("Start %s", self._session_id)
+            barrier.wait()
+            helper = threading.Thread(
+                target=contextvars.copy_context().run, args=(_LOGGER.info, "Helper %s", self._session_id)
+            )
+            helper.start()
+            helper.join()
+            barrier.wait()
+            _LOGGER.info("End %s", self._session_id)
+            return True
+
+    monkeypatch.setattr(server, "_load_plugin", lambda plugin_name: FakePlugin)
+    connection = FakeConnection()
+    sessions = [
+        threading.Thread(
+            target=server._handle_message,
+            args=(connection, {"jsonrpc": "2.0", "method": "Process", "params": ["fake", session_id], "id": index}),
+        )
+        for index, session_id in enumerate(("first", "second"))
+    ]
+    for session in sessions:
+        session.start()
+    for session in sessions:
+        session.join()
+
+    assert sorted(response["result"] for response in connection.responses) == [True, True]
+    for session_id in ("first", "second"):
+        texts = [text for text in connection.messages[session_id] if "test_server" in text]
+        assert [text.split("] ")[1] for text in texts] == [
+            f"Start {session_id}", f"Helper {session_id}", f"End {session_id}"
+        ]
@@ -5,7 +5,8 @@
 # --------------------------------------------------------------------------
 
 import pytest
-from autorest.codegen.models import CodeModel, ObjectSchema
+from autorest.codegen.models import CodeModel, ObjectSchema, Property
+from autorest.codegen.models.primitive_schemas import get_primitive_schema
 
 @pytest.fixture
 def code_model():
@@ -72,3 +73,48 @@ def test_multiple_inheritance(code_model):
     assert sorted_schemas.index(employee) < sorted_schemas.index(teacher)
     # assert person is before kid
     assert sorted_schemas.index(person) < sorted_schemas.index(kid)
+
+def test_deep_inheritance(code_model):
+    """Model0 <- Model1 <- ... <- Model4999, deeper than the recursion limit
+    """
+    schemas = [get_object_schema("Model0", [])]
+    for i in range(1, 5000):
+        schemas.append(get_object_schema(f"Model{i}", [schemas[-1]]))
+    code_model.schemas = get_schemas_in_dict_form(reversed(schemas))
+    code_model.sort_schemas()
+    assert code_model.sorted_schemas == schemas
+
+def test_duplicate_schema_name(code_model):
+    pet = get_object_schema("Pet", [])
+    code_model.schemas = get_schemas_in_dict_form(
+        [pet, get_object_schema("Cat", [pet]), get_object_schema("Cat", [])]
+    )
+    with pytest.raises(ValueError):
+        code_model.sort_schemas()
+
+def test_properties_and_exceptions_from_inheritance(code_model):
+    """Resource <- TrackedResource <- VirtualMachine
+    """
+    def _property(name):
+        schema = get_primitive_schema(namespace="namespace", yaml_data={"type": "string"})
+        return Property(yaml_data={}, name=name, schema=schema, original_swagger_name=name, description=name)
+
+    resource_id = _property("id")
+    resource = get_object_schema("Resource", [])
+    resource.properties = [resource_id, _property("name")]
+    resource.is_exception = True
+    location = _property("location")
+    tracked_resource = get_object_schema("TrackedResource", [resource.id])
+    tracked_resource.properties = [location]
+    vm_name = _property("name")
+    vm = get_object_schema("VirtualMachine", [tracked_resource.id])
+    vm.properties = [vm_name]
+    code_model.schemas = {schema.id: schema for schema in [vm, tracked_resource, resource]}
+
+    code_model.add_inheritance_to_models()
+    assert vm.base_models == [tracked_resource]
+    # parent properties first, own properties override the ones of the parents
+    assert [p.name for p in vm.properties] == ["id", "location", "name"]
+    assert vm.properties[0] is resource_id and vm.properties[2] is vm_name
+    assert [p.name for p in tracked_resource.properties] == ["id", "name", "location"]
+    assert vm.is_exception and tracked_resource.is_exception
@@ -0,0 +1,169 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import pytest
+from autorest.jsonrpc import Channel, codec
+from autorest.jsonrpc.stdstream import (
+    read_message, write_message, read_json, write_json, StdStreamConnection, StdStreamAutorestAPI
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FakeAutorest:
+    """Answer requests in reverse order of arrival, once "batch_size" requests are received."""
+
+    def __init__(self, batch_size):
+        plugin_read, self._autorest_write = os.pipe()
+        self._autorest_read, plugin_write = os.pipe()
+        self.connection = StdStreamConnection(os.fdopen(plugin_read, "rb"), os.fdopen(plugin_write, "wb"))
+        self._input = os.fdopen(self._autorest_read, "rb")
+        self._output = os.fdopen(self._autorest_write, "wb")
+        self.batch_size = batch_size
+        self.received = []
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        batch = []
+        while True:
+            try:
+                data = json.loads(read_message(self._input))
+            except ValueError:
+                return
+            self.received.append(data)
+            if "id" not in data:
+                continue
+            batch.append(data)
+            if len(batch) == self.batch_size:
+                for request in reversed(batch):
+                    result = "{}:{}".format(request["method"], request["params"][1])
+                    write_message(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result}), self._output)
+                batch = []
+
+    def send_request(self, method, params):
+        write_message(json.dumps({"jsonrpc": "2.0", "method": method, "params": params, "id": 1}), self._output)
+
+
+def test_responses_routed_by_id():
+    autorest = FakeAutorest(batch_size=3)
+    api = StdStreamAutorestAPI("session", connection=autorest.connection)
+    try:
+        assert api.read_files(["a.py", "b.py", "c.py"]) == ["ReadFile:a.py", "ReadFile:b.py", "ReadFile:c.py"]
+        ids = [request["id"] for request in autorest.received if request["method"] == "ReadFile"]
+        assert len(set(ids)) == 3
+    finally:
+        api.close()
+
+
+def test_async_calls_in_flight():
+    autorest = FakeAutorest(batch_size=2)
+    api = StdStreamAutorestAPI("session", connection=autorest.connection)
+
+    async def _gather():
+        return await asyncio.gather(api.get_value_async("namespace"), api.read_file_async("x.yaml"))
+
+    try:
+        assert asyncio.run(_gather()) == ["GetValue:namespace", "ReadFile:x.yaml"]
+    finally:
+        api.close()
+
+
+def test_incoming_requests_are_queued():
+    autorest = FakeAutorest(batch_size=1)
+    autorest.send_request("Process", ["codegen", "session"])
+    request = autorest.connection.next_request()
+    assert request["method"] == "Process"
+    assert autorest.connection.call("GetValue", ["session", "foo"]) == "GetValue:foo"
+
+
+def test_closed_stream_fails_pending():
+    autorest = FakeAutorest(batch_size=2)
+    future = autorest.connection.send_request("GetValue", ["session", "foo"])
+    autorest._output.close()
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+    with pytest.raises(ValueError):
+        autorest.connection.next_request()
+
+
+def test_message_with_unicode_round_trip():
+    stream = io.BytesIO()
+    write_message(json.dumps({"text": "h\u00e9llo \u2603"}), stream)
+    write_json({"text": "h\u00e9llo \u2603"}, stream)
+    stream.seek(0)
+    assert json.loads(read_message(stream)) == {"text": "h\u00e9llo \u2603"}
+    assert read_json(stream) == {"text": "h\u00e9llo \u2603"}
+
+
+def test_truncated_message():
+    stream = io.BytesIO(b"Content-Length: 10\r\n\r\n{}")
+    with pytest.raises(ValueError):
+        read_json(stream)
+
+
+@pytest.mark.parametrize("module_name", ["orjson", "ujson"])
+def test_codec_fallback(monkeypatch, module_name):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    if module_name == "ujson":
+        monkeypatch.setitem(sys.modules, "ujson", None)
+    name, loads, dumps = codec._load_codec()
+    assert name != module_name
+    assert loads(memoryview(dumps({"a": ["\u2603", 1, None]}))) == {"a": ["\u2603", 1, None]}
+
+
+@pytest.mark.parametrize("size", [1024, 1024 * 1024, 50 * 1024 * 1024], ids=["1KB", "1MB", "50MB"])
+def test_framing_benchmark(size):
+    message = {"jsonrpc": "2.0", "method": "WriteFile", "params": ["session", "file.py", "x" * size, None]}
+    stream = io.BytesIO()
+
+    start = time.perf_counter()
+    write_json(message, stream)
+    written = time.perf_counter()
+    stream.seek(0)
+    assert read_json(stream) == message
+    read = time.perf_counter()
+
+    _LOGGER.info(
+        "%s: %d bytes written in %.4fs, read in %.4fs", codec.CODEC_NAME, size, written - start, read - written
+    )
+
+
+def test_write_file_stream():
+    autorest = FakeAutorest(batch_size=1)
+    api = StdStreamAutorestAPI("session", connection=autorest.connection)
+    try:
+        chunks = ["class A:\n", '    """Caf\u00e9 \\ "quoted"."""\n', "", "    pass\n"]
+        api.write_file_stream("a.py", iter(chunks))
+        # a request after the notification, to know the notification has been read
+        api.read_file("b.py")
+        write_file = next(request for request in autorest.received if request["method"] == "WriteFile")
+        assert write_file["params"] == ["session", "a.py", "".join(chunks), None]
+    finally:
+        api.close()
+
+
+def test_messages_sent_together():
+    autorest = FakeAutorest(batch_size=1)
+    api = StdStreamAutorestAPI("session", connection=autorest.connection)
+    try:
+        api.messages([(Channel.Warning, "first"), (Channel.Debug, "second")])
+        api.read_file("b.py")
+        messages = [request["params"] for request in autorest.received if request["method"] == "Message"]
+        assert messages == [
+            ["session", {"Channel": "warning", "Text": "first"}],
+            ["session", {"Channel": "debug", "Text": "second"}],
+        ]
+    finally:
+        api.close()
@@ -0,0 +1,56 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+from autorest.codegen.models import LROOperation, Operation, PagingOperation
+from autorest.codegen.models.lro_paging_operation import LROPagingOperation
+from autorest.codegen.yaml_index import YamlIndex
+
+
+def _schema(name):
+    return {"type": "object", "language": {"default": {"name": name}}}
+
+
+@pytest.fixture
+def yaml_data():
+    cloud_error = _schema("CloudError")
+    error = _schema("Error")
+    return {
+        "schemas": {
+            "strings": [{"type": "string", "language": {"default": {"name": "string"}}}],
+            "objects": [_schema("Widget"), cloud_error, error],
+        },
+        "operationGroups": [{
+            "operations": [
+                {"exceptions": [{"schema": cloud_error}, {"schema": error}, {}]},
+                {"extensions": {"x-ms-pageable": {"nextLinkName": "nextLink"}}},
+                {"extensions": {"x-ms-long-running-operation": True}},
+                {"extensions": {"x-ms-pageable": {"nextLinkName": "nextLink"}, "x-ms-long-running-operation": True}},
+            ]
+        }],
+    }
+
+
+def test_index(yaml_data):
+    index = YamlIndex.from_yaml(yaml_data)
+    operations = yaml_data["operationGroups"][0]["operations"]
+    objects = yaml_data["schemas"]["objects"]
+
+    assert index.schemas == yaml_data["schemas"]["strings"] + objects
+    assert index.exceptions_set == {id(objects[1]), id(objects[2])}
+    assert [index.operation_classes[id(o)] for o in operations] == [
+        Operation, PagingOperation, LROOperation, LROPagingOperation
+    ]
+
+
+def test_remove_cloud_errors(yaml_data):
+    cloud_error, error = yaml_data["schemas"]["objects"][1:]
+    exceptions = yaml_data["operationGroups"][0]["operations"][0]["exceptions"]
+
+    index = YamlIndex.from_yaml(yaml_data, remove_cloud_errors=True)
+    assert [s["language"]["default"]["name"] for s in yaml_data["schemas"]["objects"]] == ["Widget", "Error"]
+    assert cloud_error not in index.schemas
+    assert exceptions == [{"schema": error}, {}]
+    assert index.exceptions_set == {id(error)}
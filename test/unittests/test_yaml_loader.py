@@ -0,0 +1,64 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+from autorest import cache, yaml_loader
+
+_YAML = """
+schemas:
+  strings:
+    - &ref_0
+      type: string
+      language:
+        default:
+          name: string
+  objects:
+    - properties:
+        - schema: *ref_0
+          serializedName: name
+"""
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VARIABLE, str(tmp_path))
+    return tmp_path
+
+
+def _assert_anchor_shared(yaml_data):
+    assert yaml_data["schemas"]["objects"][0]["properties"][0]["schema"] is yaml_data["schemas"]["strings"][0]
+
+
+def test_anchors_are_shared_objects(cache_dir):
+    yaml_data = yaml_loader.load(_YAML)
+    _assert_anchor_shared(yaml_data)
+    _assert_anchor_shared(yaml_loader.load(yaml_loader.dump(yaml_data)))
+
+
+def test_parsed_tree_is_cached(cache_dir, monkeypatch):
+    yaml_data = yaml_loader.load(_YAML)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("YAML should not be parsed again")
+
+    monkeypatch.setattr(yaml_loader.yaml, "load", _fail)
+    cached_yaml_data = yaml_loader.load(_YAML)
+    assert cached_yaml_data == yaml_data
+    # every call gets its own tree, since plugins update it
+    assert cached_yaml_data is not yaml_data
+    _assert_anchor_shared(cached_yaml_data)
+
+
+def test_corrupted_cache_is_ignored(cache_dir):
+    yaml_loader.load(_YAML)
+    for cache_file in cache_dir.glob("**/*.pickle"):
+        cache_file.write_bytes(b"not a pickle")
+    _assert_anchor_shared(yaml_loader.load(_YAML))
+
+
+def test_cache_disabled(monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VARIABLE, "")
+    assert cache.get_cache_folder("yaml") is None
+    _assert_anchor_shared(yaml_loader.load(_YAML))